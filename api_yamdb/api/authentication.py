@@ -0,0 +1,72 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import (AuthenticationFailed,
+                                                 InvalidToken)
+from rest_framework_simplejwt.settings import api_settings
+
+from .metrics import record_cache
+
+SNAPSHOT_FIELDS = ('id', 'username', 'role', 'is_superuser', 'is_active')
+
+
+def user_cache_key(user_id):
+    return f'jwt-user:{user_id}'
+
+
+def invalidate_cached_user(user_id):
+    """Удаляет снимок пользователя из кэша."""
+    cache.delete(user_cache_key(user_id))
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """JWT-аутентификация с кэшированием пользователя между запросами.
+
+    В общем для всех процессов кэше хранится только снимок полей, нужных
+    для проверки прав. Пользователь собирается из него без запроса к
+    базе; остальные поля отложены и подгружаются только при обращении к
+    ним. Снимок удаляется при каждом сохранении или удалении
+    пользователя, поэтому смена роли через API или админку действует со
+    следующего запроса. Изменения через queryset.update() сигналов не
+    посылают и вступают в силу не позже чем через
+    JWT_USER_CACHE_TIMEOUT секунд.
+    """
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(
+                _('Token contained no recognizable user identification'))
+
+        snapshot = cache.get(user_cache_key(user_id))
+        record_cache('jwt_user', snapshot is not None)
+        if snapshot is None:
+            try:
+                user = self.user_model.objects.only(*SNAPSHOT_FIELDS).get(
+                    **{api_settings.USER_ID_FIELD: user_id})
+            except self.user_model.DoesNotExist:
+                raise AuthenticationFailed(
+                    _('User not found'), code='user_not_found')
+            cache.set(
+                user_cache_key(user_id),
+                {field: getattr(user, field) for field in SNAPSHOT_FIELDS},
+                timeout=settings.JWT_USER_CACHE_TIMEOUT
+            )
+        else:
+            # from_db ожидает значения в порядке полей модели.
+            field_names = [
+                field.attname
+                for field in self.user_model._meta.concrete_fields
+                if field.attname in snapshot
+            ]
+            user = self.user_model.from_db(
+                DEFAULT_DB_ALIAS, field_names,
+                [snapshot[name] for name in field_names]
+            )
+        if not user.is_active:
+            raise AuthenticationFailed(
+                _('User is inactive'), code='user_inactive')
+        return user
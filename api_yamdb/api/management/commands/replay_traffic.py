@@ -0,0 +1,75 @@
+import json
+
+from api.replay import (HttpTarget, InProcessTarget, TrafficReplayer,
+                        read_log, summarize)
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    """Команда для нагрузочного прогона по записанному журналу запросов."""
+
+    help = 'Replay a JSONL request log and report latency per route'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'log', help='JSONL file with method, path, user and body.')
+        parser.add_argument(
+            '--url',
+            help='Base URL of a running server, e.g. http://127.0.0.1:8000. '
+                 'Without it requests go to the WSGI app in-process.'
+        )
+        parser.add_argument(
+            '--concurrency', type=int, default=8,
+            help='Maximum number of requests in flight.'
+        )
+        parser.add_argument(
+            '--rate', type=float,
+            help='Requests per second; by default as fast as possible.'
+        )
+        parser.add_argument(
+            '--repeat', type=int, default=1,
+            help='Number of passes over the log.'
+        )
+        parser.add_argument(
+            '--json', dest='json_path',
+            help='Also write the per-route summary to this file.'
+        )
+
+    def handle(self, *args, **options):
+        """Основной метод команды, воспроизводит журнал и печатает сводку."""
+        try:
+            entries = read_log(options['log'])
+        except (OSError, ValueError) as error:
+            raise CommandError(error)
+        if not entries:
+            raise CommandError('The log contains no requests.')
+        target = (
+            HttpTarget(options['url']) if options['url']
+            else InProcessTarget()
+        )
+        replayer = TrafficReplayer(
+            target, options['concurrency'], options['rate'])
+        results, elapsed = replayer.run(entries, options['repeat'])
+        summary = summarize(results, elapsed)
+
+        self.stdout.write(
+            f'{"route":<24}{"requests":>9}{"errors":>7}{"rps":>9}'
+            f'{"p50 ms":>9}{"p95 ms":>9}{"p99 ms":>9}{"max ms":>9}'
+        )
+        for route, row in summary.items():
+            self.stdout.write(
+                f'{route:<24}{row["requests"]:>9}{row["errors"]:>7}'
+                f'{row["rps"]:>9.1f}{row["p50_ms"]:>9.2f}'
+                f'{row["p95_ms"]:>9.2f}{row["p99_ms"]:>9.2f}'
+                f'{row["max_ms"]:>9.2f}'
+            )
+        errors = [result.error for result in results if result.error]
+        for error in sorted(set(errors))[:5]:
+            self.stderr.write(error)
+        self.stdout.write(self.style.SUCCESS(
+            f'{len(results)} requests in {elapsed:.2f}s '
+            f'({len(results) / elapsed:.1f} req/s)'
+        ))
+        if options['json_path']:
+            with open(options['json_path'], 'w', encoding='utf-8') as file:
+                json.dump(summary, file, indent=2, ensure_ascii=False)
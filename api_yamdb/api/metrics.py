@@ -0,0 +1,235 @@
+import threading
+import time
+from bisect import bisect_left
+
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseForbidden
+from django.utils.crypto import constant_time_compare
+
+from .middleware import route_name
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+LATENCY_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89)
+
+
+def escape(value):
+    return (
+        str(value).replace('\\', r'\\').replace('"', r'\"')
+        .replace('\n', r'\n')
+    )
+
+
+def format_labels(names, values, extra=''):
+    pairs = [
+        f'{name}="{escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def format_number(value):
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value)
+
+
+class Metric:
+    """Метрика с метками; значения хранятся в словаре по кортежу меток.
+
+    Все значения живут в памяти процесса, поэтому при нескольких
+    процессах каждый из них отдаёт свои метрики.
+    """
+
+    type = None
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def samples(self):
+        """Возвращает строки метрики в текстовом формате Prometheus."""
+        with self._lock:
+            values = list(self._values.items())
+        for labels, value in sorted(values):
+            yield (
+                f'{self.name}{format_labels(self.labelnames, labels)} '
+                f'{format_number(value)}'
+            )
+
+    def expose(self):
+        lines = [
+            f'# HELP {self.name} {self.documentation}',
+            f'# TYPE {self.name} {self.type}',
+        ]
+        lines.extend(self.samples())
+        return lines
+
+
+class Counter(Metric):
+    type = 'counter'
+
+    def inc(self, *labels, amount=1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+
+class Gauge(Metric):
+    type = 'gauge'
+
+    def inc(self, *labels, amount=1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def dec(self, *labels, amount=1):
+        self.inc(*labels, amount=-amount)
+
+
+class Histogram(Metric):
+    """Гистограмма с фиксированными границами корзин.
+
+    Наблюдение — один bisect и обновление трёх чисел, поэтому подходит
+    для каждого запроса.
+    """
+
+    type = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=()):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value, *labels):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(labels)
+            if state is None:
+                state = self._values[labels] = [
+                    [0] * (len(self.buckets) + 1), 0, 0]
+            state[0][index] += 1
+            state[1] += value
+            state[2] += 1
+
+    def samples(self):
+        with self._lock:
+            values = [
+                (labels, (list(counts), total, count))
+                for labels, (counts, total, count) in self._values.items()
+            ]
+        for labels, (counts, total, count) in sorted(values):
+            cumulative = 0
+            bounds = [format_number(float(b)) for b in self.buckets] + ['+Inf']
+            for bound, bucket_count in zip(bounds, counts):
+                cumulative += bucket_count
+                bucket_labels = format_labels(
+                    self.labelnames, labels, f'le="{bound}"')
+                yield f'{self.name}_bucket{bucket_labels} {cumulative}'
+            plain = format_labels(self.labelnames, labels)
+            yield f'{self.name}_sum{plain} {format_number(total)}'
+            yield f'{self.name}_count{plain} {count}'
+
+
+class CacheRatio(Gauge):
+    """Доля попаданий в кэш, вычисляемая из счётчика при выгрузке."""
+
+    def __init__(self, name, documentation, counter):
+        super().__init__(name, documentation, ('cache',))
+        self.counter = counter
+
+    def samples(self):
+        totals = {}
+        with self.counter._lock:
+            for (cache, result), value in self.counter._values.items():
+                hits, total = totals.get(cache, (0, 0))
+                totals[cache] = (
+                    hits + (value if result == 'hit' else 0), total + value)
+        for cache, (hits, total) in sorted(totals.items()):
+            yield (
+                f'{self.name}{format_labels(("cache",), (cache,))} '
+                f'{format_number(hits / total)}'
+            )
+
+
+requests_total = Counter(
+    'yamdb_http_requests_total', 'HTTP responses by route and status.',
+    ('route', 'method', 'status'))
+request_duration = Histogram(
+    'yamdb_http_request_duration_seconds', 'Request latency by route.',
+    ('route', 'method'), LATENCY_BUCKETS)
+requests_in_flight = Gauge(
+    'yamdb_http_requests_in_flight', 'Requests being processed by route.',
+    ('route',))
+request_queries = Histogram(
+    'yamdb_http_request_db_queries', 'SQL queries per request by route.',
+    ('route', 'method'), QUERY_COUNT_BUCKETS)
+cache_requests = Counter(
+    'yamdb_cache_requests_total', 'Cache lookups by cache and result.',
+    ('cache', 'result'))
+cache_hit_ratio = CacheRatio(
+    'yamdb_cache_hit_ratio', 'Share of cache lookups that were hits.',
+    cache_requests)
+
+REGISTRY = (
+    requests_total, request_duration, requests_in_flight, request_queries,
+    cache_requests, cache_hit_ratio,
+)
+
+
+def record_cache(cache, hit):
+    """Учитывает обращение к кэшу для метрики доли попаданий."""
+    cache_requests.inc(cache, 'hit' if hit else 'miss')
+
+
+def render():
+    lines = []
+    for metric in REGISTRY:
+        lines.extend(metric.expose())
+    return '\n'.join(lines) + '\n'
+
+
+class MetricsMiddleware:
+    """Собирает метрики запросов по именам маршрутов.
+
+    Должен стоять перед QueryBudgetMiddleware, чтобы видеть число
+    SQL-запросов, подсчитанное ею.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        started = time.perf_counter()
+        response = self.get_response(request)
+        elapsed = time.perf_counter() - started
+
+        route = route_name(request)
+        if getattr(request, '_metrics_in_flight', False):
+            requests_in_flight.dec(route)
+        requests_total.inc(route, request.method, str(response.status_code))
+        request_duration.observe(elapsed, route, request.method)
+        stats = getattr(request, 'query_stats', None)
+        if stats is not None:
+            request_queries.observe(stats.count, route, request.method)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request._metrics_in_flight = True
+        requests_in_flight.inc(route_name(request))
+
+
+def metrics_view(request):
+    """Отдаёт метрики в текстовом формате Prometheus.
+
+    Если задан settings.METRICS_TOKEN, требует заголовок
+    'Authorization: Bearer <токен>'.
+    """
+    token = getattr(settings, 'METRICS_TOKEN', None)
+    if token and not constant_time_compare(
+        request.META.get('HTTP_AUTHORIZATION', ''), f'Bearer {token}'
+    ):
+        return HttpResponseForbidden()
+    return HttpResponse(render(), content_type=CONTENT_TYPE)
@@ -0,0 +1,125 @@
+import logging
+import re
+import time
+from collections import Counter
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+FINGERPRINT_PATTERNS = (
+    (re.compile(r"'(?:[^']|'')*'"), '?'),
+    (re.compile(r'\b\d+(?:\.\d+)?\b'), '?'),
+    (re.compile(r'%s'), '?'),
+    (re.compile(r'\(\s*\?(?:\s*,\s*\?)*\s*\)'), '(...)'),
+    (re.compile(r'\s+'), ' '),
+)
+
+
+def route_name(request):
+    """Возвращает имя маршрута запроса, например 'titles-list'.
+
+    Для маршрутов без имени используется шаблон пути, для
+    нераспознанных запросов — '<unresolved>'.
+    """
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return '<unresolved>'
+    return match.url_name or match.route
+
+
+def fingerprint(sql):
+    """Приводит SQL к виду без литералов и длины списков IN."""
+    for pattern, replacement in FINGERPRINT_PATTERNS:
+        sql = pattern.sub(replacement, sql)
+    return sql.strip()
+
+
+class QueryStats:
+    """Счётчик SQL-запросов, подключаемый через execute_wrapper."""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.statements = []
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - started
+            self.count += 1
+            self.statements.append(sql)
+
+    def repeated(self, minimum=2):
+        """Возвращает повторяющиеся отпечатки запросов — признак N+1."""
+        counts = Counter(map(fingerprint, self.statements))
+        return [
+            (sql, count) for sql, count in counts.most_common()
+            if count >= minimum
+        ]
+
+
+def query_budget(request, route):
+    """Возвращает допустимое число запросов для маршрута.
+
+    Страницы админки без собственного бюджета не проверяются: DEFAULT
+    рассчитан на API. Для них возвращается None.
+    """
+    config = settings.QUERY_BUDGET
+    routes = config.get('ROUTES', {})
+    if route in routes:
+        return routes[route]
+    match = getattr(request, 'resolver_match', None)
+    if match is not None and 'admin' in match.namespaces:
+        return None
+    return config['DEFAULT']
+
+
+# Вызываются при превышении бюджета; используются фикстурой тестов.
+budget_listeners = []
+
+
+class QueryBudgetMiddleware:
+    """Считает SQL-запросы и время работы с базой для каждого запроса.
+
+    В режиме DEBUG добавляет заголовки X-DB-Query-Count и X-DB-Time
+    (миллисекунды). Если запросов больше бюджета маршрута из
+    settings.QUERY_BUDGET, пишет предупреждение с повторяющимися
+    отпечатками SQL. Страницы админки проверяются, только если для
+    них задан бюджет маршрута.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        stats = QueryStats()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(stats))
+            response = self.get_response(request)
+        request.query_stats = stats
+
+        if settings.DEBUG:
+            response['X-DB-Query-Count'] = str(stats.count)
+            response['X-DB-Time'] = f'{stats.duration * 1000:.1f}'
+
+        route = route_name(request)
+        budget = query_budget(request, route)
+        if budget is not None and stats.count > budget:
+            repeated = stats.repeated()
+            logger.warning(
+                '%s %s (%s): %d SQL queries over budget %d, %.1f ms; '
+                'repeated: %s',
+                request.method, request.path, route, stats.count, budget,
+                stats.duration * 1000,
+                '; '.join(f'{count}x {sql}' for sql, count in repeated[:5])
+                or 'none'
+            )
+            for listener in budget_listeners:
+                listener(request, route, budget, stats)
+        return response
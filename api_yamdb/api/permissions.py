@@ -44,6 +44,6 @@ class IsAuthorModeratorOrReadOnly(permissions.BasePermission):
     def has_object_permission(self, request, view, obj):
         """Разрешает редактирование автору, модератору или администратору."""
         return (request.method in permissions.SAFE_METHODS
-                or obj.author == request.user
+                or obj.author_id == request.user.id
                 or request.user.is_admin
                 or request.user.is_moderator)
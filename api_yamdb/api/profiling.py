@@ -0,0 +1,253 @@
+import cProfile
+import io
+import os
+import pstats
+import re
+import sys
+import threading
+import time
+import uuid
+from collections import Counter, namedtuple
+from datetime import datetime
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core import signing
+from django.http import FileResponse, Http404
+from django.shortcuts import render
+
+from .middleware import route_name
+
+TOKEN_SALT = 'api.profiling'
+PROFILE_NAME = re.compile(r'^[\w.-]+\.(prof|folded)$')
+SORT_KEYS = ('cumulative', 'tottime', 'calls')
+
+ProfileFile = namedtuple(
+    'ProfileFile', ('name', 'created', 'method', 'route', 'kind', 'size'))
+
+
+def make_profile_token(user):
+    """Подписывает токен, разрешающий профилировать запросы."""
+    return signing.dumps({'user': user.username}, salt=TOKEN_SALT)
+
+
+def check_profile_token(token):
+    """Возвращает имя пользователя из действующего токена или None.
+
+    Токен принимается, только пока его владелец остаётся активным
+    сотрудником: отзыв прав действует сразу, а не по истечении токена.
+    """
+    try:
+        payload = signing.loads(
+            token, salt=TOKEN_SALT, max_age=settings.PROFILER_TOKEN_MAX_AGE)
+    except signing.BadSignature:
+        return None
+    username = payload.get('user')
+    staff = get_user_model().objects.filter(
+        username=username, is_active=True, is_staff=True)
+    return username if staff.exists() else None
+
+
+class StackSampler:
+    """Лёгкий сэмплер: раз в interval секунд снимает стек одного потока.
+
+    Результат — стеки в свёрнутом формате ('a;b;c 12'), который читают
+    flamegraph.pl и speedscope.
+    """
+
+    def __init__(self, thread_id, interval):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stopped.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(
+                    f'{code.co_name} '
+                    f'({os.path.basename(code.co_filename)}:{frame.f_lineno})'
+                )
+                frame = frame.f_back
+            if stack:
+                self.stacks[';'.join(reversed(stack))] += 1
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+        self._thread.join()
+
+    def dump(self, path):
+        with open(path, 'w', encoding='utf-8') as file:
+            for stack, count in self.stacks.most_common():
+                file.write(f'{stack} {count}\n')
+
+
+class ProfileStore:
+    """Кольцевой буфер профилей в каталоге на диске.
+
+    Хранит не больше max_files файлов, удаляя самые старые. Имя файла
+    начинается с метки времени, поэтому сортировка по имени совпадает
+    с порядком записи.
+    """
+
+    def __init__(self, directory, max_files):
+        self.directory = str(directory)
+        self.max_files = max_files
+
+    def new_path(self, request, kind):
+        os.makedirs(self.directory, exist_ok=True)
+        stamp = datetime.now().strftime('%Y%m%d-%H%M%S-%f')
+        route = re.sub(r'[^\w-]', '_', route_name(request))
+        name = (
+            f'{stamp}-{uuid.uuid4().hex[:6]}-{request.method}-{route}.{kind}')
+        return os.path.join(self.directory, name)
+
+    def trim(self):
+        names = sorted(self.names())
+        for name in names[:max(0, len(names) - self.max_files)]:
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except FileNotFoundError:
+                pass
+
+    def names(self):
+        try:
+            return [
+                name for name in os.listdir(self.directory)
+                if PROFILE_NAME.match(name)
+            ]
+        except FileNotFoundError:
+            return []
+
+    def list(self):
+        """Возвращает профили от новых к старым.
+
+        Файлы с именем не из new_path пропускаются.
+        """
+        profiles = []
+        for name in sorted(self.names(), reverse=True):
+            try:
+                date, clock, _, _, method, rest = name.split('-', 5)
+                created = datetime.strptime(f'{date}{clock}', '%Y%m%d%H%M%S')
+                size = os.path.getsize(os.path.join(self.directory, name))
+            except (ValueError, FileNotFoundError):
+                continue
+            route, kind = rest.rsplit('.', 1)
+            profiles.append(
+                ProfileFile(name, created, method, route, kind, size))
+        return profiles
+
+    def path(self, name):
+        if not PROFILE_NAME.match(name):
+            raise Http404
+        path = os.path.join(self.directory, name)
+        if not os.path.exists(path):
+            raise Http404
+        return path
+
+
+def get_store():
+    return ProfileStore(settings.PROFILER_DIR, settings.PROFILER_MAX_FILES)
+
+
+class ProfilerMiddleware:
+    """Профилирует отдельный запрос по запросу сотрудника.
+
+    Профилирование включается подписанным токеном в заголовке X-Profile
+    или параметре _profile; сотрудник, вошедший в админку, может
+    передать _profile=1. Режим задаёт X-Profile-Mode или _profile_mode:
+    'cprofile' (по умолчанию, файл pstats) или 'sample' (свёрнутые стеки).
+    Имя сохранённого файла возвращается в заголовке X-Profile-Id.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def requested_mode(self, request):
+        token = (
+            request.META.get('HTTP_X_PROFILE')
+            or request.GET.get('_profile')
+        )
+        if not token:
+            return None
+        user = getattr(request, 'user', None)
+        staff = user is not None and user.is_staff and token == '1'
+        if not staff and check_profile_token(token) is None:
+            return None
+        mode = (
+            request.META.get('HTTP_X_PROFILE_MODE')
+            or request.GET.get('_profile_mode', 'cprofile')
+        )
+        return mode if mode in ('cprofile', 'sample') else None
+
+    def __call__(self, request):
+        mode = self.requested_mode(request)
+        if mode is None:
+            return self.get_response(request)
+
+        store = get_store()
+        started = time.perf_counter()
+        if mode == 'sample':
+            profiler = StackSampler(
+                threading.get_ident(), settings.PROFILER_SAMPLE_INTERVAL)
+            profiler.start()
+            try:
+                response = self.get_response(request)
+            finally:
+                profiler.stop()
+            path = store.new_path(request, 'folded')
+            profiler.dump(path)
+        else:
+            profiler = cProfile.Profile()
+            profiler.enable()
+            try:
+                response = self.get_response(request)
+            finally:
+                profiler.disable()
+            path = store.new_path(request, 'prof')
+            profiler.dump_stats(path)
+        store.trim()
+        response['X-Profile-Duration'] = (
+            f'{(time.perf_counter() - started) * 1000:.1f}')
+        response['X-Profile-Id'] = os.path.basename(path)
+        return response
+
+
+def profile_list(request):
+    """Страница админки со списком сохранённых профилей."""
+    return render(request, 'admin/profiles/list.html', {
+        'title': 'Профили запросов',
+        'profiles': get_store().list(),
+        'token': make_profile_token(request.user),
+        'token_max_age': settings.PROFILER_TOKEN_MAX_AGE,
+    })
+
+
+def profile_detail(request, name):
+    """Показывает профиль в текстовом виде или отдаёт файл."""
+    path = get_store().path(name)
+    if 'download' in request.GET:
+        return FileResponse(open(path, 'rb'), as_attachment=True)
+    if name.endswith('.prof'):
+        stream = io.StringIO()
+        stats = pstats.Stats(path, stream=stream)
+        sort = request.GET.get('sort')
+        stats.sort_stats(sort if sort in SORT_KEYS else SORT_KEYS[0])
+        stats.print_stats(settings.PROFILER_STATS_LIMIT)
+        report = stream.getvalue()
+    else:
+        with open(path, encoding='utf-8') as file:
+            report = file.read()
+    return render(request, 'admin/profiles/detail.html', {
+        'title': name,
+        'name': name,
+        'report': report,
+        'sort_keys': SORT_KEYS if name.endswith('.prof') else (),
+    })
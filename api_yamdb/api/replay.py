@@ -0,0 +1,208 @@
+import http.client
+import json
+import threading
+import time
+from collections import defaultdict, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+from django.contrib.auth import get_user_model
+from django.test import Client
+from django.urls import Resolver404, resolve
+from rest_framework_simplejwt.tokens import AccessToken
+
+TrafficEntry = namedtuple(
+    'TrafficEntry', ('method', 'path', 'user', 'body'))
+ReplayResult = namedtuple(
+    'ReplayResult', ('route', 'status', 'latency', 'error'))
+
+
+def read_log(path):
+    """Читает журнал запросов в формате JSONL.
+
+    Каждая строка — объект с полями method, path и необязательными user
+    (username, от имени которого выполняется запрос) и body.
+    """
+    entries = []
+    with open(path, encoding='utf-8') as file:
+        for number, line in enumerate(file, 1):
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            try:
+                record = json.loads(line)
+                entries.append(TrafficEntry(
+                    record.get('method', 'GET').upper(), record['path'],
+                    record.get('user'), record.get('body')
+                ))
+            except (ValueError, KeyError) as error:
+                raise ValueError(f'{path}:{number}: {error}') from error
+    return entries
+
+
+def route_for(path):
+    """Имя маршрута по пути, как в метриках и бюджетах запросов."""
+    try:
+        match = resolve(urlsplit(path).path)
+    except Resolver404:
+        return '<unresolved>'
+    return match.url_name or match.route
+
+
+class TokenCache:
+    """Выдаёт JWT для пользователей журнала, создавая каждый один раз."""
+
+    def __init__(self):
+        self._tokens = {}
+        self._lock = threading.Lock()
+
+    def header(self, username):
+        if username is None:
+            return None
+        with self._lock:
+            token = self._tokens.get(username)
+            if token is None:
+                user = get_user_model().objects.get(username=username)
+                token = self._tokens[username] = str(
+                    AccessToken.for_user(user))
+        return f'Bearer {token}'
+
+
+class InProcessTarget:
+    """Отправляет запросы прямо в WSGI-приложение через тестовый клиент."""
+
+    def __init__(self):
+        self._local = threading.local()
+
+    def send(self, entry, authorization):
+        client = getattr(self._local, 'client', None)
+        if client is None:
+            client = self._local.client = Client()
+        extra = {}
+        if authorization:
+            extra['HTTP_AUTHORIZATION'] = authorization
+        if entry.body is not None:
+            extra['data'] = json.dumps(entry.body)
+            extra['content_type'] = 'application/json'
+        return client.generic(entry.method, entry.path, **extra).status_code
+
+
+class HttpTarget:
+    """Отправляет запросы на сервер, держа одно соединение на поток."""
+
+    def __init__(self, base_url, timeout=30):
+        url = urlsplit(base_url)
+        self.connection_class = (
+            http.client.HTTPSConnection if url.scheme == 'https'
+            else http.client.HTTPConnection
+        )
+        self.netloc = url.netloc
+        self.prefix = url.path.rstrip('/')
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def send(self, entry, authorization):
+        headers = {}
+        body = None
+        if authorization:
+            headers['Authorization'] = authorization
+        if entry.body is not None:
+            body = json.dumps(entry.body)
+            headers['Content-Type'] = 'application/json'
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = self._local.connection = self.connection_class(
+                self.netloc, timeout=self.timeout)
+        try:
+            connection.request(
+                entry.method, self.prefix + entry.path, body, headers)
+            response = connection.getresponse()
+            response.read()
+        except (OSError, http.client.HTTPException):
+            connection.close()
+            self._local.connection = None
+            raise
+        return response.status
+
+
+class TrafficReplayer:
+    """Воспроизводит журнал запросов в пуле потоков.
+
+    concurrency ограничивает число одновременных запросов. Если задан
+    rate, запросы отправляются по расписанию с этой частотой в секунду,
+    а задержка отсчитывается от запланированного момента: так очередь
+    перед перегруженным сервером попадает в перцентили, а не скрывается.
+    """
+
+    def __init__(self, target, concurrency=8, rate=None):
+        self.target = target
+        self.concurrency = max(1, concurrency)
+        self.rate = rate
+        self.tokens = TokenCache()
+
+    def _send(self, entry, route, scheduled):
+        try:
+            authorization = self.tokens.header(entry.user)
+            status = self.target.send(entry, authorization)
+            error = None
+        except Exception as exc:
+            status, error = None, f'{type(exc).__name__}: {exc}'
+        return ReplayResult(route, status, time.perf_counter() - scheduled,
+                            error)
+
+    def run(self, entries, repeat=1):
+        """Возвращает результаты всех запросов и общее время прогона."""
+        routes = {}
+        slots = threading.BoundedSemaphore(self.concurrency)
+        futures = []
+        started = time.perf_counter()
+
+        def release(future):
+            slots.release()
+
+        with ThreadPoolExecutor(self.concurrency) as executor:
+            for index in range(len(entries) * repeat):
+                entry = entries[index % len(entries)]
+                if entry.path not in routes:
+                    routes[entry.path] = route_for(entry.path)
+                if self.rate:
+                    scheduled = started + index / self.rate
+                    delay = scheduled - time.perf_counter()
+                    if delay > 0:
+                        time.sleep(delay)
+                slots.acquire()
+                if not self.rate:
+                    scheduled = time.perf_counter()
+                future = executor.submit(
+                    self._send, entry, routes[entry.path], scheduled)
+                future.add_done_callback(release)
+                futures.append(future)
+        return [future.result() for future in futures], (
+            time.perf_counter() - started)
+
+
+def percentile(values, fraction):
+    return values[min(len(values) - 1, int(fraction * len(values)))]
+
+
+def summarize(results, elapsed):
+    """Сводка по маршрутам: число, ошибки, запросы в секунду, перцентили."""
+    by_route = defaultdict(list)
+    for result in results:
+        by_route[result.route].append(result)
+    summary = {}
+    for route, route_results in sorted(by_route.items()):
+        latencies = sorted(result.latency for result in route_results)
+        summary[route] = {
+            'requests': len(route_results),
+            'errors': sum(
+                result.error is not None or result.status >= 500
+                for result in route_results
+            ),
+            'rps': len(route_results) / elapsed if elapsed else 0,
+            'p50_ms': percentile(latencies, 0.5) * 1e3,
+            'p95_ms': percentile(latencies, 0.95) * 1e3,
+            'p99_ms': percentile(latencies, 0.99) * 1e3,
+            'max_ms': latencies[-1] * 1e3,
+        }
+    return summary
@@ -0,0 +1,100 @@
+import random
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+from rest_framework.permissions import SAFE_METHODS
+
+READ_METHODS = ('GET', 'HEAD')
+
+STICKY_COOKIE = 'replica_sticky'
+STICKY_SALT = 'api.replicas.sticky'
+
+_read_from_replicas = ContextVar('read_from_replicas', default=False)
+
+
+def mark_written(request, response):
+    """Читает данные пользователя с основной базы REPLICA_STICKY_SECONDS.
+
+    Время записи и id пользователя передаются в подписанной куке, поэтому
+    следующий запрос видит их в любом процессе и на любом сервере.
+    """
+    response.set_signed_cookie(
+        STICKY_COOKIE, request.user.pk, salt=STICKY_SALT,
+        max_age=settings.REPLICA_STICKY_SECONDS, httponly=True,
+        samesite='Lax'
+    )
+
+
+def is_sticky(request):
+    """Проверяет, писал ли пользователь в базу в последние секунды."""
+    if not request.user.is_authenticated:
+        return False
+    user_id = request.get_signed_cookie(
+        STICKY_COOKIE, default=None, salt=STICKY_SALT,
+        max_age=settings.REPLICA_STICKY_SECONDS
+    )
+    return user_id == str(request.user.pk)
+
+
+class ReplicaRouter:
+    """Направляет чтение в реплики, а запись — в основную базу.
+
+    Реплики перечислены в settings.DATABASE_REPLICAS. Читать из них
+    разрешает только ReplicaReadViewMixin на время безопасного запроса;
+    остальной код, в том числе команды и проверка прав, читает с
+    основной базы и не видит отставания реплик.
+    """
+
+    def db_for_read(self, model, **hints):
+        replicas = settings.DATABASE_REPLICAS
+        if replicas and _read_from_replicas.get():
+            return random.choice(replicas)
+        return None
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, *settings.DATABASE_REPLICAS}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+
+class ReplicaReadViewMixin:
+    """Выполняет GET и HEAD запросы вьюсета на репликах.
+
+    Флаг ставится после аутентификации, проверки прав и лимитов, так
+    что они по-прежнему читают основную базу. Пользователь, который
+    только что изменил данные, ещё REPLICA_STICKY_SECONDS читает с
+    основной базы и видит свои изменения, даже если реплика отстала.
+    """
+
+    def dispatch(self, request, *args, **kwargs):
+        token = _read_from_replicas.set(False)
+        try:
+            return super().dispatch(request, *args, **kwargs)
+        finally:
+            _read_from_replicas.reset(token)
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if (
+            settings.DATABASE_REPLICAS
+            and request.method in READ_METHODS
+            and not is_sticky(request)
+        ):
+            _read_from_replicas.set(True)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(
+            request, response, *args, **kwargs)
+        if (
+            settings.DATABASE_REPLICAS
+            and request.method not in SAFE_METHODS
+            and response.status_code < 400
+            and request.user.is_authenticated
+        ):
+            mark_written(request, response)
+        return response
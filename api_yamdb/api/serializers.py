@@ -1,6 +1,7 @@
 import re
 
 from api.const import USERNAME_REGEX
+from api.timing import TimedSerializerMixin
 from django.contrib.auth import get_user_model
 from rest_framework import serializers
 from users import constants
@@ -8,7 +9,7 @@ from users import constants
 User = get_user_model()
 
 
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     """Сериализатор для модели пользователя."""
 
     class Meta:
@@ -39,8 +40,8 @@ class SignupSerializer(serializers.ModelSerializer):
         fields = ('email', 'username')
 
     def create(self, validated_data):
-        """Создаёт нового пользователя или возвращает существующего."""
-        return User.objects.get_or_create(**validated_data)[0]
+        """Создаёт нового пользователя одним INSERT."""
+        return User.objects.create(**validated_data)
 
     def validate_username(self, value):
         """Проверяет username на запрещённые значения и символы."""
@@ -0,0 +1,16 @@
+from django.conf import settings
+
+
+def apply_pragmas(connection):
+    """Применяет settings.SQLITE_PRAGMAS к новому соединению с SQLite.
+
+    journal_mode=WAL сохраняется в файле базы, остальные настройки
+    действуют только на текущее соединение, поэтому выполняются при
+    каждом подключении. Для базы в памяти WAL недоступен, и SQLite
+    молча оставляет режим memory. Команды идут напрямую в драйвер, мимо
+    обёрток Django, и не попадают в счётчики запросов.
+    """
+    if connection.vendor != 'sqlite':
+        return
+    for name, value in settings.SQLITE_PRAGMAS.items():
+        connection.connection.execute(f'PRAGMA {name} = {value}')
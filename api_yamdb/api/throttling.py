@@ -0,0 +1,209 @@
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Mapping
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.module_loading import import_string
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle, SimpleRateThrottle
+
+
+def take_token(tokens, updated, capacity, rate, now):
+    """Пополняет корзину за прошедшее время и пытается взять жетон.
+
+    Возвращает (разрешено, жетонов осталось, секунд до следующего жетона).
+    """
+    if tokens is None:
+        tokens = capacity
+    else:
+        tokens = min(capacity, tokens + (now - updated) * rate)
+    if tokens >= 1:
+        return True, tokens - 1, 0
+    return False, tokens, (1 - tokens) / rate
+
+
+class LocalTokenBucketStore:
+    """Корзины в памяти процесса; подходит для разработки.
+
+    Хранит не больше max_entries корзин, вытесняя давно не
+    использованные.
+    """
+
+    def __init__(self, max_entries=10000):
+        self.max_entries = max_entries
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+
+    def consume(self, key, capacity, rate):
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.pop(key, (None, None))
+            allowed, tokens, wait = take_token(
+                tokens, updated, capacity, rate, now)
+            self._buckets[key] = (tokens, now)
+            if len(self._buckets) > self.max_entries:
+                self._buckets.popitem(last=False)
+        return allowed, wait
+
+
+class CacheTokenBucketStore:
+    """Корзины в кэше Django, общем для нескольких процессов.
+
+    Чтение и запись корзины не атомарны, поэтому при одновременных
+    запросах лимит соблюдается приблизительно.
+    """
+
+    key_prefix = 'throttle'
+
+    def __init__(self, alias='default'):
+        self.cache = caches[alias]
+
+    def consume(self, key, capacity, rate):
+        cache_key = f'{self.key_prefix}:{key}'
+        now = time.time()
+        tokens, updated = self.cache.get(cache_key, (None, None))
+        allowed, tokens, wait = take_token(
+            tokens, updated, capacity, rate, now)
+        # Через capacity / rate секунд корзина снова полна и не нужна.
+        self.cache.set(cache_key, (tokens, now), timeout=capacity / rate)
+        return allowed, wait
+
+
+class SQLiteTokenBucketStore:
+    """Корзины в отдельном файле SQLite, общем для процессов на хосте.
+
+    Каждая проверка — одна короткая транзакция BEGIN IMMEDIATE, поэтому
+    жетоны списываются атомарно. Раз в purge_every проверок удаляются
+    корзины, которые успели наполниться целиком.
+    """
+
+    purge_every = 1000
+
+    def __init__(self, path):
+        self.path = str(path)
+        self._local = threading.local()
+
+    def _connection(self):
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(
+                self.path, timeout=5, isolation_level=None)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute(
+                'CREATE TABLE IF NOT EXISTS throttle_bucket ('
+                'key TEXT PRIMARY KEY, tokens REAL, updated REAL)'
+            )
+            self._local.connection = connection
+            self._local.calls = 0
+        return connection
+
+    def consume(self, key, capacity, rate):
+        connection = self._connection()
+        now = time.time()
+        connection.execute('BEGIN IMMEDIATE')
+        try:
+            row = connection.execute(
+                'SELECT tokens, updated FROM throttle_bucket WHERE key = ?',
+                (key,)
+            ).fetchone()
+            tokens, updated = row if row else (None, None)
+            allowed, tokens, wait = take_token(
+                tokens, updated, capacity, rate, now)
+            connection.execute(
+                'INSERT OR REPLACE INTO throttle_bucket (key, tokens, updated)'
+                ' VALUES (?, ?, ?)',
+                (key, tokens, now)
+            )
+            self._local.calls += 1
+            if self._local.calls % self.purge_every == 0:
+                connection.execute(
+                    'DELETE FROM throttle_bucket WHERE updated < ?',
+                    (now - capacity / rate,)
+                )
+            connection.execute('COMMIT')
+        except Exception:
+            connection.execute('ROLLBACK')
+            raise
+        return allowed, wait
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_store():
+    """Возвращает хранилище корзин, заданное настройкой THROTTLE_STORE."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            config = settings.THROTTLE_STORE
+            _store = import_string(config['BACKEND'])(
+                **config.get('OPTIONS', {}))
+        return _store
+
+
+def reset_store():
+    """Сбрасывает хранилище; следующий запрос создаст его заново."""
+    global _store
+    with _store_lock:
+        _store = None
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """Ограничение частоты запросов алгоритмом «корзина жетонов».
+
+    Лимит берётся из DEFAULT_THROTTLE_RATES по ключу
+    '<throttle_scope вьюсета>_<scope_suffix>', например 'signup_ip'.
+    Скорость '5/min' означает корзину на 5 жетонов, которая пополняется
+    на 5 жетонов в минуту. Проверка выполняется за O(1).
+    """
+
+    scope_suffix = None
+
+    def get_ident_key(self, request, view):
+        """Возвращает идентификатор клиента или None, чтобы не ограничивать.
+        """
+        raise NotImplementedError
+
+    def allow_request(self, request, view):
+        self.wait_time = None
+        scope = f'{view.throttle_scope}_{self.scope_suffix}'
+        rate = api_settings.DEFAULT_THROTTLE_RATES.get(scope)
+        ident = self.get_ident_key(request, view)
+        if rate is None or ident is None:
+            return True
+        capacity, duration = SimpleRateThrottle.parse_rate(None, rate)
+        allowed, self.wait_time = get_store().consume(
+            f'{scope}:{ident}', capacity, capacity / duration)
+        return allowed
+
+    def wait(self):
+        return self.wait_time
+
+
+class IPRateThrottle(TokenBucketThrottle):
+    """Ограничение по IP-адресу клиента."""
+
+    scope_suffix = 'ip'
+
+    def get_ident_key(self, request, view):
+        return self.get_ident(request)
+
+
+class UsernameRateThrottle(TokenBucketThrottle):
+    """Ограничение по username из тела запроса."""
+
+    scope_suffix = 'username'
+
+    def get_ident_key(self, request, view):
+        # Ограничения проверяются до вьюсета, поэтому тело может быть не
+        # объектом: такой запрос отклонит сериализатор.
+        if not isinstance(request.data, Mapping):
+            return None
+        username = request.data.get('username')
+        if not isinstance(username, str) or not username:
+            return None
+        return username.lower()
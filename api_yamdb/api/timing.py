@@ -0,0 +1,112 @@
+import time
+from contextvars import ContextVar
+from functools import wraps
+
+from django.conf import settings
+from rest_framework.renderers import JSONRenderer
+
+PHASES = ('auth', 'perm', 'db', 'serialize', 'render')
+
+_timings = ContextVar('server_timings', default=None)
+
+
+class Timings:
+    """Суммарное время по фазам обработки одного запроса."""
+
+    def __init__(self):
+        self.durations = dict.fromkeys(PHASES, 0.0)
+        self.open = set()
+
+
+def timed(phase):
+    """Декоратор: добавляет время вызова к фазе текущего запроса.
+
+    Вложенные вызовы той же фазы не учитываются повторно, поэтому
+    вложенные сериализаторы не удваивают время. Если Server-Timing
+    выключен, декоратор только вызывает функцию.
+    """
+    def decorator(method):
+        @wraps(method)
+        def wrapper(*args, **kwargs):
+            timings = _timings.get()
+            if timings is None or phase in timings.open:
+                return method(*args, **kwargs)
+            timings.open.add(phase)
+            started = time.perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                timings.durations[phase] += time.perf_counter() - started
+                timings.open.discard(phase)
+        return wrapper
+    return decorator
+
+
+class ServerTimingViewMixin:
+    """Учитывает время аутентификации и проверки прав во вьюсете."""
+
+    @timed('auth')
+    def perform_authentication(self, request):
+        super().perform_authentication(request)
+
+    @timed('perm')
+    def check_permissions(self, request):
+        super().check_permissions(request)
+
+    @timed('perm')
+    def check_object_permissions(self, request, obj):
+        super().check_object_permissions(request, obj)
+
+
+class TimedSerializerMixin:
+    """Учитывает время to_representation как фазу serialize."""
+
+    @timed('serialize')
+    def to_representation(self, instance):
+        return super().to_representation(instance)
+
+
+class TimedJSONRenderer(JSONRenderer):
+    """JSONRenderer, время которого учитывается как фаза render."""
+
+    @timed('render')
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return super().render(data, accepted_media_type, renderer_context)
+
+
+class ServerTimingMiddleware:
+    """Добавляет к ответу заголовок Server-Timing с разбивкой по фазам.
+
+    Фазы: auth, perm, db, serialize, render и общее время total. Время db
+    берётся из QueryBudgetMiddleware, которая должна стоять ниже, и
+    пересекается с остальными фазами. Включается настройкой
+    SERVER_TIMING.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not settings.SERVER_TIMING:
+            return self.get_response(request)
+        timings = Timings()
+        token = _timings.set(timings)
+        started = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            _timings.reset(token)
+        total = time.perf_counter() - started
+
+        metrics = []
+        stats = getattr(request, 'query_stats', None)
+        if stats is not None:
+            timings.durations['db'] = stats.duration
+        for phase in PHASES:
+            metric = f'{phase};dur={timings.durations[phase] * 1000:.2f}'
+            if phase == 'db' and stats is not None:
+                metric += f';desc="{stats.count} queries"'
+            metrics.append(metric)
+        metrics.append(f'total;dur={total * 1000:.2f}')
+        response['Server-Timing'] = ', '.join(metrics)
+        return response
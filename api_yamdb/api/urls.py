@@ -1,6 +1,7 @@
 from django.urls import include, path
 from rest_framework.routers import DefaultRouter
 
+from .metrics import metrics_view
 from .views import UserViewSet
 
 router_v1 = DefaultRouter()
@@ -8,6 +9,7 @@ router_v1.register(r'users', UserViewSet, basename='users')
 
 
 urlpatterns = [
+    path('metrics', metrics_view, name='metrics'),
     path('v1/', include(router_v1.urls)),
     path('v1/auth/', include('users.urls')),
     path('v1/', include('reviews.urls'))
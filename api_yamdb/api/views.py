@@ -1,6 +1,6 @@
-from django.conf import settings
 from django.contrib.auth import get_user_model
-from django.core.mail import send_mail
+from django.db import IntegrityError, transaction
+from django.db.models import Q
 from rest_framework import status, views, viewsets
 from rest_framework.decorators import action
 from rest_framework.filters import SearchFilter
@@ -8,15 +8,19 @@ from rest_framework.pagination import PageNumberPagination
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework_simplejwt.tokens import AccessToken
+from users.confirmation import check_code, store_code
+from users.outbox import enqueue_email
 
 from .helpers import get_confirmation_code
 from .permissions import AdminPermission
 from .serializers import SignupSerializer, TokenSerializer, UserSerializer
+from .throttling import IPRateThrottle, UsernameRateThrottle
+from .timing import ServerTimingViewMixin
 
 User = get_user_model()
 
 
-class UserViewSet(viewsets.ModelViewSet):
+class UserViewSet(ServerTimingViewMixin, viewsets.ModelViewSet):
     """Управление пользователями. Доступно только администратору."""
 
     queryset = User.objects.all()
@@ -37,11 +41,12 @@ class UserViewSet(viewsets.ModelViewSet):
     )
     def me(self, request):
         """Возвращает или обновляет данные текущего пользователя."""
+        user = User.objects.get(pk=request.user.pk)
         if request.method == 'GET':
-            serializer = self.get_serializer(request.user)
+            serializer = self.get_serializer(user)
             return Response(serializer.data, status=status.HTTP_200_OK)
         serializer = self.get_serializer(
-            request.user, data=request.data, partial=True)
+            user, data=request.data, partial=True)
         if 'role' in request.data:
             return Response(
                 {"detail": "Изменение роли пользователя запрещено."},
@@ -52,42 +57,56 @@ class UserViewSet(viewsets.ModelViewSet):
         return Response(serializer.data, status=status.HTTP_200_OK)
 
 
-class SignupView(views.APIView):
+class SignupView(ServerTimingViewMixin, views.APIView):
     """Регистрация нового пользователя."""
 
     permission_classes = [AllowAny]
+    throttle_classes = [IPRateThrottle, UsernameRateThrottle]
+    throttle_scope = 'signup'
 
     def post(self, request):
-        """Создаёт пользователя или отправляет код подтверждения."""
-        username = request.data.get('username')
-        email = request.data.get('email')
-        username_exists = User.objects.filter(username=username)
-        email_exists = User.objects.filter(email=email)
-
-        if username_exists:
-            user = username_exists[0]
-            if user.email != email:
-                return Response({
-                    'message': 'неверный адрес электронной почты',
-                    'username': user.username,
-                    'email': user.email
-                }, status=status.HTTP_400_BAD_REQUEST)
-            send_confirmation_code(user)
-
-        if email_exists:
-            user = email_exists[0]
-            if user.username != username:
-                return Response({
-                    'message': 'неверное имя пользователя',
-                    'username': user.username,
-                    'email': user.email
-                }, status=status.HTTP_400_BAD_REQUEST)
-
-        else:
-            serializer = SignupSerializer(data=request.data)
-            if serializer.is_valid(raise_exception=True):
-                user = serializer.save()
-                send_confirmation_code(user)
+        """Создаёт пользователя или отправляет код подтверждения.
+
+        Существующие пользователи ищутся одним запросом сразу по username
+        и email. Строка пользователя записывается только при создании;
+        повторный запрос обновляет лишь хранилище кодов.
+        """
+        serializer = SignupSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        username = serializer.validated_data['username']
+        email = serializer.validated_data['email']
+        matches = list(
+            User.objects.filter(Q(username=username) | Q(email=email))[:2])
+        user = next(
+            (match for match in matches if match.username == username), None)
+
+        if user is not None and user.email != email:
+            return Response({
+                'message': 'неверный адрес электронной почты',
+                'username': user.username,
+                'email': user.email
+            }, status=status.HTTP_400_BAD_REQUEST)
+        if user is None and matches:
+            return Response({
+                'message': 'неверное имя пользователя',
+                'username': matches[0].username,
+                'email': matches[0].email
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        confirmation_code = get_confirmation_code()
+        try:
+            with transaction.atomic():
+                created = user is None
+                if created:
+                    user = serializer.save()
+                store_code(user.pk, confirmation_code, created=created)
+                send_confirmation_code(user, confirmation_code)
+        except IntegrityError:
+            return Response(
+                {'message': 'пользователь с таким username или email '
+                            'уже существует'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
 
         return Response({
             'email': user.email,
@@ -95,10 +114,12 @@ class SignupView(views.APIView):
         }, status=status.HTTP_200_OK)
 
 
-class TokenView(views.APIView):
+class TokenView(ServerTimingViewMixin, views.APIView):
     """Получение JWT-токена по коду подтверждения."""
 
     permission_classes = [AllowAny]
+    throttle_classes = [IPRateThrottle, UsernameRateThrottle]
+    throttle_scope = 'token'
 
     def post(self, request):
         """Выдаёт JWT-токен, если код подтверждения верный."""
@@ -113,7 +134,7 @@ class TokenView(views.APIView):
             return Response({'error': 'Пользователь не найден'},
                             status=status.HTTP_404_NOT_FOUND)
 
-        if user.confirmation_code != confirmation_code:
+        if not check_code(user.pk, confirmation_code):
             return Response(
                 {'error': 'Отсутствует обязательное поле или оно некорректно'},
                 status=status.HTTP_400_BAD_REQUEST
@@ -124,15 +145,10 @@ class TokenView(views.APIView):
         return Response({'token': str(token)}, status=status.HTTP_200_OK)
 
 
-def send_confirmation_code(user):
-    """Отправляет пользователю код подтверждения по email."""
-    confirmation_code = get_confirmation_code()
-    user.confirmation_code = confirmation_code
-    user.save()
-    send_mail(
+def send_confirmation_code(user, confirmation_code):
+    """Ставит в очередь письмо с кодом подтверждения."""
+    enqueue_email(
         'Ваш код подтверждения',
-        f'Ваш код подтверждения: {user.confirmation_code}',
-        settings.DEFAULT_FROM_EMAIL,
-        [user.email],
-        fail_silently=False,
+        f'Ваш код подтверждения: {confirmation_code}',
+        user.email
     )
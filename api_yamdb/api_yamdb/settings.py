@@ -1,3 +1,4 @@
+import os
 from datetime import timedelta
 from pathlib import Path
 
@@ -30,17 +31,66 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'api.metrics.MetricsMiddleware',
+    'api.timing.ServerTimingMiddleware',
+    'api.middleware.QueryBudgetMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'api.profiling.ProfilerMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
 ROOT_URLCONF = 'api_yamdb.urls'
 
+# Если задан, /api/metrics требует заголовок 'Authorization: Bearer <токен>'.
+METRICS_TOKEN = os.getenv('METRICS_TOKEN')
+
+# Заголовок Server-Timing с разбивкой времени запроса по фазам.
+SERVER_TIMING = DEBUG
+
+# Профили отдельных запросов (api.profiling): каталог кольцевого буфера,
+# число хранимых файлов, срок жизни токена в секундах, шаг сэмплера
+# и число строк отчёта pstats в админке.
+PROFILER_DIR = BASE_DIR / 'profiles'
+PROFILER_MAX_FILES = 50
+PROFILER_TOKEN_MAX_AGE = 3600
+PROFILER_SAMPLE_INTERVAL = 0.001
+PROFILER_STATS_LIMIT = 60
+
+# Допустимое число SQL-запросов на запрос к API по именам маршрутов;
+# превышение пишется в лог api.middleware и проваливает тесты.
+# Бюджеты равны измеренному числу запросов, включая BEGIN транзакции и
+# запрос пользователя при промахе кэша аутентификации. У signup 5 запросов (4 для
+# повторной регистрации) и ещё 4 на отправку письма в режиме inline,
+# который используется в тестах.
+QUERY_BUDGET = {
+    'DEFAULT': 4,
+    'ROUTES': {
+        'signup': 9,
+        'token': 4,
+        'users-list': 4,
+        'users-detail': 12,
+        'users-me': 4,
+        'categories-list': 4,
+        'categories-detail': 4,
+        'genres-list': 3,
+        'genres-detail': 4,
+        'titles-list': 9,
+        'titles-detail': 6,
+        'reviews-list': 5,
+        'reviews-detail': 6,
+        'comments-list': 4,
+        'comments-detail': 3,
+        'metrics': 0,
+        'profile-list': 2,
+        'profile-detail': 2,
+    },
+}
+
 TEMPLATES_DIR = BASE_DIR / 'templates'
 TEMPLATES = [
     {
@@ -67,9 +117,50 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        # Соединение живёт между запросами одного потока.
+        'CONN_MAX_AGE': int(os.getenv('DB_CONN_MAX_AGE', 60)),
+    }
+}
+
+# Реплики для чтения (api.replicas): пути к копиям базы через запятую в
+# DB_REPLICAS. В тестах реплики указывают на тестовую основную базу.
+DATABASE_REPLICAS = []
+for number, name in enumerate(
+    filter(None, os.getenv('DB_REPLICAS', '').split(',')), 1
+):
+    DATABASE_REPLICAS.append(f'replica{number}')
+    DATABASES[f'replica{number}'] = {
+        **DATABASES['default'],
+        'NAME': name.strip(),
+        'TEST': {'MIRROR': 'default'},
+    }
+DATABASE_ROUTERS = ['api.replicas.ReplicaRouter']
+# Сколько секунд после записи пользователь читает с основной базы.
+REPLICA_STICKY_SECONDS = int(os.getenv('REPLICA_STICKY_SECONDS', 5))
+
+# Общий для всех процессов кэш: в нём лежат версии справочников
+# (reviews.registry), поэтому память отдельного процесса не подходит.
+# Каталог задаётся переменной CACHE_DIR.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.getenv('CACHE_DIR', str(BASE_DIR / 'cache')),
     }
 }
 
+# Настройки, применяемые к каждому новому соединению с SQLite (api.sqlite).
+# WAL позволяет читать во время записи; synchronous=NORMAL в режиме WAL
+# не теряет целостность при сбое; busy_timeout — ожидание блокировки в мс;
+# cache_size в КиБ со знаком минус; mmap_size в байтах.
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'busy_timeout': 5000,
+    'cache_size': -64000,
+    'mmap_size': 256 * 1024 * 1024,
+    'temp_store': 'MEMORY',
+}
+
 AUTH_USER_MODEL = 'users.MyUser'
 # Password validation
 
@@ -93,9 +184,14 @@ EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
 EMAIL_FILE_PATH = BASE_DIR / 'sent_emails'
 DEFAULT_FROM_EMAIL = 'from@example.com'
 
+# Доставка писем из очереди users.OutgoingEmail: 'background' — фоновым
+# потоком процесса, 'worker' — только командой process_outbox, 'inline' —
+# сразу после коммита запроса в том же потоке (используется в тестах).
+EMAIL_OUTBOX_DELIVERY = os.getenv('EMAIL_OUTBOX_DELIVERY', 'background')
+
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'api.authentication.CachedJWTAuthentication',
     ),
 
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
@@ -106,13 +202,30 @@ REST_FRAMEWORK = {
     ],
 
     'DEFAULT_RENDERER_CLASSES': [
-        'rest_framework.renderers.JSONRenderer',
+        'api.timing.TimedJSONRenderer',
         'rest_framework.renderers.BrowsableAPIRenderer',
     ],
     'DEFAULT_FILTER_BACKENDS': [
         'django_filters.rest_framework.DjangoFilterBackend',
         'rest_framework.filters.SearchFilter',
     ],
+    # Число доверенных прокси перед приложением: IP клиента для лимитов
+    # берётся из X-Forwarded-For только за ними, при 0 — из REMOTE_ADDR.
+    'NUM_PROXIES': int(os.getenv('NUM_PROXIES', 0)),
+    # Лимиты api.throttling: '<throttle_scope>_ip' и '<throttle_scope>_username'.
+    'DEFAULT_THROTTLE_RATES': {
+        'signup_ip': '20/min',
+        'signup_username': '5/min',
+        'token_ip': '30/min',
+        'token_username': '10/min',
+    },
+}
+
+# Хранилище корзин api.throttling: LocalTokenBucketStore (память процесса),
+# CacheTokenBucketStore (кэш Django, OPTIONS: alias) или
+# SQLiteTokenBucketStore (файл SQLite, OPTIONS: path).
+THROTTLE_STORE = {
+    'BACKEND': 'api.throttling.LocalTokenBucketStore',
 }
 
 # Internationalization
@@ -134,6 +247,11 @@ STATIC_URL = '/static/'
 
 STATICFILES_DIRS = ((BASE_DIR / 'static/'),)
 
+# Время жизни снимка пользователя в кэше JWT-аутентификации, в секундах.
+# Сохранение и удаление пользователя сбрасывают снимок сразу, а правки
+# через queryset.update() видны не позже чем через это время.
+JWT_USER_CACHE_TIMEOUT = 60
+
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(days=5),
     "REFRESH_TOKEN_LIFETIME": timedelta(days=1),
@@ -13,11 +13,22 @@ Including another URLconf
     1. Import the include() function: from django.urls import include, path
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
+from api.profiling import profile_detail, profile_list
 from django.contrib import admin
 from django.urls import include, path
 from django.views.generic import TemplateView
 
 urlpatterns = [
+    path(
+        'admin/profiles/',
+        admin.site.admin_view(profile_list),
+        name='profile-list'
+    ),
+    path(
+        'admin/profiles/<str:name>/',
+        admin.site.admin_view(profile_detail),
+        name='profile-detail'
+    ),
     path('admin/', admin.site.urls),
     path('api/', include('api.urls')),
     path(
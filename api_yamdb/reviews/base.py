@@ -1,9 +1,17 @@
 from api.permissions import AdminUserOrReadOnly
+from api.replicas import ReplicaReadViewMixin
+from api.timing import ServerTimingViewMixin
+from django.db import IntegrityError, transaction
 from django.shortcuts import get_object_or_404
 from rest_framework import filters, mixins, viewsets
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
 
 
-class BaseCategoryGenreViewSet(mixins.CreateModelMixin,
+class BaseCategoryGenreViewSet(ReplicaReadViewMixin,
+                               ServerTimingViewMixin,
+                               mixins.CreateModelMixin,
                                mixins.ListModelMixin,
                                mixins.DestroyModelMixin,
                                viewsets.GenericViewSet):
@@ -13,31 +21,63 @@ class BaseCategoryGenreViewSet(mixins.CreateModelMixin,
     lookup_field = 'slug'
     filter_backends = [filters.SearchFilter]
     search_fields = ['name']
+    registry = None
+    registry_ordering = ('name',)
 
+    def list(self, request, *args, **kwargs):
+        """Отдаёт список из кэша справочника, если нет поискового запроса."""
+        search_param = api_settings.SEARCH_PARAM
+        if self.registry is None or request.query_params.get(search_param):
+            return super().list(request, *args, **kwargs)
+        data = self.registry.representations(self.registry_ordering)
+        page = self.paginate_queryset(data)
+        if page is not None:
+            return self.get_paginated_response(page)
+        return Response(data)
 
-class NestedViewSet(viewsets.ModelViewSet):
+
+class NestedViewSet(ReplicaReadViewMixin, ServerTimingViewMixin,
+                    viewsets.ModelViewSet):
     """
     Универсальный ViewSet для вложенных ресурсов.
     Требуется определить:
     - parent_model: модель родителя (например, Title или Review)
     - parent_lookup: имя поля для связи (например, 'title' или 'review')
+    Можно определить:
+    - select_related_fields: связи, подгружаемые JOIN-ом вместе со списком
+    - integrity_error_message: текст ошибки при нарушении уникальности
     """
 
     parent_model = None
     parent_lookup = None
+    select_related_fields = ()
+    integrity_error_message = 'Такой объект уже существует.'
 
     def get_parent_object(self):
-        """Получает объект родителя на основе URL-параметра."""
-        parent_id = self.kwargs.get(f"{self.parent_lookup}_id")
-        return get_object_or_404(self.parent_model, pk=parent_id)
+        """Получает объект родителя один раз за запрос."""
+        if not hasattr(self, '_parent_object'):
+            parent_id = self.kwargs.get(f"{self.parent_lookup}_id")
+            self._parent_object = get_object_or_404(
+                self.parent_model, pk=parent_id)
+        return self._parent_object
 
     def get_queryset(self):
         """Возвращает queryset для вложенного ресурса."""
         parent = self.get_parent_object()
-        return getattr(parent, self.queryset_related_name).all()
+        queryset = getattr(parent, self.queryset_related_name).all()
+        if self.select_related_fields:
+            queryset = queryset.select_related(*self.select_related_fields)
+        return queryset
 
     def perform_create(self, serializer):
         """Сохраняет объект, привязанный к родителю и текущему пользователю."""
         parent = self.get_parent_object()
-        serializer.save(
-            **{self.parent_lookup: parent}, author=self.request.user)
+        try:
+            with transaction.atomic():
+                serializer.save(
+                    **{self.parent_lookup: parent}, author=self.request.user)
+        except IntegrityError:
+            raise ValidationError({
+                api_settings.NON_FIELD_ERRORS_KEY: [
+                    self.integrity_error_message]
+            })
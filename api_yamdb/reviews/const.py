@@ -1,2 +1,6 @@
 MAX_LENGTH_NAME = 256
 MAX_LENGTH_SLUG = 50
+TITLE_SEARCH_TABLE = 'reviews_title_fts'
+REVIEW_SEARCH_TABLE = 'reviews_review_fts'
+# Веса совпадений в названии, описании и тексте отзыва.
+TITLE_SEARCH_WEIGHTS = (10.0, 2.0, 1.0)
@@ -0,0 +1,315 @@
+import csv
+import os
+import pickle
+import queue
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import nullcontext
+from itertools import islice
+from multiprocessing import Manager
+
+import django
+from django.contrib.auth import get_user_model
+from django.db import connection, transaction
+from reviews.models import Category, Comment, Genre, Review, Title
+from reviews.search import deferred_review_indexing
+
+User = get_user_model()
+
+DEFAULT_BATCH_SIZE = 1000
+DEFAULT_PREFETCH = 4
+
+
+def build_category(row):
+    return Category(id=row['id'], name=row['name'], slug=row['slug'])
+
+
+def build_genre(row):
+    return Genre(id=row['id'], name=row['name'], slug=row['slug'])
+
+
+def build_title(row):
+    return Title(
+        id=row['id'],
+        name=row['name'],
+        year=row['year'],
+        category_id=row['category'] or None
+    )
+
+
+def build_user(row):
+    return User(
+        id=row['id'],
+        username=row['username'],
+        email=row['email'],
+        role=row['role'],
+        bio=row.get('bio', ''),
+        first_name=row.get('first_name', ''),
+        last_name=row.get('last_name', '')
+    )
+
+
+def build_genre_title(row):
+    return Title.genre.through(
+        id=row['id'],
+        title_id=row['title_id'],
+        genre_id=row['genre_id']
+    )
+
+
+def build_review(row):
+    return Review(
+        id=row['id'],
+        title_id=row['title_id'],
+        author_id=row['author'],
+        text=row['text'],
+        score=row['score']
+    )
+
+
+def build_comment(row):
+    return Comment(
+        id=row['id'],
+        review_id=row['review_id'],
+        author_id=row['author'],
+        text=row['text']
+    )
+
+
+CsvFile = namedtuple(
+    'CsvFile', ('filename', 'model', 'build', 'fields', 'depends'))
+
+# fields — поля, обновляемые у существующих строк в режиме upsert;
+# depends — файлы, которые должны быть загружены раньше.
+CSV_FILES = (
+    CsvFile('category.csv', Category, build_category, ('name', 'slug'), ()),
+    CsvFile('genre.csv', Genre, build_genre, ('name', 'slug'), ()),
+    CsvFile('users.csv', User, build_user, (
+        'username', 'email', 'role', 'bio', 'first_name', 'last_name'), ()),
+    CsvFile('titles.csv', Title, build_title, (
+        'name', 'year', 'category'), ('category.csv',)),
+    CsvFile('genre_title.csv', Title.genre.through, build_genre_title, (),
+            ('titles.csv', 'genre.csv')),
+    CsvFile('review.csv', Review, build_review, (
+        'title', 'author', 'text', 'score'), ('titles.csv', 'users.csv')),
+    CsvFile('comments.csv', Comment, build_comment, (
+        'review', 'author', 'text'), ('review.csv', 'users.csv')),
+)
+
+ImportResult = namedtuple('ImportResult', ('filename', 'rows', 'elapsed'))
+
+
+class CsvReadError(Exception):
+    """Ошибка чтения или разбора CSV-файла."""
+
+
+def import_stages(files):
+    """Разбивает файлы на этапы по графу зависимостей.
+
+    Файлы одного этапа зависят только от файлов предыдущих этапов
+    и могут загружаться одновременно.
+    """
+    pending = {csv_file.filename: csv_file for csv_file in files}
+    loaded = set()
+    stages = []
+    while pending:
+        stage = [
+            csv_file for csv_file in pending.values()
+            if loaded.issuperset(csv_file.depends)
+        ]
+        if not stage:
+            raise ValueError(
+                'Не удалось упорядочить файлы: зависимости '
+                f'{sorted(pending)} отсутствуют или образуют цикл.'
+            )
+        stages.append(stage)
+        for csv_file in stage:
+            loaded.add(csv_file.filename)
+            del pending[csv_file.filename]
+    return stages
+
+
+def read_batches(path, build, batch_size):
+    """Построчно читает CSV-файл и отдаёт объекты пачками."""
+    with open(path, encoding='utf-8', newline='') as file:
+        objects = map(build, csv.DictReader(file))
+        while True:
+            batch = list(islice(objects, batch_size))
+            if not batch:
+                return
+            yield batch
+
+
+def put_until_cancelled(batches, item, cancelled):
+    """Кладёт элемент в очередь; False, если загрузка отменена."""
+    while not cancelled.is_set():
+        try:
+            batches.put(item, timeout=0.1)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def read_file(path, build, batch_size, batches, cancelled):
+    """Разбирает файл в процессе пула и передаёт пачки объектов в очередь.
+
+    Пачки передаются уже сериализованными: очередь менеджера пересылает
+    байты, а пишущий поток только восстанавливает объекты. Конец файла
+    обозначается None, ошибка чтения — CsvReadError.
+    """
+    try:
+        for batch in read_batches(path, build, batch_size):
+            if not put_until_cancelled(
+                batches, pickle.dumps(batch, pickle.HIGHEST_PROTOCOL),
+                cancelled
+            ):
+                return
+        item = None
+    except Exception as error:
+        item = CsvReadError(f'{os.path.basename(path)}: {error!r}')
+    put_until_cancelled(batches, item, cancelled)
+
+
+def insert_batch(csv_file, batch):
+    """Вставляет пачку новых строк."""
+    csv_file.model.objects.bulk_create(batch)
+
+
+def upsert_batch(csv_file, batch):
+    """Обновляет существующие строки пачки и вставляет остальные."""
+    manager = csv_file.model.objects
+    existing = set(
+        manager.filter(pk__in=[obj.pk for obj in batch])
+        .values_list('pk', flat=True)
+    )
+    if csv_file.fields:
+        manager.bulk_update(
+            [obj for obj in batch if int(obj.pk) in existing],
+            csv_file.fields
+        )
+    manager.bulk_create(
+        [obj for obj in batch if int(obj.pk) not in existing],
+        ignore_conflicts=True
+    )
+
+
+class CsvImporter:
+    """Загружает CSV-файлы по этапам графа зависимостей.
+
+    Чтение и разбор файлов идут в пуле из workers процессов с опережением
+    не более prefetch пачек на файл, поэтому память ограничена, а разбор
+    не делит GIL с записью. Каждую таблицу пишет ровно один поток в своей
+    транзакции. Файлы одного этапа записываются параллельно, если база
+    допускает одновременных писателей; SQLite блокирует запись целиком,
+    поэтому для неё запись идёт по очереди, а разбор следующих файлов —
+    параллельно с ней. При workers=1 файл разбирает сам пишущий поток.
+    """
+
+    def __init__(self, data_path, batch_size=DEFAULT_BATCH_SIZE,
+                 upsert=False, workers=1, prefetch=DEFAULT_PREFETCH):
+        self.data_path = data_path
+        self.batch_size = batch_size
+        self.save_batch = upsert_batch if upsert else insert_batch
+        self.workers = max(1, workers)
+        self.prefetch = prefetch
+
+    def _path(self, csv_file):
+        return os.path.join(self.data_path, csv_file.filename)
+
+    def _read_inline(self, csv_file):
+        try:
+            yield from read_batches(
+                self._path(csv_file), csv_file.build, self.batch_size)
+        except Exception as error:
+            raise CsvReadError(f'{csv_file.filename}: {error!r}') from error
+
+    def _receive(self, batches, reader):
+        while True:
+            try:
+                item = batches.get(timeout=0.1)
+            except queue.Empty:
+                if reader.done():
+                    # Пробрасывает ошибку, если процесс пула упал.
+                    reader.result()
+                continue
+            if item is None:
+                return
+            if isinstance(item, Exception):
+                raise item
+            yield pickle.loads(item)
+
+    def _write(self, csv_file, batches):
+        started = time.perf_counter()
+        rows = 0
+        indexing = (
+            deferred_review_indexing() if csv_file.model is Review
+            else nullcontext()
+        )
+        with indexing, transaction.atomic():
+            for batch in batches:
+                self.save_batch(csv_file, batch)
+                rows += len(batch)
+        return ImportResult(
+            csv_file.filename, rows, time.perf_counter() - started)
+
+    def _write_in_thread(self, csv_file, batches):
+        try:
+            return self._write(csv_file, batches)
+        finally:
+            connection.close()
+
+    def _write_stages(self, stages, sources, report):
+        parallel_writes = self.workers > 1 and connection.vendor != 'sqlite'
+        results = []
+        with ThreadPoolExecutor(self.workers) as writers:
+            for stage in stages:
+                if parallel_writes:
+                    stage_results = [
+                        future.result() for future in [
+                            writers.submit(
+                                self._write_in_thread, csv_file,
+                                sources[csv_file.filename]
+                            )
+                            for csv_file in stage
+                        ]
+                    ]
+                else:
+                    stage_results = [
+                        self._write(csv_file, sources[csv_file.filename])
+                        for csv_file in stage
+                    ]
+                for result in stage_results:
+                    results.append(result)
+                    if report is not None:
+                        report(result)
+        return results
+
+    def run(self, files=CSV_FILES, report=None):
+        """Загружает файлы и возвращает результаты в порядке загрузки."""
+        stages = import_stages(files)
+        if self.workers == 1:
+            sources = {
+                csv_file.filename: self._read_inline(csv_file)
+                for stage in stages for csv_file in stage
+            }
+            return self._write_stages(stages, sources, report)
+        with Manager() as manager, ProcessPoolExecutor(
+            self.workers, initializer=django.setup
+        ) as readers:
+            cancelled = manager.Event()
+            sources = {}
+            for stage in stages:
+                for csv_file in stage:
+                    batches = manager.Queue(maxsize=self.prefetch)
+                    reader = readers.submit(
+                        read_file, self._path(csv_file), csv_file.build,
+                        self.batch_size, batches, cancelled
+                    )
+                    sources[csv_file.filename] = self._receive(
+                        batches, reader)
+            try:
+                return self._write_stages(stages, sources, report)
+            finally:
+                cancelled.set()
@@ -1,13 +1,28 @@
 from django_filters import rest_framework as filters
 from reviews.models import Title
+from reviews.registry import category_registry, genre_registry
 
 
 class TitleFilter(filters.FilterSet):
-    genre = filters.CharFilter(field_name='genre__slug')
-    category = filters.CharFilter(field_name='category__slug')
+    genre = filters.CharFilter(method='filter_genre')
+    category = filters.CharFilter(method='filter_category')
     year = filters.NumberFilter(field_name='year')
     name = filters.CharFilter(field_name='name', lookup_expr='icontains')
 
     class Meta:
         model = Title
         fields = ['genre', 'category', 'year', 'name']
+
+    def filter_genre(self, queryset, name, value):
+        """Фильтрует по жанру, определяя его id через справочник."""
+        genre = genre_registry.get(value)
+        if genre is None:
+            return queryset.none()
+        return queryset.filter(genre=genre.pk)
+
+    def filter_category(self, queryset, name, value):
+        """Фильтрует по категории без JOIN с таблицей категорий."""
+        category = category_registry.get(value)
+        if category is None:
+            return queryset.none()
+        return queryset.filter(category_id=category.pk)
@@ -0,0 +1,69 @@
+from django.core.management.base import BaseCommand, CommandError
+from reviews.dataset import DEFAULT_BATCH_SIZE, DEFAULT_SKEW, DatasetGenerator
+from reviews.ratings import recompute_ratings
+from reviews.registry import invalidate_registries
+from reviews.search import ensure_search_index
+
+SIZES = (
+    ('users', 10000),
+    ('categories', 10),
+    ('genres', 30),
+    ('titles', 10000),
+    ('reviews', 100000),
+    ('comments', 200000),
+)
+
+
+class Command(BaseCommand):
+    """Команда для генерации синтетических данных для нагрузочных тестов."""
+
+    help = 'Generate a reproducible synthetic dataset for scale testing'
+
+    def add_arguments(self, parser):
+        for name, default in SIZES:
+            parser.add_argument(
+                f'--{name}', type=int, default=default,
+                help=f'Number of {name} to create (default {default}).'
+            )
+        parser.add_argument(
+            '--seed', type=int, default=0,
+            help='Random seed; the same seed produces the same data.'
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=DEFAULT_BATCH_SIZE,
+            help='Number of rows inserted per query.'
+        )
+        parser.add_argument(
+            '--title-skew', type=float, default=DEFAULT_SKEW,
+            help='Zipf exponent of title popularity; 0 is uniform.'
+        )
+        parser.add_argument(
+            '--author-skew', type=float, default=DEFAULT_SKEW,
+            help='Zipf exponent of reviewer activity; 0 is uniform.'
+        )
+
+    def handle(self, *args, **options):
+        """Основной метод команды, создаёт данные и пересчитывает рейтинги."""
+        for name in ('users', 'categories', 'genres', 'titles'):
+            if options[name] < 1:
+                raise CommandError(f'--{name} must be at least 1.')
+        ensure_search_index()
+        generator = DatasetGenerator(
+            seed=options['seed'],
+            batch_size=options['batch_size'],
+            title_skew=options['title_skew'],
+            author_skew=options['author_skew']
+        )
+        generator.generate(
+            *(options[name] for name, _ in SIZES), report=self.report)
+        recompute_ratings()
+        invalidate_registries()
+        self.stdout.write(self.style.SUCCESS('Dataset generated!'))
+
+    def report(self, result):
+        """Выводит скорость заполнения одной таблицы."""
+        rate = result.rows / result.elapsed if result.elapsed else 0
+        self.stdout.write(
+            f'{result.table}: {result.rows} rows in '
+            f'{result.elapsed:.2f}s ({rate:.0f} rows/s)'
+        )
@@ -1,11 +1,11 @@
-import csv
 import os
 
-from django.contrib.auth import get_user_model
-from django.core.management.base import BaseCommand
-from reviews.models import Category, Comment, Genre, Review, Title
-
-User = get_user_model()
+from django.core.management.base import BaseCommand, CommandError
+from django.db import IntegrityError
+from reviews.csv_import import (CSV_FILES, DEFAULT_BATCH_SIZE, CsvImporter,
+                                CsvReadError)
+from reviews.ratings import recompute_ratings
+from reviews.registry import invalidate_registries
 
 data_path = os.path.join(
     os.path.dirname(os.path.abspath(__file__)), '../../../static/data')
@@ -16,101 +16,52 @@ class Command(BaseCommand):
 
     help = 'Load data from CSV files into the database'
 
-    def handle(self, *args, **kwargs):
-        """Основной метод команды, загружает все данные."""
-        self.load_categories()
-        self.load_genres()
-        self.load_titles()
-        self.load_users()
-        self.load_reviews()
-        self.load_comments()
-        self.stdout.write(self.style.SUCCESS('Successfully loaded all data!'))
-
-    def load_categories(self):
-        """Загружает категории из CSV-файла."""
-        with open(
-            os.path.join(data_path, 'category.csv'), encoding='utf-8'
-        ) as file:
-            reader = csv.DictReader(file)
-            Category.objects.bulk_create(
-                [Category(
-                    id=row['id'],
-                    name=row['name'],
-                    slug=row['slug']
-                ) for row in reader]
-            )
-
-    def load_genres(self):
-        """Загружает жанры из CSV-файла."""
-        with open(
-            os.path.join(data_path, 'genre.csv'), encoding='utf-8'
-        ) as file:
-            reader = csv.DictReader(file)
-            Genre.objects.bulk_create(
-                [Genre(
-                    id=row['id'],
-                    name=row['name'],
-                    slug=row['slug']
-                ) for row in reader]
-            )
-
-    def load_titles(self):
-        """Загружает произведения из CSV-файла."""
-        with open(
-            os.path.join(data_path, 'titles.csv'), encoding='utf-8'
-        ) as file:
-            reader = csv.DictReader(file)
-            Title.objects.bulk_create(
-                [Title(
-                    id=row['id'],
-                    name=row['name'],
-                    year=row['year'],
-                    category=Category.objects.get(id=row['category'])
-                ) for row in reader]
-            )
-
-    def load_users(self):
-        """Загружает пользователей из CSV-файла."""
-        with open(
-            os.path.join(data_path, 'users.csv'), encoding='utf-8'
-        ) as file:
-            reader = csv.DictReader(file)
-            User.objects.bulk_create(
-                [User(
-                    id=row['id'],
-                    username=row['username'],
-                    email=row['email'],
-                    role=row['role']
-                ) for row in reader]
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=DEFAULT_BATCH_SIZE,
+            help='Number of rows inserted per query.'
+        )
+        parser.add_argument(
+            '--data-path', default=data_path,
+            help='Directory containing the CSV files.'
+        )
+        parser.add_argument(
+            '--upsert', action='store_true',
+            help='Update rows that already exist instead of failing.'
+        )
+        parser.add_argument(
+            '--workers', type=int, default=os.cpu_count() or 1,
+            help=(
+                'Number of processes parsing files and, on databases '
+                'with concurrent writes, of threads writing them.'
             )
+        )
 
-    def load_reviews(self):
-        """Загружает отзывы из CSV-файла."""
-        with open(
-            os.path.join(data_path, 'review.csv'), encoding='utf-8'
-        ) as file:
-            reader = csv.DictReader(file)
-            Review.objects.bulk_create(
-                [Review(
-                    id=row['id'],
-                    title=Title.objects.get(id=row['title_id']),
-                    author=User.objects.get(id=row['author']),
-                    text=row['text'],
-                    score=row['score']
-                ) for row in reader]
-            )
+    def handle(self, *args, **options):
+        """Основной метод команды, загружает все данные."""
+        importer = CsvImporter(
+            options['data_path'],
+            batch_size=options['batch_size'],
+            upsert=options['upsert'],
+            workers=options['workers']
+        )
+        try:
+            importer.run(CSV_FILES, report=self.report)
+        except CsvReadError as error:
+            raise CommandError(f'Failed to read {error}') from error
+        except IntegrityError as error:
+            raise CommandError(
+                f'Failed to save rows: {error}. If the data is already '
+                'loaded, rerun with --upsert to update it.'
+            ) from error
+        recompute_ratings()
+        invalidate_registries()
+        self.stdout.write(self.style.SUCCESS('Successfully loaded all data!'))
 
-    def load_comments(self):
-        """Загружает комментарии из CSV-файла."""
-        with open(
-            os.path.join(data_path, 'comments.csv'), encoding='utf-8'
-        ) as file:
-            reader = csv.DictReader(file)
-            Comment.objects.bulk_create(
-                [Comment(
-                    id=row['id'],
-                    review=Review.objects.get(id=row['review_id']),
-                    author=User.objects.get(id=row['author']),
-                    text=row['text']
-                ) for row in reader]
-            )
+    def report(self, result):
+        """Выводит скорость загрузки одного файла."""
+        rate = result.rows / result.elapsed if result.elapsed else 0
+        self.stdout.write(
+            f'{result.filename}: {result.rows} rows in '
+            f'{result.elapsed:.2f}s ({rate:.0f} rows/s)'
+        )
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand, CommandError
+from reviews.search import rebuild_search_index
+
+
+class Command(BaseCommand):
+    """Команда для восстановления и пересборки поискового индекса."""
+
+    help = 'Restore full-text search tables and triggers and rebuild them'
+
+    def handle(self, *args, **kwargs):
+        """Создаёт недостающие таблицы и триггеры и пересобирает индексы."""
+        if not rebuild_search_index():
+            raise CommandError('Full-text search requires SQLite with FTS5.')
+        self.stdout.write(self.style.SUCCESS('Search index rebuilt.'))
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+from reviews.ratings import recompute_ratings
+
+
+class Command(BaseCommand):
+    """Команда для пересчёта сохранённых рейтингов произведений."""
+
+    help = 'Recompute stored title ratings from reviews'
+
+    def handle(self, *args, **kwargs):
+        """Пересчитывает рейтинги всех произведений."""
+        updated = recompute_ratings()
+        self.stdout.write(
+            self.style.SUCCESS(f'Recomputed ratings for {updated} titles.'))
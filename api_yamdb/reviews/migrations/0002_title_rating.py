@@ -0,0 +1,50 @@
+# Generated by Django 3.2 on 2026-10-18 02:27
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+
+def fill_ratings(apps, schema_editor):
+    Title = apps.get_model('reviews', 'Title')
+    Review = apps.get_model('reviews', 'Review')
+
+    def aggregate(expression):
+        return Coalesce(
+            Subquery(
+                Review.objects
+                .filter(title=OuterRef('pk'))
+                .order_by()
+                .values('title')
+                .annotate(value=expression)
+                .values('value'),
+                output_field=IntegerField()
+            ),
+            0
+        )
+
+    Title.objects.update(
+        rating_sum=aggregate(Sum('score')),
+        rating_count=aggregate(Count('id'))
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='title',
+            name='rating_count',
+            field=models.PositiveIntegerField(default=0, verbose_name='Количество оценок'),
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='rating_sum',
+            field=models.PositiveIntegerField(default=0, verbose_name='Сумма оценок'),
+        ),
+        migrations.RunPython(fill_ratings, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,107 @@
+from django.db import migrations
+from django.db.utils import OperationalError
+
+# Тексты отзывов индексируются каждый отдельно, по id отзыва: запись
+# отзыва меняет одну строку индекса, а не тексты всех отзывов
+# произведения.
+CREATE_SQL = (
+    """
+    CREATE VIRTUAL TABLE reviews_title_fts USING fts5(name, description)
+    """,
+    """
+    CREATE VIRTUAL TABLE reviews_review_fts
+    USING fts5(text, content='reviews_review', content_rowid='id')
+    """,
+    """
+    CREATE TRIGGER reviews_title_fts_ai AFTER INSERT ON reviews_title
+    BEGIN
+        INSERT INTO reviews_title_fts(rowid, name, description)
+        VALUES (NEW.id, NEW.name, COALESCE(NEW.description, ''));
+    END
+    """,
+    """
+    CREATE TRIGGER reviews_title_fts_au
+    AFTER UPDATE OF name, description ON reviews_title
+    BEGIN
+        UPDATE reviews_title_fts
+        SET name = NEW.name, description = COALESCE(NEW.description, '')
+        WHERE rowid = NEW.id;
+    END
+    """,
+    """
+    CREATE TRIGGER reviews_title_fts_ad AFTER DELETE ON reviews_title
+    BEGIN
+        DELETE FROM reviews_title_fts WHERE rowid = OLD.id;
+    END
+    """,
+    """
+    CREATE TRIGGER reviews_review_fts_ai AFTER INSERT ON reviews_review
+    BEGIN
+        INSERT INTO reviews_review_fts(rowid, text) VALUES (NEW.id, NEW.text);
+    END
+    """,
+    """
+    CREATE TRIGGER reviews_review_fts_au AFTER UPDATE OF text ON reviews_review
+    BEGIN
+        INSERT INTO reviews_review_fts(reviews_review_fts, rowid, text)
+        VALUES ('delete', OLD.id, OLD.text);
+        INSERT INTO reviews_review_fts(rowid, text) VALUES (NEW.id, NEW.text);
+    END
+    """,
+    """
+    CREATE TRIGGER reviews_review_fts_ad AFTER DELETE ON reviews_review
+    BEGIN
+        INSERT INTO reviews_review_fts(reviews_review_fts, rowid, text)
+        VALUES ('delete', OLD.id, OLD.text);
+    END
+    """,
+    """
+    INSERT INTO reviews_title_fts(rowid, name, description)
+    SELECT id, name, COALESCE(description, '') FROM reviews_title
+    """,
+    "INSERT INTO reviews_review_fts(reviews_review_fts) VALUES ('rebuild')",
+)
+
+DROP_SQL = (
+    'DROP TRIGGER IF EXISTS reviews_review_fts_ad',
+    'DROP TRIGGER IF EXISTS reviews_review_fts_au',
+    'DROP TRIGGER IF EXISTS reviews_review_fts_ai',
+    'DROP TRIGGER IF EXISTS reviews_title_fts_ad',
+    'DROP TRIGGER IF EXISTS reviews_title_fts_au',
+    'DROP TRIGGER IF EXISTS reviews_title_fts_ai',
+    'DROP TABLE IF EXISTS reviews_review_fts',
+    'DROP TABLE IF EXISTS reviews_title_fts',
+)
+
+
+def create_search_index(apps, schema_editor):
+    """Создаёт индекс FTS5, если база — SQLite с поддержкой FTS5."""
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    try:
+        with schema_editor.connection.cursor() as cursor:
+            cursor.execute(
+                'CREATE VIRTUAL TABLE temp.fts5_probe USING fts5(value)')
+            cursor.execute('DROP TABLE temp.fts5_probe')
+    except OperationalError:
+        return
+    for statement in CREATE_SQL:
+        schema_editor.execute(statement)
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for statement in DROP_SQL:
+        schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0002_title_rating'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
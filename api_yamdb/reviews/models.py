@@ -69,14 +69,36 @@ class Title(models.Model):
         related_name='titles',
         verbose_name='Жанры'
     )
+    rating_sum = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Сумма оценок'
+    )
+    rating_count = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Количество оценок'
+    )
 
     def __str__(self):
         return self.name
 
+    @property
+    def rating(self):
+        """Средняя оценка произведения или None, если отзывов нет."""
+        if not self.rating_count:
+            return None
+        return self.rating_sum / self.rating_count
+
     class Meta:
         verbose_name = 'Произведение'
         verbose_name_plural = 'Произведения'
         ordering = ('name',)
+        indexes = (
+            models.Index(
+                fields=('category', 'year'),
+                name='title_category_year_idx'
+            ),
+            models.Index(fields=('name',), name='title_name_idx'),
+        )
 
 
 class Review(models.Model):
@@ -97,6 +119,13 @@ class Review(models.Model):
     text = models.TextField(verbose_name='Текст отзыва')
     score = models.PositiveSmallIntegerField(verbose_name='Оценка')
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Запоминает исходную оценку для пересчёта рейтинга."""
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_score = instance.__dict__.get('score')
+        return instance
+
     def validate_score(value):
         if value < 1 or value > 10:
             raise ValidationError('Оценка должна быть от 1 до 10')
@@ -114,6 +143,13 @@ class Review(models.Model):
         verbose_name_plural = 'Отзывы'
         ordering = ('-pub_date',)
         unique_together = ('title', 'author')
+        # Порядок совпадает со списком отзывов и курсором NestedViewSet.
+        indexes = (
+            models.Index(
+                fields=('title', '-pub_date', '-id'),
+                name='review_title_pub_date_idx'
+            ),
+        )
 
 
 class Comment(models.Model):
@@ -144,3 +180,9 @@ class Comment(models.Model):
         verbose_name = 'Комментарий'
         verbose_name_plural = 'Комментарии'
         ordering = ('-pub_date',)
+        indexes = (
+            models.Index(
+                fields=('review', '-pub_date', '-id'),
+                name='comment_review_pub_date_idx'
+            ),
+        )
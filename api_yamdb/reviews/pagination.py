@@ -0,0 +1,161 @@
+import json
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import (BasePagination, Cursor,
+                                       CursorPagination, PageNumberPagination,
+                                       _reverse_ordering)
+
+
+class KeysetPagination(CursorPagination):
+    """Курсорная пагинация по составному порядку, заданному во вьюсете.
+
+    Вьюсет объявляет атрибут cursor_ordering, например ('-pub_date', '-id'),
+    где последнее поле уникально. Курсор хранит значения всех полей
+    порядка у крайней строки страницы, и следующая страница выбирается
+    условием (a, b) > (x, y) без OFFSET, даже если у многих строк
+    совпадает первое поле. Поля порядка не должны содержать NULL.
+    """
+
+    def get_ordering(self, request, queryset, view):
+        """Возвращает порядок сортировки, объявленный во вьюсете."""
+        return tuple(getattr(view, 'cursor_ordering', self.ordering))
+
+    def decode_cursor(self, request):
+        cursor = super().decode_cursor(request)
+        if cursor is None or cursor.position is None:
+            return cursor
+        try:
+            position = json.loads(cursor.position)
+        except ValueError:
+            raise NotFound(self.invalid_cursor_message)
+        if (
+            not isinstance(position, list)
+            or len(position) != len(self.ordering)
+        ):
+            raise NotFound(self.invalid_cursor_message)
+        try:
+            position = [
+                self.to_python(field, value)
+                for field, value in zip(self.ordering, position)
+            ]
+        except (ValidationError, ValueError, TypeError, OverflowError):
+            raise NotFound(self.invalid_cursor_message)
+        return cursor._replace(offset=0, position=position)
+
+    def to_python(self, field, value):
+        """Приводит значение из курсора к типу поля порядка.
+
+        Курсор приходит от клиента, поэтому значение проверяется полем
+        модели: пустые, составные и не приводимые к типу значения дают
+        ValidationError или TypeError. Целые ограничены 64 битами: SQLite
+        не сообщает полям свой диапазон.
+        """
+        if not isinstance(value, (str, int, float)):
+            raise TypeError(value)
+        value = self.model._meta.get_field(field.lstrip('-')).clean(
+            value, None)
+        if isinstance(value, int) and not -2 ** 63 <= value < 2 ** 63:
+            raise OverflowError(value)
+        return value
+
+    def seek(self, ordering, position):
+        """Условие «строка идёт после position» для порядка ordering."""
+        condition = Q()
+        equal = {}
+        for field, value in zip(ordering, position):
+            name = field.lstrip('-')
+            lookup = 'lt' if field.startswith('-') else 'gt'
+            condition |= Q(**equal, **{f'{name}__{lookup}': value})
+            equal[name] = value
+        return condition
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.model = queryset.model
+        self.cursor = self.decode_cursor(request)
+        reverse, position = (
+            (False, None) if self.cursor is None
+            else (self.cursor.reverse, self.cursor.position)
+        )
+        ordering = (
+            _reverse_ordering(self.ordering) if reverse else self.ordering)
+        queryset = queryset.order_by(*ordering)
+        if position is not None:
+            queryset = queryset.filter(self.seek(ordering, position))
+
+        # Лишняя строка показывает, есть ли страница дальше.
+        results = list(queryset[:self.page_size + 1])
+        self.page = results[:self.page_size]
+        has_following = len(results) > len(self.page)
+        if reverse:
+            self.page.reverse()
+            self.has_next, self.has_previous = (
+                position is not None, has_following)
+        else:
+            self.has_next, self.has_previous = (
+                has_following, position is not None)
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+        return self.page
+
+    def position(self, instance):
+        return json.dumps([
+            getattr(instance, field.lstrip('-')) for field in self.ordering
+        ], default=str, ensure_ascii=False)
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        # Пустая страница при движении назад: следующая — первая.
+        position = self.position(self.page[-1]) if self.page else None
+        return self.encode_cursor(
+            Cursor(offset=0, reverse=False, position=position))
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        position = self.position(self.page[0]) if self.page else None
+        return self.encode_cursor(
+            Cursor(offset=0, reverse=True, position=position))
+
+
+class PageNumberOrCursorPagination(BasePagination):
+    """Постраничная пагинация с опциональным курсорным режимом.
+
+    По умолчанию работает как PageNumberPagination. Параметр запроса
+    ?pagination=cursor включает KeysetPagination; ссылки next и previous
+    сохраняют этот параметр.
+    """
+
+    mode_query_param = 'pagination'
+    cursor_mode = 'cursor'
+
+    def __init__(self):
+        self.paginator = PageNumberPagination()
+
+    def paginate_queryset(self, queryset, request, view=None):
+        """Выбирает пагинатор по параметру запроса и делегирует ему."""
+        if request.query_params.get(self.mode_query_param) == self.cursor_mode:
+            self.paginator = KeysetPagination()
+        else:
+            self.paginator = PageNumberPagination()
+        return self.paginator.paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        return self.paginator.get_paginated_response(data)
+
+    def get_paginated_response_schema(self, schema):
+        return self.paginator.get_paginated_response_schema(schema)
+
+    def to_html(self):
+        return self.paginator.to_html()
+
+    @property
+    def display_page_controls(self):
+        return getattr(self.paginator, 'display_page_controls', False)
@@ -0,0 +1,37 @@
+from django.db.models import Count, F, IntegerField, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+from reviews.models import Review, Title
+
+
+def update_rating(title_id, score_delta, count_delta):
+    """Атомарно изменяет сумму и количество оценок произведения."""
+    Title.objects.filter(pk=title_id).update(
+        rating_sum=F('rating_sum') + score_delta,
+        rating_count=F('rating_count') + count_delta
+    )
+
+
+def _review_aggregate(aggregate):
+    """Подзапрос с агрегатом по отзывам текущего произведения."""
+    return Coalesce(
+        Subquery(
+            Review.objects
+            .filter(title=OuterRef('pk'))
+            .order_by()
+            .values('title')
+            .annotate(value=aggregate)
+            .values('value'),
+            output_field=IntegerField()
+        ),
+        0
+    )
+
+
+def recompute_ratings(queryset=None):
+    """Пересчитывает рейтинги произведений одним UPDATE-запросом."""
+    if queryset is None:
+        queryset = Title.objects.all()
+    return queryset.update(
+        rating_sum=_review_aggregate(Sum('score')),
+        rating_count=_review_aggregate(Count('id'))
+    )
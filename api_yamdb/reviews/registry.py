@@ -0,0 +1,144 @@
+import threading
+import time
+from collections import namedtuple
+from operator import attrgetter
+
+from api.metrics import record_cache
+from django.core.cache import cache
+from django.db import router
+from reviews.models import Category, Genre
+
+Snapshot = namedtuple(
+    'Snapshot',
+    ('version', 'loaded_at', 'checked_at', 'by_slug', 'by_pk', 'objects',
+     'representations')
+)
+
+
+class SlugRegistry:
+    """Кэш в памяти процесса для небольших справочников slug -> объект.
+
+    Снимок справочника живёт в памяти процесса и сверяется с номером
+    версии в общем кэше Django (CACHES) не чаще одного раза в
+    check_interval секунд. Сохранение или удаление объекта увеличивает
+    версию, и все процессы перечитывают справочник одним запросом.
+    Правки в обход сигналов (queryset.update(), загрузка данных)
+    подхватываются не позже чем через max_age секунд.
+    """
+
+    check_interval = 1.0
+    max_age = 60.0
+    representation_fields = ('name', 'slug')
+
+    def __init__(self, model):
+        self.model = model
+        self.version_key = f'slug-registry:{model._meta.label_lower}'
+        self.metrics_name = f'registry:{model._meta.model_name}'
+        self._snapshot = None
+        self._lock = threading.Lock()
+
+    def __deepcopy__(self, memo):
+        # Поля сериализаторов копируются для каждого экземпляра,
+        # а справочник должен оставаться общим.
+        return self
+
+    def _shared_version(self):
+        return cache.get_or_set(self.version_key, time.time_ns, timeout=None)
+
+    def _load(self, version):
+        # Справочник читается с основной базы: снимок из отставшей
+        # реплики сохранился бы под новой версией до следующей правки.
+        objects = tuple(
+            self.model.objects.using(router.db_for_write(self.model)))
+        now = time.monotonic()
+        return Snapshot(
+            version=version,
+            loaded_at=now,
+            checked_at=now,
+            by_slug={obj.slug: obj for obj in objects},
+            by_pk={obj.pk: obj for obj in objects},
+            objects=objects,
+            representations={
+                obj.pk: {
+                    field: getattr(obj, field)
+                    for field in self.representation_fields
+                }
+                for obj in objects
+            }
+        )
+
+    def snapshot(self, refresh=False):
+        """Возвращает актуальный снимок справочника."""
+        snapshot = self._snapshot
+        now = time.monotonic()
+        if (
+            not refresh and snapshot is not None
+            and now - snapshot.checked_at < self.check_interval
+        ):
+            record_cache(self.metrics_name, True)
+            return snapshot
+        with self._lock:
+            version = self._shared_version()
+            snapshot = self._snapshot
+            hit = not (
+                refresh or snapshot is None or snapshot.version != version
+                or now - snapshot.loaded_at >= self.max_age
+            )
+            if hit:
+                snapshot = snapshot._replace(checked_at=now)
+            else:
+                snapshot = self._load(version)
+            self._snapshot = snapshot
+        record_cache(self.metrics_name, hit)
+        return snapshot
+
+    def _lookup(self, index, key):
+        snapshot = self.snapshot()
+        value = getattr(snapshot, index).get(key)
+        # Промах перечитывает справочник не чаще раза в check_interval:
+        # несуществующие слаги не должны стоить запроса каждый раз.
+        if (
+            value is None
+            and time.monotonic() - snapshot.loaded_at >= self.check_interval
+        ):
+            value = getattr(self.snapshot(refresh=True), index).get(key)
+        return value
+
+    def get(self, slug):
+        """Возвращает объект по слагу или None."""
+        return self._lookup('by_slug', slug)
+
+    def get_by_pk(self, pk):
+        """Возвращает объект по первичному ключу или None."""
+        return self._lookup('by_pk', pk)
+
+    def representation(self, pk):
+        """Возвращает готовое представление объекта для ответа API."""
+        return self._lookup('representations', pk)
+
+    def representations(self, ordering):
+        """Возвращает представления всех объектов в заданном порядке."""
+        snapshot = self.snapshot()
+        return [
+            snapshot.representations[obj.pk] for obj in sorted(
+                snapshot.objects, key=attrgetter(*ordering))
+        ]
+
+    def invalidate(self):
+        """Сбрасывает снимок во всех процессах, использующих общий кэш."""
+        self._snapshot = None
+        try:
+            cache.incr(self.version_key)
+        except ValueError:
+            cache.set(self.version_key, time.time_ns(), timeout=None)
+
+
+category_registry = SlugRegistry(Category)
+genre_registry = SlugRegistry(Genre)
+registries = (category_registry, genre_registry)
+
+
+def invalidate_registries():
+    """Сбрасывает все справочники, например после массовой загрузки."""
+    for registry in registries:
+        registry.invalidate()
@@ -0,0 +1,278 @@
+import re
+from contextlib import contextmanager
+from functools import lru_cache
+
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+from django.db.utils import OperationalError
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import BaseFilterBackend
+from reviews.const import (REVIEW_SEARCH_TABLE, TITLE_SEARCH_TABLE,
+                           TITLE_SEARCH_WEIGHTS)
+from reviews.models import Review, Title
+from reviews.pagination import PageNumberOrCursorPagination
+
+WORD_PATTERN = re.compile(r'\w+')
+
+
+@lru_cache(maxsize=None)
+def fts_enabled(alias, name):
+    """Проверяет, создан ли в базе индекс FTS5 для произведений."""
+    connection = connections[alias]
+    if connection.vendor != 'sqlite':
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = %s",
+            [TITLE_SEARCH_TABLE]
+        )
+        return cursor.fetchone() is not None
+
+
+# Схема индексов FTS5 из миграции 0003. Команды идемпотентны, поэтому
+# ими же восстанавливаются таблицы и триггеры, потерянные после сбоя.
+SEARCH_TABLES_SQL = (
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {TITLE_SEARCH_TABLE}
+    USING fts5(name, description)
+    """,
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {REVIEW_SEARCH_TABLE}
+    USING fts5(text, content='reviews_review', content_rowid='id')
+    """,
+)
+TITLE_TRIGGERS_SQL = (
+    f"""
+    CREATE TRIGGER IF NOT EXISTS reviews_title_fts_ai
+    AFTER INSERT ON reviews_title
+    BEGIN
+        INSERT INTO {TITLE_SEARCH_TABLE}(rowid, name, description)
+        VALUES (NEW.id, NEW.name, COALESCE(NEW.description, ''));
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS reviews_title_fts_au
+    AFTER UPDATE OF name, description ON reviews_title
+    BEGIN
+        UPDATE {TITLE_SEARCH_TABLE}
+        SET name = NEW.name, description = COALESCE(NEW.description, '')
+        WHERE rowid = NEW.id;
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS reviews_title_fts_ad
+    AFTER DELETE ON reviews_title
+    BEGIN
+        DELETE FROM {TITLE_SEARCH_TABLE} WHERE rowid = OLD.id;
+    END
+    """,
+)
+REVIEW_TRIGGERS_SQL = {
+    'reviews_review_fts_ai': f"""
+    CREATE TRIGGER IF NOT EXISTS reviews_review_fts_ai
+    AFTER INSERT ON reviews_review
+    BEGIN
+        INSERT INTO {REVIEW_SEARCH_TABLE}(rowid, text)
+        VALUES (NEW.id, NEW.text);
+    END
+    """,
+    'reviews_review_fts_au': f"""
+    CREATE TRIGGER IF NOT EXISTS reviews_review_fts_au
+    AFTER UPDATE OF text ON reviews_review
+    BEGIN
+        INSERT INTO {REVIEW_SEARCH_TABLE}({REVIEW_SEARCH_TABLE}, rowid, text)
+        VALUES ('delete', OLD.id, OLD.text);
+        INSERT INTO {REVIEW_SEARCH_TABLE}(rowid, text)
+        VALUES (NEW.id, NEW.text);
+    END
+    """,
+    'reviews_review_fts_ad': f"""
+    CREATE TRIGGER IF NOT EXISTS reviews_review_fts_ad
+    AFTER DELETE ON reviews_review
+    BEGIN
+        INSERT INTO {REVIEW_SEARCH_TABLE}({REVIEW_SEARCH_TABLE}, rowid, text)
+        VALUES ('delete', OLD.id, OLD.text);
+    END
+    """,
+}
+REBUILD_TITLE_INDEX_SQL = (
+    f'DELETE FROM {TITLE_SEARCH_TABLE}',
+    f"""
+    INSERT INTO {TITLE_SEARCH_TABLE}(rowid, name, description)
+    SELECT id, name, COALESCE(description, '') FROM reviews_title
+    """,
+)
+REBUILD_REVIEW_INDEX_SQL = (
+    f"INSERT INTO {REVIEW_SEARCH_TABLE}({REVIEW_SEARCH_TABLE}) "
+    f"VALUES ('rebuild')",
+)
+
+
+def existing_search_tables(cursor):
+    """Возвращает имена уже созданных таблиц FTS5."""
+    cursor.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'table' "
+        "AND name IN (%s, %s)",
+        [TITLE_SEARCH_TABLE, REVIEW_SEARCH_TABLE]
+    )
+    return {name for name, in cursor.fetchall()}
+
+
+def ensure_search_index(alias=DEFAULT_DB_ALIAS):
+    """Создаёт недостающие таблицы и триггеры FTS5.
+
+    Новые таблицы сразу заполняются. Возвращает False, если база не
+    SQLite или SQLite собран без FTS5.
+    """
+    connection = connections[alias]
+    if connection.vendor != 'sqlite':
+        return False
+    try:
+        with transaction.atomic(using=alias), connection.cursor() as cursor:
+            missing = {TITLE_SEARCH_TABLE, REVIEW_SEARCH_TABLE} - (
+                existing_search_tables(cursor))
+            for statement in (
+                SEARCH_TABLES_SQL + TITLE_TRIGGERS_SQL
+                + tuple(REVIEW_TRIGGERS_SQL.values())
+            ):
+                cursor.execute(statement)
+            if TITLE_SEARCH_TABLE in missing:
+                for statement in REBUILD_TITLE_INDEX_SQL:
+                    cursor.execute(statement)
+            if REVIEW_SEARCH_TABLE in missing:
+                for statement in REBUILD_REVIEW_INDEX_SQL:
+                    cursor.execute(statement)
+    except OperationalError:
+        return False
+    finally:
+        fts_enabled.cache_clear()
+    return True
+
+
+def rebuild_search_index(alias=DEFAULT_DB_ALIAS):
+    """Восстанавливает схему и заново строит оба индекса FTS5."""
+    if not ensure_search_index(alias):
+        return False
+    with transaction.atomic(using=alias), \
+            connections[alias].cursor() as cursor:
+        for statement in REBUILD_TITLE_INDEX_SQL + REBUILD_REVIEW_INDEX_SQL:
+            cursor.execute(statement)
+    return True
+
+
+@contextmanager
+def deferred_review_indexing(alias=DEFAULT_DB_ALIAS):
+    """Откладывает индексацию отзывов на время массовой вставки.
+
+    Пачка строк индексируется одним проходом быстрее, чем построчно
+    триггерами, поэтому при загрузке миллионов строк триггеры снимаются,
+    а индекс отзывов затем пересобирается одной командой rebuild. Всё
+    выполняется в одной транзакции: при ошибке или обрыве процесса
+    триггеры возвращаются откатом, а другие процессы не пишут отзывы
+    мимо индекса, пока триггеров нет.
+    """
+    connection = connections[alias]
+    if not fts_enabled(alias, str(connection.settings_dict['NAME'])):
+        yield
+        return
+    with transaction.atomic(using=alias):
+        with connection.cursor() as cursor:
+            for name in REVIEW_TRIGGERS_SQL:
+                cursor.execute(f'DROP TRIGGER IF EXISTS {name}')
+        yield
+        with connection.cursor() as cursor:
+            for statement in (
+                tuple(REVIEW_TRIGGERS_SQL.values()) + REBUILD_REVIEW_INDEX_SQL
+            ):
+                cursor.execute(statement)
+
+
+def build_match_query(terms):
+    """Собирает запрос MATCH: все слова обязательны, последнее — префикс."""
+    quoted = [f'"{term}"' for term in terms]
+    quoted[-1] += '*'
+    return ' '.join(quoted)
+
+
+def search_titles(queryset, terms):
+    """Возвращает произведения, найденные по словам, в порядке релевантности.
+
+    На SQLite использует индексы FTS5: по названию и описанию
+    произведения и по текстам отдельных отзывов. Произведение найдено,
+    если все слова встречаются в его названии и описании или в одном из
+    его отзывов; ранг складывается из лучшего совпадения каждого вида.
+    На остальных базах работает LIKE по тем же полям.
+    """
+    alias = queryset.db
+    if not fts_enabled(alias, str(connections[alias].settings_dict['NAME'])):
+        return like_search_titles(queryset, terms)
+    match = build_match_query(terms)
+    table = Title._meta.db_table
+    name_weight, description_weight, review_weight = TITLE_SEARCH_WEIGHTS
+    # bm25() нельзя вызывать внутри агрегата, поэтому ранги отзывов
+    # считаются во вложенном запросе; LIMIT -1 не даёт SQLite слить его
+    # с внешним GROUP BY.
+    ranked = (
+        f'SELECT title_id, SUM(rank) AS rank FROM ('
+        f'SELECT rowid AS title_id, '
+        f'bm25({TITLE_SEARCH_TABLE}, {name_weight}, {description_weight}) '
+        f'AS rank FROM {TITLE_SEARCH_TABLE} '
+        f'WHERE {TITLE_SEARCH_TABLE} MATCH %s '
+        f'UNION ALL '
+        f'SELECT title_id, MIN(rank) * {review_weight} FROM ('
+        f'SELECT review.title_id, bm25({REVIEW_SEARCH_TABLE}) AS rank '
+        f'FROM {REVIEW_SEARCH_TABLE} '
+        f'JOIN {Review._meta.db_table} AS review '
+        f'ON review.id = {REVIEW_SEARCH_TABLE}.rowid '
+        f'WHERE {REVIEW_SEARCH_TABLE} MATCH %s LIMIT -1'
+        f') GROUP BY title_id'
+        f') GROUP BY title_id'
+    )
+    return queryset.filter(
+        id__in=RawSQL(f'SELECT title_id FROM ({ranked})', (match, match))
+    ).annotate(
+        search_rank=RawSQL(
+            f'SELECT ranked.rank FROM ({ranked}) AS ranked '
+            f'WHERE ranked.title_id = {table}.id',
+            (match, match)
+        )
+    ).order_by('search_rank', 'name', 'id')
+
+
+def like_search_titles(queryset, terms):
+    """Запасной поиск через LIKE для баз без FTS5."""
+    for term in terms:
+        queryset = queryset.filter(
+            Q(name__icontains=term)
+            | Q(description__icontains=term)
+            | Q(reviews__text__icontains=term)
+        )
+    return queryset.distinct()
+
+
+class TitleFullTextSearchFilter(BaseFilterBackend):
+    """Полнотекстовый поиск произведений по параметру ?q=.
+
+    Результаты упорядочены по релевантности, а курсор требует
+    постоянного порядка по полям модели, поэтому поиск вместе с
+    ?pagination=cursor отклоняется с ответом 400.
+    """
+
+    search_param = 'q'
+
+    def filter_queryset(self, request, queryset, view):
+        terms = WORD_PATTERN.findall(
+            request.query_params.get(self.search_param, ''))
+        if not terms:
+            return queryset
+        pagination = PageNumberOrCursorPagination
+        if (
+            request.query_params.get(pagination.mode_query_param)
+            == pagination.cursor_mode
+        ):
+            raise ValidationError({
+                self.search_param: [
+                    'Поиск не поддерживает курсорную пагинацию.']
+            })
+        return search_titles(queryset, terms)
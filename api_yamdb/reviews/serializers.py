@@ -1,11 +1,81 @@
+from collections import OrderedDict
+
+from api.timing import TimedSerializerMixin, timed
 from django.contrib.auth import get_user_model
 from rest_framework import serializers
+from rest_framework.relations import MANY_RELATION_KWARGS
 from reviews.models import Category, Comment, Genre, Review, Title
+from reviews.registry import category_registry, genre_registry
 
 User = get_user_model()
 
 
-class GenreSerializer(serializers.ModelSerializer):
+class RegistryManyRelatedField(serializers.ManyRelatedField):
+    """Список связей по слагу: все слаги проверяются одним запросом."""
+
+    def to_internal_value(self, data):
+        objects = super().to_internal_value(data)
+        self.child_relation.check_exist(objects)
+        return objects
+
+
+class RegistrySlugRelatedField(serializers.SlugRelatedField):
+    """Поле связи по слагу, работающее через кэш справочника.
+
+    Принимает слаг, а отдаёт готовое представление объекта из
+    справочника. При чтении база не используется; при записи одним
+    запросом проверяется, что объекты из снимка ещё не удалены.
+    """
+
+    def __init__(self, registry, **kwargs):
+        self.registry = registry
+        kwargs.setdefault('queryset', registry.model.objects.all())
+        super().__init__(slug_field='slug', **kwargs)
+
+    @classmethod
+    def many_init(cls, *args, **kwargs):
+        list_kwargs = {
+            key: value for key, value in kwargs.items()
+            if key in MANY_RELATION_KWARGS
+        }
+        list_kwargs['child_relation'] = cls(*args, **kwargs)
+        return RegistryManyRelatedField(**list_kwargs)
+
+    def use_pk_only_optimization(self):
+        return True
+
+    def to_internal_value(self, data):
+        if not isinstance(data, str):
+            self.fail('invalid')
+        obj = self.registry.get(data)
+        if obj is None:
+            self.fail('does_not_exist', slug_name=self.slug_field,
+                      value=data)
+        if not isinstance(self.parent, serializers.ManyRelatedField):
+            self.check_exist([obj])
+        return obj
+
+    def check_exist(self, objects):
+        """Отклоняет объекты, удалённые после загрузки снимка.
+
+        Иначе запись падала бы на внешнем ключе при фиксации транзакции.
+        """
+        pks = {obj.pk for obj in objects}
+        if not pks:
+            return
+        existing = set(self.get_queryset().filter(
+            pk__in=pks).values_list('pk', flat=True))
+        for obj in objects:
+            if obj.pk not in existing:
+                self.registry.snapshot(refresh=True)
+                self.fail('does_not_exist', slug_name=self.slug_field,
+                          value=obj.slug)
+
+    def to_representation(self, value):
+        return self.registry.representation(value.pk)
+
+
+class GenreSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     """Сериализатор для жанров."""
 
     class Meta:
@@ -13,7 +83,7 @@ class GenreSerializer(serializers.ModelSerializer):
         fields = ("name", "slug")
 
 
-class CategorySerializer(serializers.ModelSerializer):
+class CategorySerializer(TimedSerializerMixin, serializers.ModelSerializer):
     """Сериализатор для категорий."""
 
     class Meta:
@@ -24,15 +94,13 @@ class CategorySerializer(serializers.ModelSerializer):
 class TitleSerializer(serializers.ModelSerializer):
     """Сериализатор для произведений."""
 
-    genre = serializers.SlugRelatedField(
-        queryset=Genre.objects.all(),
-        slug_field='slug',
+    genre = RegistrySlugRelatedField(
+        registry=genre_registry,
         many=True,
         required=False
     )
-    category = serializers.SlugRelatedField(
-        queryset=Category.objects.all(),
-        slug_field='slug',
+    category = RegistrySlugRelatedField(
+        registry=category_registry,
         required=False
     )
     rating = serializers.IntegerField(
@@ -42,22 +110,38 @@ class TitleSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Title
-        fields = "__all__"
+        fields = (
+            'id', 'name', 'year', 'rating', 'description', 'genre', 'category'
+        )
 
+    @timed('serialize')
     def to_representation(self, instance):
-        """Преобразует объект в представление для вывода."""
-        representation = super().to_representation(instance)
-
-        if 'category' in representation:
-            category_serializer = CategorySerializer(instance.category)
-            representation['category'] = category_serializer.data
-        if 'genre' in representation:
-            genre_serializer = GenreSerializer(instance.genre.all(), many=True)
-            representation['genre'] = genre_serializer.data
-        return representation
-
-
-class ReviewSerializer(serializers.ModelSerializer):
+        """Собирает представление напрямую, минуя обход полей DRF.
+
+        Результат совпадает с ModelSerializer.to_representation, но жанры
+        и категория берутся готовыми из справочников, а для каждого
+        произведения не создаются вложенные сериализаторы и поля.
+        """
+        rating = instance.rating
+        category_id = instance.category_id
+        return OrderedDict((
+            ('id', instance.id),
+            ('name', instance.name),
+            ('year', instance.year),
+            ('rating', None if rating is None else int(rating)),
+            ('description', instance.description),
+            ('genre', [
+                genre_registry.representation(genre.pk)
+                for genre in instance.genre.all()
+            ]),
+            ('category', (
+                None if category_id is None
+                else category_registry.representation(category_id)
+            )),
+        ))
+
+
+class ReviewSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     """Сериализатор для отзывов."""
 
     author = serializers.StringRelatedField(
@@ -78,19 +162,8 @@ class ReviewSerializer(serializers.ModelSerializer):
             )
         return value
 
-    def validate(self, data):
-        """Запрещает повторные отзывы от одного пользователя."""
-        user = self.context['request'].user
-        title = self.context.get('view').kwargs.get('title_id')
-        if (Review.objects.filter(title=title, author=user).exists()
-                and self.context.get('request').method == 'POST'):
-            raise serializers.ValidationError(
-                'Вы уже оставили отзыв на это произведение!'
-            )
-        return data
-
 
-class CommentSerializer(serializers.ModelSerializer):
+class CommentSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     """Сериализатор для комментариев к отзывам."""
 
     author = serializers.StringRelatedField(read_only=True)
@@ -0,0 +1,47 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_migrate, post_save
+from django.dispatch import receiver
+from reviews.models import Category, Genre, Review
+from reviews.ratings import update_rating
+from reviews.registry import (category_registry, genre_registry,
+                              invalidate_registries)
+
+
+@receiver(post_save, sender=Review)
+def review_saved(sender, instance, created, raw=False, **kwargs):
+    """Учитывает новую или изменённую оценку в рейтинге произведения."""
+    if raw:
+        return
+    if created:
+        update_rating(instance.title_id, instance.score, 1)
+    else:
+        previous = getattr(instance, '_loaded_score', instance.score)
+        if previous is not None and previous != instance.score:
+            update_rating(instance.title_id, instance.score - previous, 0)
+    instance._loaded_score = instance.score
+
+
+@receiver(post_delete, sender=Review)
+def review_deleted(sender, instance, **kwargs):
+    """Исключает оценку удалённого отзыва из рейтинга произведения."""
+    update_rating(instance.title_id, -instance.score, -1)
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def category_changed(sender, **kwargs):
+    """Сбрасывает справочник категорий после фиксации транзакции."""
+    transaction.on_commit(category_registry.invalidate)
+
+
+@receiver(post_save, sender=Genre)
+@receiver(post_delete, sender=Genre)
+def genre_changed(sender, **kwargs):
+    """Сбрасывает справочник жанров после фиксации транзакции."""
+    transaction.on_commit(genre_registry.invalidate)
+
+
+@receiver(post_migrate)
+def database_flushed(sender, **kwargs):
+    """Сбрасывает справочники после миграций и очистки базы."""
+    invalidate_registries()
@@ -1,11 +1,15 @@
 from api.permissions import AdminUserOrReadOnly, IsAuthorModeratorOrReadOnly
-from django.db.models import Avg
+from api.replicas import ReplicaReadViewMixin
+from api.timing import ServerTimingViewMixin
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import filters, viewsets
 from rest_framework.pagination import PageNumberPagination
 from reviews.base import BaseCategoryGenreViewSet, NestedViewSet
 from reviews.filters import TitleFilter
 from reviews.models import Category, Genre, Review, Title
+from reviews.pagination import PageNumberOrCursorPagination
+from reviews.registry import category_registry, genre_registry
+from reviews.search import TitleFullTextSearchFilter
 from reviews.serializers import (CategorySerializer, CommentSerializer,
                                  GenreSerializer, ReviewSerializer,
                                  TitleSerializer)
@@ -16,6 +20,7 @@ class CategoryViewSet(BaseCategoryGenreViewSet):
 
     queryset = Category.objects.all()
     serializer_class = CategorySerializer
+    registry = category_registry
 
 
 class GenreViewSet(BaseCategoryGenreViewSet):
@@ -23,23 +28,27 @@ class GenreViewSet(BaseCategoryGenreViewSet):
 
     queryset = Genre.objects.all().order_by('id')
     serializer_class = GenreSerializer
+    registry = genre_registry
+    registry_ordering = ('id',)
     pagination_class = PageNumberPagination
 
 
-class TitleViewSet(viewsets.ModelViewSet):
+class TitleViewSet(ReplicaReadViewMixin, ServerTimingViewMixin,
+                   viewsets.ModelViewSet):
     """Вьюсет для произведений."""
     queryset = (
         Title.objects
-        .select_related('category')
         .prefetch_related('genre')
-        .annotate(rating=Avg('reviews__score'))
         .order_by('name')
     )
     serializer_class = TitleSerializer
     permission_classes = (AdminUserOrReadOnly,)
     http_method_names = ['get', 'post', 'delete', 'patch']
-    pagination_class = PageNumberPagination
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter]
+    pagination_class = PageNumberOrCursorPagination
+    cursor_ordering = ('name', 'id')
+    filter_backends = [
+        DjangoFilterBackend, filters.SearchFilter, TitleFullTextSearchFilter
+    ]
     filterset_class = TitleFilter
     search_fields = ['name']
 
@@ -49,9 +58,13 @@ class ReviewViewSet(NestedViewSet):
     serializer_class = ReviewSerializer
     permission_classes = (IsAuthorModeratorOrReadOnly,)
     http_method_names = ['get', 'post', 'delete', 'patch']
+    pagination_class = PageNumberOrCursorPagination
+    cursor_ordering = ('-pub_date', '-id')
     parent_model = Title
     parent_lookup = 'title'
     queryset_related_name = 'reviews'
+    select_related_fields = ('author',)
+    integrity_error_message = 'Вы уже оставили отзыв на это произведение!'
 
 
 class CommentViewSet(NestedViewSet):
@@ -59,6 +72,9 @@ class CommentViewSet(NestedViewSet):
     serializer_class = CommentSerializer
     permission_classes = (IsAuthorModeratorOrReadOnly,)
     http_method_names = ['get', 'post', 'patch', 'delete']
+    pagination_class = PageNumberOrCursorPagination
+    cursor_ordering = ('-pub_date', '-id')
     parent_model = Review
     parent_lookup = 'review'
     queryset_related_name = 'comments'
+    select_related_fields = ('author',)
@@ -1,7 +1,7 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin
 
-from .models import MyUser
+from .models import MyUser, OutgoingEmail
 
 UserAdmin.fieldsets += (
     ('Extra Fields', {'fields': ('bio',)}),
@@ -9,3 +9,15 @@ UserAdmin.fieldsets += (
 
 
 admin.site.register(MyUser, UserAdmin)
+
+
+@admin.register(OutgoingEmail)
+class OutgoingEmailAdmin(admin.ModelAdmin):
+    list_display = ('recipient', 'subject', 'created_at', 'attempts',
+                    'sent_at', 'dead_at')
+    list_filter = ('sent_at', 'dead_at')
+    search_fields = ('recipient',)
+    # В тексте письма код подтверждения, он не должен быть виден в админке.
+    exclude = ('body',)
+    readonly_fields = ('subject', 'recipient', 'created_at', 'send_after',
+                       'attempts', 'sent_at', 'last_error', 'dead_at')
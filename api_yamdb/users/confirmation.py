@@ -0,0 +1,59 @@
+from datetime import timedelta
+
+from django.db.models import F, Q
+from django.utils import timezone
+from django.utils.crypto import salted_hmac
+
+from . import constants
+from .models import ConfirmationCode
+
+KEY_SALT = 'users.ConfirmationCode'
+
+
+def hash_code(code):
+    """Возвращает HMAC-SHA256 кода подтверждения."""
+    return salted_hmac(KEY_SALT, str(code), algorithm='sha256').hexdigest()
+
+
+def store_code(user_id, code, created=False):
+    """Сохраняет хэш нового кода, не трогая строку пользователя.
+
+    Для нового пользователя выполняется один INSERT, для существующего —
+    один UPDATE, а INSERT только если кода ещё не было.
+    """
+    values = {
+        'code_hash': hash_code(code),
+        'expires_at': timezone.now() + timedelta(
+            seconds=constants.CONFIRMATION_CODE_TTL),
+        'attempts': 0,
+    }
+    if created or not ConfirmationCode.objects.filter(
+            user_id=user_id).update(**values):
+        ConfirmationCode.objects.create(user_id=user_id, **values)
+
+
+def check_code(user_id, code):
+    """Проверяет код и при успехе гасит его.
+
+    Код гасится одним условным DELETE, поэтому из параллельных запросов
+    с верным кодом его примет только один. Просроченный код и код с
+    исчерпанными попытками не принимаются; неверная попытка
+    увеличивает счётчик одним UPDATE под тем же условием.
+    """
+    live = ConfirmationCode.objects.filter(
+        user_id=user_id,
+        expires_at__gt=timezone.now(),
+        attempts__lt=constants.CONFIRMATION_CODE_MAX_ATTEMPTS
+    )
+    if live.filter(code_hash=hash_code(code)).delete()[0]:
+        return True
+    live.update(attempts=F('attempts') + 1)
+    return False
+
+
+def purge_expired_codes():
+    """Удаляет просроченные и исчерпанные коды одним запросом."""
+    return ConfirmationCode.objects.filter(
+        Q(expires_at__lte=timezone.now())
+        | Q(attempts__gte=constants.CONFIRMATION_CODE_MAX_ATTEMPTS)
+    ).delete()[0]
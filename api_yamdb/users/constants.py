@@ -9,3 +9,19 @@ USER_ROLE_CHOISES = [
     ('moderator', 'Модератор'),
     ('admin', 'Админ')
 ]
+
+MAX_LENGTH_SUBJECT = 255
+
+OUTBOX_BATCH_SIZE = 100
+
+OUTBOX_MAX_ATTEMPTS = 5
+
+OUTBOX_RETRY_DELAY = 30
+
+OUTBOX_CLAIM_TIMEOUT = 300
+
+MAX_LENGTH_CODE_HASH = 64
+
+CONFIRMATION_CODE_TTL = 60 * 60
+
+CONFIRMATION_CODE_MAX_ATTEMPTS = 5
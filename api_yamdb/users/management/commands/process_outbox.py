@@ -0,0 +1,40 @@
+import time
+
+from django.core.management.base import BaseCommand
+from users import constants
+from users.outbox import deliver_pending
+
+
+class Command(BaseCommand):
+    """Команда для отправки писем из очереди."""
+
+    help = 'Deliver queued emails in batches over one mail connection'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=constants.OUTBOX_BATCH_SIZE,
+            help='Number of emails sent per mail connection.'
+        )
+        parser.add_argument(
+            '--loop', action='store_true',
+            help='Keep polling the queue instead of exiting when empty.'
+        )
+        parser.add_argument(
+            '--interval', type=float, default=1.0,
+            help='Seconds to wait between polls in --loop mode.'
+        )
+
+    def handle(self, *args, **options):
+        """Отправляет письма, пока очередь не опустеет."""
+        total_sent = total_failed = 0
+        while True:
+            sent, failed = deliver_pending(batch_size=options['batch_size'])
+            total_sent += sent
+            total_failed += failed
+            if sent or failed:
+                continue
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Sent {total_sent} emails, {total_failed} failed.'))
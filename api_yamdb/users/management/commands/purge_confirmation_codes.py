@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+from users.confirmation import purge_expired_codes
+from users.outbox import purge_finished_emails
+
+
+class Command(BaseCommand):
+    """Команда для удаления просроченных кодов и отправленных писем."""
+
+    help = (
+        'Delete expired or exhausted confirmation codes and sent or '
+        'dropped emails'
+    )
+
+    def handle(self, *args, **kwargs):
+        """Удаляет коды и письма одним запросом на таблицу."""
+        codes = purge_expired_codes()
+        emails = purge_finished_emails()
+        self.stdout.write(self.style.SUCCESS(
+            f'Deleted {codes} confirmation codes and {emails} emails.'))
@@ -0,0 +1,54 @@
+# Generated by Django 3.2 on 2026-10-18 02:45
+
+from datetime import timedelta
+
+from django.db import migrations, models
+import django.db.models.deletion
+from django.utils import timezone
+from django.utils.crypto import salted_hmac
+
+
+def move_codes(apps, schema_editor):
+    MyUser = apps.get_model('users', 'MyUser')
+    ConfirmationCode = apps.get_model('users', 'ConfirmationCode')
+    expires_at = timezone.now() + timedelta(hours=1)
+    ConfirmationCode.objects.bulk_create(
+        ConfirmationCode(
+            user_id=user_id,
+            code_hash=salted_hmac(
+                'users.ConfirmationCode', code, algorithm='sha256'
+            ).hexdigest(),
+            expires_at=expires_at
+        )
+        for user_id, code in MyUser.objects.exclude(
+            confirmation_code__isnull=True
+        ).exclude(confirmation_code='').values_list('id', 'confirmation_code')
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0005_outgoingemail'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ConfirmationCode',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='confirmation_code', serialize=False, to='users.myuser', verbose_name='Пользователь')),
+                ('code_hash', models.CharField(max_length=64, verbose_name='Хэш кода')),
+                ('expires_at', models.DateTimeField(db_index=True, verbose_name='Действует до')),
+                ('attempts', models.PositiveSmallIntegerField(default=0, verbose_name='Попытки ввода')),
+            ],
+            options={
+                'verbose_name': 'Код подтверждения',
+                'verbose_name_plural': 'Коды подтверждения',
+            },
+        ),
+        migrations.RunPython(move_codes, migrations.RunPython.noop),
+        migrations.RemoveField(
+            model_name='myuser',
+            name='confirmation_code',
+        ),
+    ]
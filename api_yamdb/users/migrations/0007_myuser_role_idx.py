@@ -0,0 +1,17 @@
+# Generated by Django 3.2 on 2026-10-18 03:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0006_confirmationcode'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='myuser',
+            index=models.Index(fields=['role'], name='user_role_idx'),
+        ),
+    ]
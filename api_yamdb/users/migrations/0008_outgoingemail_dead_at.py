@@ -0,0 +1,18 @@
+# Generated by Django 3.2 on 2026-10-18 03:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0007_myuser_role_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='outgoingemail',
+            name='dead_at',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='Доставка прекращена'),
+        ),
+    ]
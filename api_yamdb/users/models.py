@@ -1,6 +1,7 @@
 from django.contrib.auth.models import AbstractUser
 from django.core.validators import RegexValidator
 from django.db import models
+from django.utils import timezone
 
 from . import constants
 from .enums import UserRole
@@ -47,12 +48,13 @@ class MyUser(AbstractUser):
         default=UserRole.user.name,
     )
 
-    confirmation_code = models.SlugField(null=True, blank=True)
-
     class Meta:
         verbose_name = 'Пользователь'
         verbose_name_plural = 'Пользователи'
         ordering = ('id',)
+        indexes = (
+            models.Index(fields=('role',), name='user_role_idx'),
+        )
 
     def __str__(self):
         """Возвращает строковое представление пользователя (username)."""
@@ -69,3 +71,57 @@ class MyUser(AbstractUser):
     @property
     def is_user(self):
         return self.role == UserRole.user.name
+
+
+class ConfirmationCode(models.Model):
+    """Хэш кода подтверждения с ограниченным сроком действия."""
+
+    user = models.OneToOneField(
+        MyUser,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='confirmation_code',
+        verbose_name='Пользователь'
+    )
+    code_hash = models.CharField(
+        'Хэш кода', max_length=constants.MAX_LENGTH_CODE_HASH)
+    expires_at = models.DateTimeField('Действует до', db_index=True)
+    attempts = models.PositiveSmallIntegerField('Попытки ввода', default=0)
+
+    class Meta:
+        verbose_name = 'Код подтверждения'
+        verbose_name_plural = 'Коды подтверждения'
+
+    def __str__(self):
+        return f'Код подтверждения для {self.user_id}'
+
+
+class OutgoingEmail(models.Model):
+    """Письмо в очереди на отправку."""
+
+    subject = models.CharField(
+        'Тема', max_length=constants.MAX_LENGTH_SUBJECT)
+    body = models.TextField('Текст')
+    recipient = models.EmailField(
+        'Получатель', max_length=constants.MAX_LENGTH_EMAIL)
+    created_at = models.DateTimeField('Создано', auto_now_add=True)
+    send_after = models.DateTimeField('Отправить после', default=timezone.now)
+    attempts = models.PositiveSmallIntegerField('Попытки', default=0)
+    sent_at = models.DateTimeField('Отправлено', null=True, blank=True)
+    last_error = models.TextField('Последняя ошибка', blank=True)
+    dead_at = models.DateTimeField(
+        'Доставка прекращена', null=True, blank=True)
+
+    class Meta:
+        verbose_name = 'Исходящее письмо'
+        verbose_name_plural = 'Исходящие письма'
+        ordering = ('send_after',)
+        indexes = (
+            models.Index(
+                fields=('sent_at', 'send_after'),
+                name='outgoing_email_pending_idx'
+            ),
+        )
+
+    def __str__(self):
+        return f'{self.subject} -> {self.recipient}'
@@ -0,0 +1,177 @@
+import logging
+import threading
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import close_old_connections, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from . import constants
+from .models import OutgoingEmail
+
+logger = logging.getLogger(__name__)
+
+
+def enqueue_email(subject, body, recipient):
+    """Ставит письмо в очередь и планирует доставку после коммита.
+
+    Режим доставки задаёт настройка EMAIL_OUTBOX_DELIVERY:
+    'background' — фоновым потоком процесса, 'worker' — только командой
+    process_outbox, 'inline' — сразу после фиксации транзакции в том же
+    потоке (для тестов).
+    """
+    email = OutgoingEmail.objects.create(
+        subject=subject, body=body, recipient=recipient)
+    mode = settings.EMAIL_OUTBOX_DELIVERY
+    if mode == 'inline':
+        transaction.on_commit(lambda: deliver_pending(ids=[email.pk]))
+    elif mode == 'background':
+        transaction.on_commit(background_delivery.wake)
+    return email
+
+
+class BackgroundDelivery:
+    """Фоновый поток процесса, разбирающий очередь писем.
+
+    Поток запускается при первом письме и спит, пока его не разбудят.
+    Проснувшись, отправляет очередь пачками через одно соединение, а
+    затем ждёт момента следующей повторной попытки или нового письма.
+    """
+
+    def __init__(self):
+        self._wakeup = threading.Event()
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def wake(self):
+        """Запускает поток, если нужно, и будит его."""
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name='email-outbox', daemon=True)
+                self._thread.start()
+        self._wakeup.set()
+
+    def _run(self):
+        timeout = None
+        while True:
+            self._wakeup.wait(timeout)
+            self._wakeup.clear()
+            try:
+                while any(deliver_pending()):
+                    pass
+                timeout = next_attempt_delay()
+            except Exception:
+                logger.exception('Email outbox delivery failed')
+                timeout = constants.OUTBOX_RETRY_DELAY
+            finally:
+                close_old_connections()
+
+
+background_delivery = BackgroundDelivery()
+
+
+def next_attempt_delay():
+    """Секунды до ближайшей попытки отправки или None, если ждать нечего."""
+    send_after = OutgoingEmail.objects.filter(
+        sent_at__isnull=True, dead_at__isnull=True
+    ).order_by('send_after').values_list('send_after', flat=True).first()
+    if send_after is None:
+        return None
+    return max((send_after - timezone.now()).total_seconds(), 0)
+
+
+def retry_delay(attempts):
+    """Экспоненциальная задержка перед следующей попыткой."""
+    return timedelta(seconds=constants.OUTBOX_RETRY_DELAY * 2 ** attempts)
+
+
+def claim_pending(ids=None, batch_size=constants.OUTBOX_BATCH_SIZE):
+    """Забирает пачку готовых к отправке писем.
+
+    Забранные письма откладываются на OUTBOX_CLAIM_TIMEOUT секунд, поэтому
+    параллельные обработчики не отправят одно письмо дважды.
+    """
+    now = timezone.now()
+    pending = OutgoingEmail.objects.filter(
+        sent_at__isnull=True,
+        dead_at__isnull=True,
+        send_after__lte=now
+    )
+    if ids is not None:
+        pending = pending.filter(pk__in=ids)
+    candidates = list(pending.values_list('pk', flat=True)[:batch_size])
+    if not candidates:
+        return []
+    claimed_until = now + timedelta(seconds=constants.OUTBOX_CLAIM_TIMEOUT)
+    pending.filter(pk__in=candidates).update(send_after=claimed_until)
+    return list(OutgoingEmail.objects.filter(
+        pk__in=candidates, send_after=claimed_until))
+
+
+def deliver_pending(ids=None, batch_size=constants.OUTBOX_BATCH_SIZE):
+    """Отправляет пачку писем через одно соединение с почтовым сервером.
+
+    Возвращает пару (отправлено, с ошибкой). Неудачные письма получают
+    новую попытку с экспоненциальной задержкой, а после
+    OUTBOX_MAX_ATTEMPTS попыток помечаются недоставленными. У
+    отправленных и недоставленных писем текст стирается: в нём код
+    подтверждения, который в базе хранится только в виде хеша.
+    """
+    emails = claim_pending(ids=ids, batch_size=batch_size)
+    if not emails:
+        return 0, 0
+    sent, failed = [], []
+    try:
+        with get_connection() as connection:
+            for email in emails:
+                message = EmailMessage(
+                    email.subject, email.body, settings.DEFAULT_FROM_EMAIL,
+                    [email.recipient], connection=connection
+                )
+                try:
+                    message.send()
+                except Exception as error:
+                    email.last_error = repr(error)
+                    failed.append(email)
+                else:
+                    sent.append(email.pk)
+    except Exception as error:
+        failed_pks = {email.pk for email in failed}
+        for email in emails:
+            if email.pk not in failed_pks and email.pk not in sent:
+                email.last_error = repr(error)
+                failed.append(email)
+    now = timezone.now()
+    OutgoingEmail.objects.filter(pk__in=sent).update(
+        sent_at=now, attempts=F('attempts') + 1, body='')
+    record_failures(failed, now)
+    return len(sent), len(failed)
+
+
+def record_failures(emails, now):
+    """Откладывает неудачные письма или прекращает их доставку."""
+    for email in emails:
+        dead = email.attempts + 1 >= constants.OUTBOX_MAX_ATTEMPTS
+        OutgoingEmail.objects.filter(pk=email.pk).update(
+            attempts=F('attempts') + 1,
+            send_after=now + retry_delay(email.attempts),
+            last_error=email.last_error,
+            dead_at=now if dead else None,
+            body='' if dead else email.body
+        )
+        if dead:
+            logger.error(
+                'Email %s to %s dropped after %s attempts: %s',
+                email.pk, email.recipient, email.attempts + 1,
+                email.last_error
+            )
+
+
+def purge_finished_emails():
+    """Удаляет отправленные и недоставленные письма одним запросом."""
+    return OutgoingEmail.objects.filter(
+        Q(sent_at__isnull=False) | Q(dead_at__isnull=False)
+    ).delete()[0]
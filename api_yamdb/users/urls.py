@@ -2,6 +2,6 @@ from api.views import SignupView, TokenView
 from django.urls import path
 
 urlpatterns = [
-    path('signup/', SignupView.as_view()),
-    path('token/', TokenView.as_view())
+    path('signup/', SignupView.as_view(), name='signup'),
+    path('token/', TokenView.as_view(), name='token')
 ]
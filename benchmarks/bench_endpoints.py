@@ -0,0 +1,229 @@
+"""Бенчмарк основных эндпоинтов API на большой базе SQLite.
+
+Поднимает приложение в процессе, при необходимости заполняет базу
+командой generate_dataset и прогоняет горячие маршруты через тестовый
+клиент Django. Для каждого сценария измеряет p50/p95 задержки, число
+SQL-запросов и объём выделенной памяти на запрос. Результат можно
+сохранить как базовый и сравнивать с ним следующие запуски: при
+регрессии больше порога скрипт завершается с кодом 1.
+
+Запуск из корня репозитория:
+    python benchmarks/bench_endpoints.py --save-baseline
+    python benchmarks/bench_endpoints.py --threshold 0.2
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import namedtuple
+from operator import attrgetter
+
+import django
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCHMARKS_DIR, '..', 'api_yamdb'))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'api_yamdb.settings')
+
+DEFAULT_DATABASE = os.path.join(tempfile.gettempdir(), 'yamdb-bench.sqlite3')
+DEFAULT_BASELINE = os.path.join(BENCHMARKS_DIR, 'baseline.json')
+DATASET = (
+    ('users', 5000),
+    ('titles', 5000),
+    ('reviews', 100000),
+    ('comments', 100000),
+)
+
+Scenario = namedtuple('Scenario', ('name', 'request'))
+
+
+def setup_database(path, sizes, seed):
+    from django.conf import settings
+
+    settings.DATABASES['default']['NAME'] = path
+    # Бенчмарк меряет сам запрос: без лимитов частоты, отладочных
+    # заголовков и отправки писем.
+    settings.DEBUG = False
+    settings.SERVER_TIMING = False
+    settings.EMAIL_OUTBOX_DELIVERY = 'worker'
+    settings.REST_FRAMEWORK = {
+        **settings.REST_FRAMEWORK, 'DEFAULT_THROTTLE_RATES': {}}
+    django.setup()
+    from django.core.management import call_command
+    from reviews.models import Title
+
+    call_command('migrate', verbosity=0)
+    if not Title.objects.exists():
+        print(f'Generating dataset in {path}...')
+        call_command('generate_dataset', seed=seed, **sizes)
+
+
+def build_scenarios():
+    from django.contrib.auth import get_user_model
+    from reviews.models import Review, Title
+    from reviews.registry import category_registry, genre_registry
+    from users.confirmation import store_code
+
+    User = get_user_model()
+    title = Title.objects.order_by('-rating_count', 'id').first()
+    review = Review.objects.filter(title=title).order_by('id').first()
+    genre = min(genre_registry.snapshot().objects, key=attrgetter('pk'))
+    category = min(
+        category_registry.snapshot().objects, key=attrgetter('pk'))
+    user = User.objects.order_by('id').first()
+    signups = iter(range(10 ** 9))
+
+    def get(path):
+        return lambda client: client.get(path)
+
+    def signup(client):
+        number = next(signups)
+        return client.post('/api/v1/auth/signup/', {
+            'username': f'bench{number}_{time.time_ns()}',
+            'email': f'bench{number}_{time.time_ns()}@example.com',
+        })
+
+    def token(client):
+        store_code(user.pk, 'bench')
+        return client.post('/api/v1/auth/token/', {
+            'username': user.username, 'confirmation_code': 'bench'})
+
+    titles = '/api/v1/titles/'
+    reviews = f'{titles}{title.pk}/reviews/'
+    comments = f'{reviews}{review.pk}/comments/'
+    return (
+        Scenario('titles-list', get(titles)),
+        Scenario('titles-list-filtered', get(
+            f'{titles}?genre={genre.slug}&category={category.slug}')),
+        Scenario('titles-list-cursor', get(
+            f'{titles}?pagination=cursor')),
+        Scenario('titles-detail', get(f'{titles}{title.pk}/')),
+        Scenario('reviews-list', get(f'{reviews}?page=2')),
+        Scenario('reviews-list-cursor', get(
+            f'{reviews}?pagination=cursor')),
+        Scenario('comments-list', get(comments)),
+        Scenario('signup', signup),
+        Scenario('token', token),
+    )
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(fraction * len(values)))]
+
+
+def run_scenario(client, scenario, requests, warmup, allocations):
+    for _ in range(warmup):
+        scenario.request(client)
+    latencies = []
+    queries = []
+    for _ in range(requests):
+        started = time.perf_counter()
+        response = scenario.request(client)
+        latencies.append(time.perf_counter() - started)
+        if response.status_code >= 400:
+            raise RuntimeError(
+                f'{scenario.name}: HTTP {response.status_code} '
+                f'{response.content[:200]!r}')
+        queries.append(response.wsgi_request.query_stats.count)
+
+    # Трассировка памяти замедляет код, поэтому идёт отдельным проходом.
+    allocated = []
+    tracemalloc.start()
+    for _ in range(allocations):
+        tracemalloc.reset_peak()
+        before = tracemalloc.get_traced_memory()[0]
+        scenario.request(client)
+        allocated.append(tracemalloc.get_traced_memory()[1] - before)
+    tracemalloc.stop()
+
+    return {
+        'p50_ms': round(percentile(latencies, 0.5) * 1e3, 3),
+        'p95_ms': round(percentile(latencies, 0.95) * 1e3, 3),
+        'queries': max(queries),
+        'alloc_kb': round(percentile(allocated, 0.5) / 1024, 1),
+    }
+
+
+def compare(results, baseline, threshold):
+    """Возвращает список регрессий относительно базового запуска."""
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        if result['queries'] > base['queries']:
+            regressions.append(
+                f'{name}: queries {base["queries"]} -> {result["queries"]}')
+        for metric in ('p50_ms', 'p95_ms', 'alloc_kb'):
+            if result[metric] > base[metric] * (1 + threshold):
+                regressions.append(
+                    f'{name}: {metric} {base[metric]} -> {result[metric]} '
+                    f'(+{result[metric] / base[metric] - 1:.0%})'
+                )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--database', default=DEFAULT_DATABASE)
+    parser.add_argument('--seed', type=int, default=0)
+    for name, default in DATASET:
+        parser.add_argument(f'--{name}', type=int, default=default)
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--warmup', type=int, default=20)
+    parser.add_argument('--allocations', type=int, default=20)
+    parser.add_argument('--only', nargs='*', help='Scenario names to run.')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE)
+    parser.add_argument('--save-baseline', action='store_true')
+    parser.add_argument(
+        '--threshold', type=float, default=0.25,
+        help='Allowed relative slowdown of latency and allocations.')
+    args = parser.parse_args()
+
+    setup_database(
+        args.database, {name: getattr(args, name) for name, _ in DATASET},
+        args.seed)
+    from django.test import Client
+
+    client = Client()
+    results = {}
+    print(f'{"scenario":<22}{"p50 ms":>10}{"p95 ms":>10}'
+          f'{"queries":>9}{"alloc KB":>10}')
+    for scenario in build_scenarios():
+        if args.only and scenario.name not in args.only:
+            continue
+        result = run_scenario(
+            client, scenario, args.requests, args.warmup, args.allocations)
+        results[scenario.name] = result
+        print(f'{scenario.name:<22}{result["p50_ms"]:>10.2f}'
+              f'{result["p95_ms"]:>10.2f}{result["queries"]:>9}'
+              f'{result["alloc_kb"]:>10.1f}')
+
+    if args.save_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as file:
+            json.dump({
+                'python': platform.python_version(),
+                'machine': platform.machine(),
+                'dataset': {name: getattr(args, name) for name, _ in DATASET},
+                'scenarios': results,
+            }, file, indent=2, ensure_ascii=False)
+        print(f'Baseline saved to {args.baseline}')
+        return 0
+    if not os.path.exists(args.baseline):
+        return 0
+    with open(args.baseline, encoding='utf-8') as file:
+        baseline = json.load(file)['scenarios']
+    regressions = compare(results, baseline, args.threshold)
+    for regression in regressions:
+        print(f'REGRESSION {regression}')
+    if not regressions:
+        print(f'No regressions beyond {args.threshold:.0%}.')
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
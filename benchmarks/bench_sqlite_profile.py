@@ -0,0 +1,147 @@
+"""Бенчмарк профиля SQLite при одновременных чтении и записи.
+
+Сравнивает настройки SQLite по умолчанию (журнал отката, новое
+соединение на каждый запрос) с профилем из settings.SQLITE_PRAGMAS и
+CONN_MAX_AGE. Потоки-читатели запрашивают списки произведений и
+отзывов, потоки-писатели одновременно добавляют комментарии. Для
+каждого профиля выводятся число чтений и записей в секунду, p95
+задержки и число ошибок.
+
+Запуск из корня репозитория (база создаётся как в bench_endpoints.py):
+    python benchmarks/bench_sqlite_profile.py --readers 4 --writers 2
+"""
+import argparse
+import threading
+import time
+
+from bench_endpoints import DATASET, DEFAULT_DATABASE, setup_database
+
+PROFILES = (
+    ('default', {'journal_mode': 'DELETE', 'synchronous': 'FULL'}, 0),
+    ('production', None, 60),
+)
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, int(fraction * len(values)))]
+
+
+class Worker(threading.Thread):
+    """Поток, который до остановки повторяет один из запросов."""
+
+    def __init__(self, requests, stop):
+        super().__init__(daemon=True)
+        self.requests = requests
+        self.stop = stop
+        self.latencies = []
+        self.errors = 0
+
+    def run(self):
+        from django.db import connections
+        from django.test import Client
+
+        client = Client(raise_request_exception=False)
+        index = 0
+        while not self.stop.is_set():
+            request = self.requests[index % len(self.requests)]
+            index += 1
+            started = time.perf_counter()
+            try:
+                status = request(client)
+            except Exception:
+                status = 500
+            self.latencies.append(time.perf_counter() - started)
+            if status >= 500:
+                self.errors += 1
+        connections.close_all()
+
+
+def run_profile(pragmas, conn_max_age, readers, writers, duration):
+    from django.conf import settings
+    from django.contrib.auth import get_user_model
+    from django.db import connections
+    from reviews.models import Review, Title
+    from rest_framework_simplejwt.tokens import AccessToken
+
+    connections.close_all()
+    settings.DATABASES['default']['CONN_MAX_AGE'] = conn_max_age
+    if pragmas is not None:
+        settings.SQLITE_PRAGMAS = pragmas
+
+    title = Title.objects.order_by('-rating_count', 'id').first()
+    review = Review.objects.filter(title=title).order_by('id').first()
+    user = get_user_model().objects.order_by('id').first()
+    authorization = f'Bearer {AccessToken.for_user(user)}'
+    reviews_url = f'/api/v1/titles/{title.pk}/reviews/'
+    comments_url = f'{reviews_url}{review.pk}/comments/'
+    connections.close_all()
+
+    read_requests = (
+        lambda client: client.get('/api/v1/titles/').status_code,
+        lambda client: client.get(reviews_url).status_code,
+    )
+    write_requests = (
+        lambda client: client.post(
+            comments_url, {'text': 'Нагрузочный комментарий'},
+            HTTP_AUTHORIZATION=authorization
+        ).status_code,
+    )
+    stop = threading.Event()
+    read_workers = [Worker(read_requests, stop) for _ in range(readers)]
+    write_workers = [Worker(write_requests, stop) for _ in range(writers)]
+    for worker in read_workers + write_workers:
+        worker.start()
+    time.sleep(duration)
+    stop.set()
+    for worker in read_workers + write_workers:
+        worker.join()
+
+    def summary(workers):
+        latencies = [value for worker in workers for value in worker.latencies]
+        return (
+            len(latencies) / duration,
+            percentile(latencies, 0.95) * 1e3,
+            sum(worker.errors for worker in workers),
+        )
+
+    return summary(read_workers), summary(write_workers)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--database', default=DEFAULT_DATABASE)
+    parser.add_argument('--seed', type=int, default=0)
+    for name, default in DATASET:
+        parser.add_argument(f'--{name}', type=int, default=default)
+    parser.add_argument('--readers', type=int, default=4)
+    parser.add_argument('--writers', type=int, default=2)
+    parser.add_argument('--duration', type=float, default=10.0)
+    args = parser.parse_args()
+
+    setup_database(
+        args.database, {name: getattr(args, name) for name, _ in DATASET},
+        args.seed)
+    from django.conf import settings
+
+    production_pragmas = dict(settings.SQLITE_PRAGMAS)
+    print(f'{"profile":<12}{"reads/s":>9}{"read p95":>10}{"errors":>8}'
+          f'{"writes/s":>10}{"write p95":>11}{"errors":>8}')
+    results = {}
+    for name, pragmas, conn_max_age in PROFILES:
+        reads, writes = run_profile(
+            pragmas or production_pragmas, conn_max_age,
+            args.readers, args.writers, args.duration)
+        results[name] = reads, writes
+        print(f'{name:<12}{reads[0]:>9.1f}{reads[1]:>10.2f}{reads[2]:>8}'
+              f'{writes[0]:>10.1f}{writes[1]:>11.2f}{writes[2]:>8}')
+    (base_reads, base_writes), (reads, writes) = (
+        results['default'], results['production'])
+    print(f'production vs default: reads x{reads[0] / base_reads[0]:.2f}, '
+          f'writes x{writes[0] / max(base_writes[0], 1e-9):.2f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,123 @@
+"""Микробенчмарк сериализации страницы произведений.
+
+Сравнивает прежнюю реализацию TitleSerializer.to_representation
+(полный обход полей ModelSerializer и вложенные сериализаторы для
+каждого произведения), общий путь ModelSerializer и быстрый путь.
+
+Запуск из корня репозитория:
+    python benchmarks/bench_title_representation.py --titles 100
+"""
+import argparse
+import os
+import sys
+import timeit
+
+import django
+
+sys.path.insert(
+    0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..',
+                    'api_yamdb'))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'api_yamdb.settings')
+
+
+def setup_database():
+    from django.conf import settings
+
+    settings.DATABASES['default']['NAME'] = ':memory:'
+    django.setup()
+    from django.core.management import call_command
+
+    call_command('migrate', verbosity=0)
+
+
+def create_titles(count):
+    from reviews.models import Category, Genre, Title
+
+    Category.objects.bulk_create(
+        Category(name=f'Категория {i}', slug=f'category-{i}')
+        for i in range(5)
+    )
+    Genre.objects.bulk_create(
+        Genre(name=f'Жанр {i}', slug=f'genre-{i}') for i in range(10)
+    )
+    categories = list(Category.objects.all())
+    genres = list(Genre.objects.all())
+    Title.objects.bulk_create(
+        Title(
+            name=f'Произведение {i}',
+            year=1900 + i % 120,
+            description='Описание',
+            category=categories[i % len(categories)],
+            rating_sum=i % 10 * 3,
+            rating_count=i % 3
+        )
+        for i in range(count)
+    )
+    titles = Title.objects.order_by('id')
+    Through = Title.genre.through
+    Through.objects.bulk_create(
+        Through(title_id=title.id, genre_id=genres[(i + shift) % 10].id)
+        for i, title in enumerate(titles) for shift in range(3)
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--titles', type=int, default=100)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--number', type=int, default=20)
+    args = parser.parse_args()
+
+    setup_database()
+    from rest_framework import serializers
+    from reviews.models import Title
+    from reviews.registry import invalidate_registries
+    from reviews.serializers import (CategorySerializer, GenreSerializer,
+                                     TitleSerializer)
+
+    class LegacyTitleSerializer(TitleSerializer):
+        def to_representation(self, instance):
+            representation = serializers.ModelSerializer.to_representation(
+                self, instance)
+            representation['category'] = CategorySerializer(
+                instance.category).data
+            representation['genre'] = GenreSerializer(
+                instance.genre.all(), many=True).data
+            return representation
+
+    class GenericTitleSerializer(TitleSerializer):
+        def to_representation(self, instance):
+            return serializers.ModelSerializer.to_representation(
+                self, instance)
+
+    create_titles(args.titles)
+    invalidate_registries()
+    page = list(
+        Title.objects.select_related('category').prefetch_related('genre'))
+
+    variants = (
+        ('legacy', LegacyTitleSerializer),
+        ('generic', GenericTitleSerializer),
+        ('fast', TitleSerializer),
+    )
+    outputs = {
+        name: serializer_class(page, many=True).data
+        for name, serializer_class in variants
+    }
+    assert outputs['fast'] == outputs['generic'] == outputs['legacy'], (
+        'Быстрый путь должен давать то же представление.')
+
+    timings = {}
+    for name, serializer_class in variants:
+        best = min(timeit.repeat(
+            lambda: serializer_class(page, many=True).data,
+            repeat=args.repeat, number=args.number
+        )) / args.number
+        timings[name] = best
+        print(f'{name:>8}: {best * 1e3:8.3f} ms per {args.titles} titles')
+    for name in ('legacy', 'generic'):
+        print(f'fast vs {name}: x{timings[name] / timings["fast"]:.1f}')
+
+
+if __name__ == '__main__':
+    main()
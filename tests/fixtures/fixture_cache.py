@@ -0,0 +1,12 @@
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def shared_cache(settings, tmp_path_factory):
+    """Отдельный каталог общего кэша для каждого теста."""
+    settings.CACHES = {
+        'default': {
+            **settings.CACHES['default'],
+            'LOCATION': str(tmp_path_factory.mktemp('cache')),
+        }
+    }
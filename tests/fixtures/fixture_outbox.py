@@ -0,0 +1,7 @@
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def inline_email_delivery(settings):
+    """В тестах письма отправляются сразу после коммита запроса."""
+    settings.EMAIL_OUTBOX_DELIVERY = 'inline'
@@ -0,0 +1,18 @@
+import pytest
+from api.middleware import budget_listeners
+
+
+@pytest.fixture(autouse=True)
+def query_budget():
+    """Проваливает тест, если запрос к API превысил бюджет SQL-запросов."""
+    def fail(request, route, budget, stats):
+        repeated = '\n'.join(
+            f'{count}x {sql}' for sql, count in stats.repeated())
+        pytest.fail(
+            f'{request.method} {request.path} ({route}): '
+            f'{stats.count} SQL-запросов при бюджете {budget}.\n{repeated}'
+        )
+
+    budget_listeners.append(fail)
+    yield
+    budget_listeners.remove(fail)
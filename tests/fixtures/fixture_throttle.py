@@ -0,0 +1,9 @@
+import pytest
+from api.throttling import reset_store
+
+
+@pytest.fixture(autouse=True)
+def throttle_store():
+    reset_store()
+    yield
+    reset_store()
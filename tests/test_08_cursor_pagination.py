@@ -0,0 +1,142 @@
+import json
+from base64 import b64encode
+from http import HTTPStatus
+from urllib.parse import urlencode
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from reviews.models import Title
+from reviews.pagination import KeysetPagination
+
+from tests.utils import create_reviews, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test08CursorPagination:
+
+    TITLES_URL = '/api/v1/titles/'
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+
+    def collect_pages(self, client, url):
+        results = []
+        while url:
+            response = client.get(url)
+            assert response.status_code == HTTPStatus.OK, (
+                f'Проверьте, что GET-запрос к `{url}` в курсорном режиме '
+                'возвращает ответ со статусом 200.'
+            )
+            data = response.json()
+            assert 'count' not in data, (
+                'Проверьте, что в курсорном режиме пагинации ответ не '
+                'содержит ключ `count`.'
+            )
+            results.extend(data['results'])
+            url = data['next']
+        return results
+
+    def test_01_titles_cursor(self, client, admin_client, monkeypatch):
+        monkeypatch.setattr(KeysetPagination, 'page_size', 1)
+        titles, _, _ = create_titles(admin_client)
+
+        results = self.collect_pages(
+            client, f'{self.TITLES_URL}?pagination=cursor'
+        )
+        assert [title['id'] for title in results] == [
+            title['id'] for title in sorted(titles, key=lambda t: t['name'])
+        ], (
+            f'Проверьте, что курсорная пагинация `{self.TITLES_URL}` '
+            'возвращает все произведения по страницам в порядке названия '
+            'без пропусков и повторов.'
+        )
+
+    def test_02_reviews_cursor(self, client, admin_client, admin, user,
+                               user_client, moderator, moderator_client,
+                               monkeypatch):
+        monkeypatch.setattr(KeysetPagination, 'page_size', 1)
+        author_map = {
+            admin: admin_client,
+            user: user_client,
+            moderator: moderator_client
+        }
+        reviews, titles = create_reviews(admin_client, author_map)
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=titles[0]['id'])
+
+        results = self.collect_pages(
+            client, f'{url}?pagination=cursor'
+        )
+        assert sorted(review['id'] for review in results) == sorted(
+            review['id'] for review in reviews
+        ), (
+            f'Проверьте, что курсорная пагинация `{self.REVIEWS_URL_TEMPLATE}` '
+            'возвращает все отзывы без пропусков и повторов.'
+        )
+
+    def test_03_titles_cursor_with_equal_names(self, client, monkeypatch):
+        monkeypatch.setattr(KeysetPagination, 'page_size', 2)
+        expected = [
+            Title.objects.create(name=name, year=2000).pk
+            for name in ('Б', 'А', 'Б', 'Б', 'А', 'Б', 'В')
+        ]
+        expected.sort(key=lambda pk: (Title.objects.get(pk=pk).name, pk))
+        url = f'{self.TITLES_URL}?pagination=cursor'
+        with CaptureQueriesContext(connection) as context:
+            results = self.collect_pages(client, url)
+        assert [title['id'] for title in results] == expected, (
+            'Проверьте, что курсорная пагинация не теряет и не повторяет '
+            'произведения с одинаковыми названиями на границе страниц.'
+        )
+        assert not [
+            query for query in context.captured_queries
+            if 'OFFSET' in query['sql'] and 'reviews_title' in query['sql']
+        ], 'Проверьте, что курсор не использует OFFSET для равных названий.'
+
+    def test_04_cursor_previous_pages(self, client, monkeypatch):
+        monkeypatch.setattr(KeysetPagination, 'page_size', 2)
+        for name in ('А', 'Б', 'Б', 'Б', 'В'):
+            Title.objects.create(name=name, year=2000)
+        url = f'{self.TITLES_URL}?pagination=cursor'
+        pages = []
+        while url:
+            data = client.get(url).json()
+            pages.append([title['id'] for title in data['results']])
+            url = data['next']
+        url = client.get(
+            f'{self.TITLES_URL}?pagination=cursor').json()['next']
+        url = client.get(url).json()['next']
+        back = []
+        while url:
+            data = client.get(url).json()
+            back.insert(0, [title['id'] for title in data['results']])
+            url = data['previous']
+        assert back == pages, (
+            'Проверьте, что ссылки `previous` курсорной пагинации '
+            'возвращают те же страницы в обратном порядке.'
+        )
+
+    def test_05_search_with_cursor_rejected(self, client):
+        response = client.get(f'{self.TITLES_URL}?q=фильм&pagination=cursor')
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что полнотекстовый поиск вместе с курсорной '
+            'пагинацией возвращает ответ со статусом 400.'
+        )
+
+    def test_06_forged_cursor_rejected(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        urls = (
+            self.TITLES_URL,
+            self.REVIEWS_URL_TEMPLATE.format(title_id=titles[0]['id']),
+        )
+        positions = (
+            ['abc', 'x'], [None, None], [{'a': 1}, 2], ['abc', 10 ** 30])
+        for url in urls:
+            for position in positions:
+                cursor = b64encode(
+                    urlencode({'p': json.dumps(position)}).encode()
+                ).decode()
+                response = client.get(
+                    url, {'pagination': 'cursor', 'cursor': cursor})
+                assert response.status_code == HTTPStatus.NOT_FOUND, (
+                    f'Проверьте, что поддельный курсор {position} на `{url}` '
+                    'отклоняется с ответом 404, а не ошибкой сервера.'
+                )
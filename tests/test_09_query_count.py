@@ -0,0 +1,123 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import (create_comments, create_single_comment,
+                         create_single_review, create_titles)
+
+TRANSACTION_STATEMENTS = ('BEGIN', 'SAVEPOINT', 'RELEASE', 'COMMIT')
+
+
+def count_queries(client, url):
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(url)
+    assert response.status_code == HTTPStatus.OK, (
+        f'Проверьте, что GET-запрос к `{url}` возвращает ответ со статусом '
+        '200.'
+    )
+    return len(context.captured_queries)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test09QueryCount:
+
+    TITLES_URL = '/api/v1/titles/'
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+    COMMENTS_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+    )
+
+    def test_01_reviews_list_queries(self, client, admin_client, user_client,
+                                     moderator_client):
+        titles, _, _ = create_titles(admin_client)
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=titles[0]['id'])
+
+        create_single_review(admin_client, titles[0]['id'], 'text', 5)
+        single_page_queries = count_queries(client, url)
+        create_single_review(user_client, titles[0]['id'], 'text', 5)
+        create_single_review(moderator_client, titles[0]['id'], 'text', 5)
+
+        assert count_queries(client, url) == single_page_queries, (
+            f'Проверьте, что число SQL-запросов к `{self.REVIEWS_URL_TEMPLATE}` '
+            'не зависит от количества отзывов на странице: авторы должны '
+            'загружаться одним запросом вместе с отзывами.'
+        )
+
+    def test_02_comments_list_queries(self, client, admin_client, admin, user,
+                                      user_client, moderator,
+                                      moderator_client):
+        _, reviews, titles = create_comments(
+            admin_client, {admin: admin_client}
+        )
+        url = self.COMMENTS_URL_TEMPLATE.format(
+            title_id=titles[0]['id'], review_id=reviews[0]['id']
+        )
+
+        single_page_queries = count_queries(client, url)
+        for author_client in (user_client, moderator_client):
+            create_single_comment(
+                author_client, titles[0]['id'], reviews[0]['id'], 'text'
+            )
+
+        assert count_queries(client, url) == single_page_queries, (
+            f'Проверьте, что число SQL-запросов к '
+            f'`{self.COMMENTS_URL_TEMPLATE}` не зависит от количества '
+            'комментариев на странице.'
+        )
+
+    def test_03_titles_list_queries(self, client, admin_client):
+        _, categories, genres = create_titles(admin_client)
+        client.get(self.TITLES_URL)
+        two_titles_queries = count_queries(client, self.TITLES_URL)
+        admin_client.post(self.TITLES_URL, data={
+            'name': 'Чужой',
+            'year': 1979,
+            'genre': [genres[0]['slug'], genres[2]['slug']],
+            'category': categories[0]['slug']
+        })
+
+        assert count_queries(client, self.TITLES_URL) == two_titles_queries, (
+            f'Проверьте, что число SQL-запросов к `{self.TITLES_URL}` не '
+            'зависит от количества произведений: категории и жанры не должны '
+            'запрашиваться для каждого произведения отдельно.'
+        )
+        for url in (
+            f'{self.TITLES_URL}?genre={genres[0]["slug"]}',
+            f'{self.TITLES_URL}?category={categories[0]["slug"]}',
+            '/api/v1/categories/',
+            '/api/v1/genres/',
+        ):
+            assert count_queries(client, url) <= two_titles_queries, (
+                f'Проверьте, что GET-запрос к `{url}` использует кэш '
+                'справочников категорий и жанров.'
+            )
+
+    def test_04_signup_queries(self, client, settings):
+        settings.EMAIL_OUTBOX_DELIVERY = 'worker'
+        url = '/api/v1/auth/signup/'
+        for idx in range(3):
+            data = {
+                'username': f'burst_user_{idx}',
+                'email': f'burst_user_{idx}@yamdb.fake'
+            }
+            # Новый пользователь: поиск, пользователь, код, письмо;
+            # повторный запрос: поиск, обновление кода, письмо.
+            for attempt, budget in (('new', 4), ('repeat', 3)):
+                with CaptureQueriesContext(connection) as context:
+                    response = client.post(url, data=data)
+                assert response.status_code == HTTPStatus.OK
+                queries = [
+                    query['sql'] for query in context.captured_queries
+                    if not query['sql'].startswith(TRANSACTION_STATEMENTS)
+                ]
+                assert len(queries) <= budget, (
+                    f'Проверьте, что регистрация через `{url}` ({attempt}) '
+                    'выполняет один поиск пользователя и не перезаписывает '
+                    f'строку пользователя: сейчас запросов {len(queries)}.'
+                )
+                assert not [
+                    query for query in queries
+                    if query.startswith('UPDATE "users_myuser"')
+                ]
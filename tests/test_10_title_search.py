@@ -0,0 +1,126 @@
+from http import HTTPStatus
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from reviews import search
+from reviews.models import Review
+
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test10TitleSearch:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    def review_triggers(self):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'trigger' "
+                "AND tbl_name = 'reviews_review'"
+            )
+            return {name for name, in cursor.fetchall()}
+
+    def search(self, client, query):
+        response = client.get(self.TITLES_URL, {'q': query})
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что GET-запрос к `{self.TITLES_URL}?q=` '
+            'возвращает ответ со статусом 200.'
+        )
+        return [title['name'] for title in response.json()['results']]
+
+    def check_search(self, client, admin_client, user_client):
+        titles, _, _ = create_titles(admin_client)
+        create_single_review(
+            user_client, titles[1]['id'], 'Лучший боевик про небоскрёб', 9
+        )
+
+        assert self.search(client, 'Термин') == [titles[0]['name']], (
+            'Проверьте, что поиск по параметру `q` находит произведение '
+            'по началу слова из названия.'
+        )
+        assert self.search(client, 'небоскрёб') == [titles[1]['name']], (
+            'Проверьте, что поиск по параметру `q` учитывает тексты отзывов.'
+        )
+        assert self.search(client, 'back') == [titles[0]['name']], (
+            'Проверьте, что поиск по параметру `q` учитывает описание.'
+        )
+        assert self.search(client, 'несуществующее') == [], (
+            'Проверьте, что поиск по параметру `q` без совпадений '
+            'возвращает пустой список.'
+        )
+
+    def test_01_fts_search(self, client, admin_client, user_client):
+        self.check_search(client, admin_client, user_client)
+
+    def test_02_like_fallback(self, client, admin_client, user_client,
+                              monkeypatch):
+        monkeypatch.setattr(search, 'fts_enabled', lambda *args: False)
+        self.check_search(client, admin_client, user_client)
+
+    def test_03_review_changes_reindexed(self, client, admin_client,
+                                         user_client):
+        titles, _, _ = create_titles(admin_client)
+        url = f'/api/v1/titles/{titles[1]["id"]}/reviews/'
+        review = create_single_review(
+            user_client, titles[1]['id'], 'Лучший боевик про небоскрёб', 9
+        ).json()
+        response = user_client.patch(
+            f'{url}{review["id"]}/', data={'text': 'Погоня по крышам'})
+        assert response.status_code == HTTPStatus.OK
+        assert self.search(client, 'небоскрёб') == [], (
+            'Проверьте, что после изменения отзыва поиск не находит '
+            'произведение по старому тексту.'
+        )
+        assert self.search(client, 'крышам') == [titles[1]['name']], (
+            'Проверьте, что после изменения отзыва поиск находит '
+            'произведение по новому тексту.'
+        )
+        response = user_client.delete(f'{url}{review["id"]}/')
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        assert self.search(client, 'крышам') == [], (
+            'Проверьте, что удалённый отзыв исключается из поиска.'
+        )
+
+    def test_04_deferred_indexing_rolls_back(self, client, admin_client,
+                                             user):
+        titles, _, _ = create_titles(admin_client)
+        triggers = self.review_triggers()
+        with pytest.raises(RuntimeError):
+            with search.deferred_review_indexing():
+                Review.objects.create(
+                    title_id=titles[1]['id'], author=user,
+                    text='Лучший боевик про небоскрёб', score=9
+                )
+                assert not self.review_triggers()
+                raise RuntimeError
+        assert self.review_triggers() == triggers, (
+            'Проверьте, что при ошибке загрузки триггеры индекса отзывов '
+            'восстанавливаются.'
+        )
+        assert not Review.objects.exists(), (
+            'Проверьте, что отложенная индексация выполняется в одной '
+            'транзакции и откатывается при ошибке.'
+        )
+
+    def test_05_rebuild_search_command(self, client, admin_client,
+                                       user_client):
+        titles, _, _ = create_titles(admin_client)
+        triggers = self.review_triggers()
+        with connection.cursor() as cursor:
+            cursor.execute('DROP TRIGGER reviews_review_fts_ai')
+        create_single_review(
+            user_client, titles[1]['id'], 'Лучший боевик про небоскрёб', 9
+        )
+        assert self.search(client, 'небоскрёб') == []
+        call_command('rebuild_search', stdout=StringIO())
+        assert self.review_triggers() == triggers, (
+            'Проверьте, что команда rebuild_search восстанавливает '
+            'триггеры индекса.'
+        )
+        assert self.search(client, 'небоскрёб') == [titles[1]['name']], (
+            'Проверьте, что команда rebuild_search пересобирает индекс '
+            'отзывов.'
+        )
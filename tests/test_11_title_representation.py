@@ -0,0 +1,27 @@
+import pytest
+from rest_framework import serializers
+from reviews.models import Category, Title
+from reviews.serializers import TitleSerializer
+
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test11TitleRepresentation:
+
+    def test_01_fast_path_matches_model_serializer(self, admin_client,
+                                                   user_client):
+        titles, categories, _ = create_titles(admin_client)
+        create_single_review(user_client, titles[0]['id'], 'text', 7)
+        Category.objects.filter(slug=categories[1]['slug']).delete()
+
+        queryset = Title.objects.prefetch_related('genre')
+        serializer = TitleSerializer()
+        for title in queryset:
+            expected = serializers.ModelSerializer.to_representation(
+                serializer, title
+            )
+            assert serializer.to_representation(title) == expected, (
+                'Проверьте, что быстрое представление произведения '
+                'совпадает с представлением ModelSerializer.'
+            )
@@ -0,0 +1,87 @@
+from http import HTTPStatus
+
+import pytest
+from api.authentication import user_cache_key
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+@pytest.mark.django_db(transaction=True)
+class Test12CachedJWTUser:
+
+    CATEGORY_URL = '/api/v1/categories/'
+    USER_DETAIL_URL_TEMPLATE = '/api/v1/users/{username}/'
+
+    def test_01_user_not_loaded_on_every_request(self, user_client, user):
+        user_client.get(self.CATEGORY_URL)
+        with CaptureQueriesContext(connection) as context:
+            response = user_client.get(self.CATEGORY_URL)
+        assert response.status_code == HTTPStatus.OK
+        users_table = user._meta.db_table
+        assert not [
+            query for query in context.captured_queries
+            if users_table in query['sql']
+        ], (
+            'Проверьте, что JWT-аутентификация берёт пользователя из кэша '
+            'и не обращается к базе данных при каждом запросе.'
+        )
+        assert '"password"' not in str(cache.get(user_cache_key(user.pk))), (
+            'Проверьте, что в кэше хранятся только поля для проверки прав.'
+        )
+
+    def test_02_role_change_invalidates_cache(self, admin_client, user_client,
+                                              user):
+        data = {'name': 'Фильм', 'slug': 'films'}
+        response = user_client.post(self.CATEGORY_URL, data=data)
+        assert response.status_code == HTTPStatus.FORBIDDEN
+
+        response = admin_client.patch(
+            self.USER_DETAIL_URL_TEMPLATE.format(username=user.username),
+            data={'role': 'admin'}
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert cache.get(user_cache_key(user.pk)) is None, (
+            'Проверьте, что изменение роли пользователя сбрасывает его '
+            'снимок в кэше.'
+        )
+
+        response = user_client.post(self.CATEGORY_URL, data=data)
+        assert response.status_code == HTTPStatus.CREATED, (
+            'Проверьте, что изменение роли пользователя действует со '
+            'следующего запроса.'
+        )
+
+    def test_03_deactivation_and_delete_invalidate_cache(
+        self, user_client, user
+    ):
+        user_client.get(self.CATEGORY_URL)
+        user.is_active = False
+        user.save()
+        response = user_client.get(self.CATEGORY_URL)
+        assert response.status_code == HTTPStatus.UNAUTHORIZED, (
+            'Проверьте, что заблокированный пользователь не проходит '
+            'аутентификацию со следующего запроса.'
+        )
+
+        user.is_active = True
+        user.save()
+        user_client.get(self.CATEGORY_URL)
+        user.delete()
+        response = user_client.get(self.CATEGORY_URL)
+        assert response.status_code == HTTPStatus.UNAUTHORIZED, (
+            'Проверьте, что удалённый пользователь не проходит '
+            'аутентификацию со следующего запроса.'
+        )
+
+    def test_04_update_applies_after_timeout(self, admin_client, admin,
+                                             django_user_model, settings):
+        data = {'name': 'Фильм', 'slug': 'films'}
+        settings.JWT_USER_CACHE_TIMEOUT = 0
+        admin_client.get(self.CATEGORY_URL)
+        django_user_model.objects.filter(pk=admin.pk).update(role='user')
+        response = admin_client.post(self.CATEGORY_URL, data=data)
+        assert response.status_code == HTTPStatus.FORBIDDEN, (
+            'Проверьте, что правки через queryset.update() действуют не '
+            'позже чем через JWT_USER_CACHE_TIMEOUT секунд.'
+        )
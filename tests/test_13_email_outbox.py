@@ -0,0 +1,175 @@
+import logging
+import time
+from http import HTTPStatus
+
+import pytest
+from django.core import mail
+from django.core.management import call_command
+from django.utils import timezone
+from users import constants
+from users.models import OutgoingEmail
+
+
+@pytest.mark.django_db(transaction=True)
+class Test13EmailOutbox:
+
+    URL_SIGNUP = '/api/v1/auth/signup/'
+
+    def signup(self, client):
+        valid_data = {
+            'email': 'valid@yamdb.fake',
+            'username': 'valid_username'
+        }
+        response = client.post(self.URL_SIGNUP, data=valid_data)
+        assert response.status_code == HTTPStatus.OK
+        return valid_data
+
+    def wait_for(self, condition, timeout=5.0):
+        deadline = time.monotonic() + timeout
+        while not condition():
+            assert time.monotonic() < deadline, (
+                'Проверьте, что фоновая доставка отправляет письма из '
+                'очереди.'
+            )
+            time.sleep(0.02)
+
+    def test_01_signup_only_enqueues_email(self, client, settings):
+        settings.EMAIL_OUTBOX_DELIVERY = 'worker'
+        outbox_before_count = len(mail.outbox)
+
+        valid_data = self.signup(client)
+
+        assert len(mail.outbox) == outbox_before_count, (
+            'Проверьте, что в режиме `worker` письмо не отправляется во '
+            'время запроса.'
+        )
+        assert OutgoingEmail.objects.filter(
+            recipient=valid_data['email'], sent_at__isnull=True
+        ).exists(), (
+            'Проверьте, что письмо с кодом подтверждения ставится в очередь.'
+        )
+
+        call_command('process_outbox')
+
+        assert len(mail.outbox) == outbox_before_count + 1, (
+            'Проверьте, что команда `process_outbox` отправляет письма из '
+            'очереди.'
+        )
+        assert not OutgoingEmail.objects.filter(
+            sent_at__isnull=True
+        ).exists()
+
+    def test_02_failed_delivery_is_retried_later(self, client, settings,
+                                                 monkeypatch):
+        settings.EMAIL_OUTBOX_DELIVERY = 'worker'
+        self.signup(client)
+
+        def broken_send(self, *args, **kwargs):
+            raise ConnectionError('mail server is down')
+
+        monkeypatch.setattr(mail.EmailMessage, 'send', broken_send)
+        call_command('process_outbox')
+
+        email = OutgoingEmail.objects.get()
+        assert email.sent_at is None
+        assert email.attempts == 1
+        assert 'mail server is down' in email.last_error
+        assert email.send_after > email.created_at, (
+            'Проверьте, что неудачная отправка откладывается на потом.'
+        )
+
+        monkeypatch.undo()
+        call_command('process_outbox')
+        assert OutgoingEmail.objects.get().sent_at is None, (
+            'Проверьте, что повторная попытка выполняется только после '
+            'задержки.'
+        )
+
+    def test_03_background_delivery_retries(self, client, settings,
+                                            monkeypatch):
+        settings.EMAIL_OUTBOX_DELIVERY = 'background'
+        monkeypatch.setattr(constants, 'OUTBOX_RETRY_DELAY', 0.05)
+        outbox_before_count = len(mail.outbox)
+        connections = []
+        send = mail.EmailMessage.send
+
+        def flaky_send(self, *args, **kwargs):
+            connections.append(self.connection)
+            if len(connections) == 1:
+                raise ConnectionError('mail server is down')
+            return send(self, *args, **kwargs)
+
+        monkeypatch.setattr(mail.EmailMessage, 'send', flaky_send)
+        self.signup(client)
+
+        self.wait_for(
+            lambda: OutgoingEmail.objects.filter(
+                sent_at__isnull=False).exists()
+        )
+        email = OutgoingEmail.objects.get()
+        assert email.attempts == 2, (
+            'Проверьте, что фоновая доставка сама повторяет неудачную '
+            'отправку после задержки.'
+        )
+        assert len(mail.outbox) == outbox_before_count + 1
+
+    def test_04_background_batch_uses_one_connection(self, client,
+                                                     settings, monkeypatch):
+        settings.EMAIL_OUTBOX_DELIVERY = 'worker'
+        for index in range(3):
+            client.post(self.URL_SIGNUP, data={
+                'email': f'user{index}@yamdb.fake',
+                'username': f'user{index}'
+            })
+        connections = []
+        send = mail.EmailMessage.send
+
+        def tracked_send(self, *args, **kwargs):
+            connections.append(self.connection)
+            return send(self, *args, **kwargs)
+
+        monkeypatch.setattr(mail.EmailMessage, 'send', tracked_send)
+        settings.EMAIL_OUTBOX_DELIVERY = 'background'
+        self.signup(client)
+        self.wait_for(
+            lambda: not OutgoingEmail.objects.filter(
+                sent_at__isnull=True).exists()
+        )
+        assert len(connections) == 4 and len(set(map(id, connections))) == 1, (
+            'Проверьте, что фоновая доставка отправляет очередь пачкой '
+            'через одно соединение.'
+        )
+
+    def test_05_exhausted_email_marked_dead(self, client, settings,
+                                            monkeypatch, caplog):
+        settings.EMAIL_OUTBOX_DELIVERY = 'worker'
+        self.signup(client)
+
+        def broken_send(self, *args, **kwargs):
+            raise ConnectionError('mail server is down')
+
+        monkeypatch.setattr(mail.EmailMessage, 'send', broken_send)
+        with caplog.at_level(logging.ERROR, logger='users.outbox'):
+            for _ in range(constants.OUTBOX_MAX_ATTEMPTS):
+                OutgoingEmail.objects.update(send_after=timezone.now())
+                call_command('process_outbox')
+
+        email = OutgoingEmail.objects.get()
+        assert email.dead_at is not None and email.sent_at is None, (
+            'Проверьте, что письмо, исчерпавшее попытки, помечается '
+            'недоставленным.'
+        )
+        assert email.attempts == constants.OUTBOX_MAX_ATTEMPTS
+        assert email.body == '', (
+            'Проверьте, что текст недоставленного письма стирается.'
+        )
+        assert 'dropped' in caplog.text, (
+            'Проверьте, что недоставленное письмо записывается в журнал.'
+        )
+
+        monkeypatch.undo()
+        OutgoingEmail.objects.update(send_after=timezone.now())
+        call_command('process_outbox')
+        assert OutgoingEmail.objects.get().sent_at is None, (
+            'Проверьте, что недоставленные письма больше не отправляются.'
+        )
@@ -0,0 +1,173 @@
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from http import HTTPStatus
+from io import StringIO
+
+import pytest
+from django.core import mail
+from django.core.management import call_command
+from django.db import OperationalError, connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from users import constants
+from users.confirmation import check_code
+from users.models import ConfirmationCode, OutgoingEmail
+
+
+@pytest.mark.django_db(transaction=True)
+class Test14ConfirmationCode:
+
+    URL_SIGNUP = '/api/v1/auth/signup/'
+    URL_TOKEN = '/api/v1/auth/token/'
+    VALID_DATA = {
+        'email': 'valid@yamdb.fake',
+        'username': 'valid_username'
+    }
+
+    def signup(self, client):
+        response = client.post(self.URL_SIGNUP, data=self.VALID_DATA)
+        assert response.status_code == HTTPStatus.OK
+        return re.search(r': (\w+)$', mail.outbox[-1].body).group(1)
+
+    def obtain_token(self, client, code):
+        return client.post(self.URL_TOKEN, data={
+            'username': self.VALID_DATA['username'],
+            'confirmation_code': code
+        })
+
+    def test_01_code_is_hashed_and_single_use(self, client):
+        code = self.signup(client)
+
+        stored = ConfirmationCode.objects.get()
+        assert code not in stored.code_hash, (
+            'Проверьте, что код подтверждения хранится в виде хэша.'
+        )
+        response = self.obtain_token(client, code)
+        assert response.status_code == HTTPStatus.OK
+        assert 'token' in response.json()
+
+        response = self.obtain_token(client, code)
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что код подтверждения можно использовать один раз.'
+        )
+
+    def test_02_expired_code_rejected(self, client):
+        code = self.signup(client)
+        ConfirmationCode.objects.update(
+            expires_at=timezone.now() - timedelta(seconds=1))
+
+        response = self.obtain_token(client, code)
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что просроченный код подтверждения не принимается.'
+        )
+
+        call_command('purge_confirmation_codes')
+        assert not ConfirmationCode.objects.exists(), (
+            'Проверьте, что команда `purge_confirmation_codes` удаляет '
+            'просроченные коды.'
+        )
+
+    def test_03_attempts_are_limited(self, client):
+        code = self.signup(client)
+        for _ in range(5):
+            response = self.obtain_token(client, 'wrong')
+            assert response.status_code == HTTPStatus.BAD_REQUEST
+
+        response = self.obtain_token(client, code)
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что после исчерпания попыток код не принимается.'
+        )
+
+        code = self.signup(client)
+        response = self.obtain_token(client, code)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что повторная регистрация выдаёт новый код.'
+        )
+
+    def concurrently(self, function, count):
+        barrier = threading.Barrier(count)
+
+        def run():
+            barrier.wait()
+            try:
+                # Тестовая база SQLite в памяти с общим кэшем не ждёт
+                # блокировку, как файловая с busy_timeout, а сразу
+                # отвечает «table is locked». Упавший запрос не меняет
+                # данных, поэтому его можно повторить.
+                while True:
+                    try:
+                        return function()
+                    except OperationalError as error:
+                        if 'locked' not in str(error):
+                            raise
+                        time.sleep(0.01)
+            finally:
+                connection.close()
+
+        with ThreadPoolExecutor(max_workers=count) as executor:
+            futures = [executor.submit(run) for _ in range(count)]
+            return [future.result() for future in futures]
+
+    def test_04_code_consumed_once_concurrently(self, client,
+                                                django_user_model):
+        code = self.signup(client)
+        user_id = django_user_model.objects.get(
+            username=self.VALID_DATA['username']).pk
+        results = self.concurrently(lambda: check_code(user_id, code), 4)
+        assert results.count(True) == 1, (
+            'Проверьте, что из параллельных запросов с верным кодом '
+            'его принимает только один.'
+        )
+
+    def test_05_attempts_checked_in_one_statement(self, client,
+                                                  django_user_model):
+        code = self.signup(client)
+        user_id = django_user_model.objects.get(
+            username=self.VALID_DATA['username']).pk
+        with CaptureQueriesContext(connection) as context:
+            assert not check_code(user_id, 'wrong')
+        assert not [
+            query for query in context.captured_queries
+            if query['sql'].startswith('SELECT')
+        ], (
+            'Проверьте, что проверка кода не читает счётчик попыток '
+            'отдельным запросом: параллельные попытки превысят лимит.'
+        )
+        results = self.concurrently(
+            lambda: check_code(user_id, 'wrong'),
+            constants.CONFIRMATION_CODE_MAX_ATTEMPTS
+        )
+        assert not any(results)
+        assert ConfirmationCode.objects.get().attempts == (
+            constants.CONFIRMATION_CODE_MAX_ATTEMPTS)
+        assert not check_code(user_id, code), (
+            'Проверьте, что после исчерпания попыток верный код не '
+            'принимается.'
+        )
+
+    def test_06_code_not_kept_in_outbox(self, client, django_user_model):
+        code = self.signup(client)
+        email = OutgoingEmail.objects.get()
+        assert email.sent_at is not None and code not in email.body, (
+            'Проверьте, что после отправки текст письма с кодом '
+            'подтверждения стирается.'
+        )
+
+        superuser = django_user_model.objects.create_superuser(
+            username='root', email='root@yamdb.fake', password='1234567')
+        client.force_login(superuser)
+        response = client.get(
+            f'/admin/users/outgoingemail/{email.pk}/change/')
+        assert response.status_code == HTTPStatus.OK
+        assert 'name="body"' not in response.content.decode(), (
+            'Проверьте, что текст писем не показывается в админке.'
+        )
+
+        call_command('purge_confirmation_codes', stdout=StringIO())
+        assert not OutgoingEmail.objects.exists(), (
+            'Проверьте, что команда `purge_confirmation_codes` удаляет '
+            'отправленные письма.'
+        )
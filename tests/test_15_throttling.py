@@ -0,0 +1,125 @@
+from http import HTTPStatus
+
+import pytest
+from api.throttling import (CacheTokenBucketStore, SQLiteTokenBucketStore,
+                            take_token)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test15Throttling:
+
+    URL_SIGNUP = '/api/v1/auth/signup/'
+    URL_TOKEN = '/api/v1/auth/token/'
+
+    def test_01_token_bucket(self):
+        allowed, tokens, wait = take_token(None, None, 2, 1.0, now=0)
+        assert allowed and tokens == 1, (
+            'Проверьте, что новая корзина заполнена целиком.'
+        )
+        allowed, tokens, wait = take_token(0.5, 0, 2, 1.0, now=0)
+        assert not allowed and wait == 0.5, (
+            'Проверьте, что при пустой корзине возвращается время ожидания.'
+        )
+        allowed, tokens, wait = take_token(0, 0, 2, 1.0, now=10)
+        assert allowed and tokens == 1, (
+            'Проверьте, что корзина пополняется не выше своей ёмкости.'
+        )
+
+    def test_02_signup_username_limit(self, client, settings):
+        rates = settings.REST_FRAMEWORK['DEFAULT_THROTTLE_RATES']
+        limit = int(rates['signup_username'].split('/')[0])
+        data = {'username': 'valid_username', 'email': 'valid@yamdb.fake'}
+        for _ in range(limit):
+            response = client.post(self.URL_SIGNUP, data=data)
+            assert response.status_code == HTTPStatus.OK
+        response = client.post(self.URL_SIGNUP, data=data)
+        assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS, (
+            'Проверьте, что частые запросы регистрации с одним username '
+            'ограничиваются.'
+        )
+        assert 'Retry-After' in response, (
+            'Проверьте, что ответ 429 содержит заголовок Retry-After.'
+        )
+        response = client.post(self.URL_SIGNUP, data={
+            'username': 'other_username', 'email': 'other@yamdb.fake'
+        })
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что лимит по username не затрагивает других '
+            'пользователей.'
+        )
+
+    def test_03_token_ip_limit(self, client, settings):
+        rates = settings.REST_FRAMEWORK['DEFAULT_THROTTLE_RATES']
+        limit = int(rates['token_ip'].split('/')[0])
+        for index in range(limit):
+            response = client.post(self.URL_TOKEN, data={
+                'username': f'user{index}', 'confirmation_code': '0'
+            })
+            assert response.status_code != HTTPStatus.TOO_MANY_REQUESTS
+        response = client.post(self.URL_TOKEN, data={})
+        assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS, (
+            'Проверьте, что частые запросы токена с одного IP '
+            'ограничиваются.'
+        )
+
+    def exhaust_token_ip_limit(self, client, settings, **headers):
+        rates = settings.REST_FRAMEWORK['DEFAULT_THROTTLE_RATES']
+        limit = int(rates['token_ip'].split('/')[0])
+        for _ in range(limit):
+            response = client.post(self.URL_TOKEN, data={}, **headers)
+            assert response.status_code != HTTPStatus.TOO_MANY_REQUESTS
+
+    def test_05_spoofed_forwarded_for_ignored(self, client, settings):
+        self.exhaust_token_ip_limit(client, settings)
+        for index in range(3):
+            response = client.post(
+                self.URL_TOKEN, data={},
+                HTTP_X_FORWARDED_FOR=f'203.0.113.{index}'
+            )
+            assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS, (
+                'Проверьте, что подменённый заголовок X-Forwarded-For не '
+                'сбрасывает лимит по IP.'
+            )
+
+    def test_06_trusted_proxy(self, client, settings):
+        settings.REST_FRAMEWORK = {
+            **settings.REST_FRAMEWORK, 'NUM_PROXIES': 1}
+        self.exhaust_token_ip_limit(
+            client, settings, HTTP_X_FORWARDED_FOR='198.51.100.1')
+        response = client.post(
+            self.URL_TOKEN, data={},
+            HTTP_X_FORWARDED_FOR='203.0.113.1, 198.51.100.1'
+        )
+        assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS, (
+            'Проверьте, что за доверенным прокси клиент определяется по '
+            'адресу, который добавил прокси, а не по началу заголовка.'
+        )
+        response = client.post(
+            self.URL_TOKEN, data={}, HTTP_X_FORWARDED_FOR='198.51.100.2')
+        assert response.status_code != HTTPStatus.TOO_MANY_REQUESTS, (
+            'Проверьте, что за доверенным прокси клиенты с разными адресами '
+            'ограничиваются отдельно.'
+        )
+
+    @pytest.mark.parametrize('store', ('cache', 'sqlite'))
+    def test_04_shared_stores(self, store, tmp_path):
+        if store == 'cache':
+            bucket_store = CacheTokenBucketStore()
+        else:
+            bucket_store = SQLiteTokenBucketStore(tmp_path / 'throttle.db')
+        results = [
+            bucket_store.consume(f'test:{store}', 2, 0.01)[0]
+            for _ in range(3)
+        ]
+        assert results == [True, True, False], (
+            f'Проверьте, что хранилище {store} списывает жетоны.'
+        )
+
+    def test_07_non_object_body(self, client):
+        for url in (self.URL_SIGNUP, self.URL_TOKEN):
+            response = client.post(
+                url, data='[1, 2]', content_type='application/json')
+            assert response.status_code == HTTPStatus.BAD_REQUEST, (
+                f'Проверьте, что тело-массив в `{url}` отклоняется с '
+                'ответом 400, а не ошибкой сервера.'
+            )
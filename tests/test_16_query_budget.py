@@ -0,0 +1,80 @@
+import logging
+
+import pytest
+from api.middleware import QueryBudgetMiddleware, fingerprint
+from django.http import HttpResponse
+from django.test import RequestFactory
+from django.urls import resolve
+from reviews.models import Category
+
+
+@pytest.mark.django_db(transaction=True)
+class Test16QueryBudget:
+
+    def test_01_fingerprint(self):
+        assert fingerprint(
+            'SELECT * FROM t WHERE id IN (%s, %s, %s) AND name = \'x\''
+        ) == fingerprint(
+            'SELECT * FROM t WHERE id IN (%s) AND name = \'y\''
+        ), (
+            'Проверьте, что отпечаток SQL не зависит от литералов и '
+            'длины списка IN.'
+        )
+
+    def test_02_debug_headers(self, client, settings):
+        settings.DEBUG = True
+        response = client.get('/api/v1/categories/')
+        assert response['X-DB-Query-Count'].isdigit(), (
+            'Проверьте, что в режиме DEBUG ответ содержит число '
+            'SQL-запросов.'
+        )
+        assert 'X-DB-Time' in response
+        settings.DEBUG = False
+        response = client.get('/api/v1/categories/')
+        assert 'X-DB-Query-Count' not in response, (
+            'Проверьте, что без DEBUG заголовки не добавляются.'
+        )
+
+    def test_03_over_budget_logs_repeated_sql(
+        self, settings, caplog, monkeypatch
+    ):
+        monkeypatch.setattr('api.middleware.budget_listeners', [])
+        settings.QUERY_BUDGET = {'DEFAULT': 2, 'ROUTES': {}}
+        for index in range(3):
+            Category.objects.create(name=f'c{index}', slug=f'c{index}')
+
+        def n_plus_one(request):
+            for pk in Category.objects.values_list('pk', flat=True):
+                Category.objects.get(pk=pk)
+            return HttpResponse()
+
+        request = RequestFactory().get('/api/v1/categories/')
+        request.resolver_match = resolve('/api/v1/categories/')
+        with caplog.at_level(logging.WARNING, logger='api.middleware'):
+            QueryBudgetMiddleware(n_plus_one)(request)
+        assert request.query_stats.count == 4
+        assert 'categories-list' in caplog.text and '3x' in caplog.text, (
+            'Проверьте, что превышение бюджета логируется с именем '
+            'маршрута и повторяющимися запросами.'
+        )
+
+    def test_04_admin_pages_skip_default_budget(
+        self, settings, caplog, monkeypatch
+    ):
+        monkeypatch.setattr('api.middleware.budget_listeners', [])
+        settings.QUERY_BUDGET = {'DEFAULT': 0, 'ROUTES': {}}
+
+        def view(request):
+            Category.objects.exists()
+            return HttpResponse()
+
+        with caplog.at_level(logging.WARNING, logger='api.middleware'):
+            for path in ('/admin/', '/api/v1/categories/'):
+                request = RequestFactory().get(path)
+                request.resolver_match = resolve(path)
+                QueryBudgetMiddleware(view)(request)
+        assert '/admin/' not in caplog.text, (
+            'Проверьте, что бюджет DEFAULT не применяется к страницам '
+            'админки.'
+        )
+        assert 'categories-list' in caplog.text
@@ -0,0 +1,60 @@
+from http import HTTPStatus
+
+import pytest
+
+
+@pytest.mark.django_db(transaction=True)
+class Test17Metrics:
+
+    URL_METRICS = '/api/metrics'
+
+    def test_01_route_metrics(self, client, admin_client):
+        client.get('/api/v1/categories/')
+        client.get('/api/v1/titles/100500/')
+        admin_client.get('/api/v1/users/')
+        response = client.get(self.URL_METRICS)
+        assert response.status_code == HTTPStatus.OK
+        assert response['Content-Type'].startswith('text/plain'), (
+            'Проверьте, что метрики отдаются в текстовом формате.'
+        )
+        body = response.content.decode()
+        assert (
+            'yamdb_http_requests_total{route="titles-detail",method="GET",'
+            'status="404"}'
+        ) in body, (
+            'Проверьте, что ответы считаются по имени маршрута и статусу.'
+        )
+        assert (
+            'yamdb_http_request_duration_seconds_bucket{'
+            'route="categories-list",method="GET",le="+Inf"}'
+        ) in body, (
+            'Проверьте, что задержка запросов собирается в гистограмму.'
+        )
+        assert 'yamdb_http_request_db_queries_count{route="users-list"' in (
+            body
+        ), 'Проверьте, что число SQL-запросов собирается по маршрутам.'
+        assert '# TYPE yamdb_http_requests_in_flight gauge' in body
+        assert '/api/v1/' not in body, (
+            'Проверьте, что в метках используются имена маршрутов, '
+            'а не пути.'
+        )
+
+    def test_02_cache_hit_ratio(self, client):
+        client.get('/api/v1/categories/')
+        client.get('/api/v1/categories/')
+        body = client.get(self.URL_METRICS).content.decode()
+        assert (
+            'yamdb_cache_requests_total{cache="registry:category",'
+            'result="hit"}'
+        ) in body, 'Проверьте, что учитываются попадания в кэш справочников.'
+        assert 'yamdb_cache_hit_ratio{cache="registry:category"}' in body
+
+    def test_03_token(self, client, settings):
+        settings.METRICS_TOKEN = 'secret'
+        response = client.get(self.URL_METRICS)
+        assert response.status_code == HTTPStatus.FORBIDDEN, (
+            'Проверьте, что при заданном METRICS_TOKEN метрики закрыты.'
+        )
+        response = client.get(
+            self.URL_METRICS, HTTP_AUTHORIZATION='Bearer secret')
+        assert response.status_code == HTTPStatus.OK
@@ -0,0 +1,47 @@
+import re
+
+import pytest
+from reviews.models import Category, Genre, Title
+
+
+@pytest.mark.django_db(transaction=True)
+class Test18ServerTiming:
+
+    PHASES = ('auth', 'perm', 'db', 'serialize', 'render', 'total')
+
+    def parse(self, response):
+        assert 'Server-Timing' in response, (
+            'Проверьте, что при SERVER_TIMING ответ содержит заголовок '
+            'Server-Timing.'
+        )
+        return {
+            name: float(duration) for name, duration in re.findall(
+                r'(\w+);dur=([\d.]+)', response['Server-Timing'])
+        }
+
+    def test_01_phases(self, user_client, settings):
+        settings.SERVER_TIMING = True
+        category = Category.objects.create(name='Фильм', slug='film')
+        genre = Genre.objects.create(name='Драма', slug='drama')
+        for year in range(1990, 1995):
+            title = Title.objects.create(
+                name=f'Фильм {year}', year=year, category=category)
+            title.genre.add(genre)
+
+        timings = self.parse(user_client.get('/api/v1/titles/'))
+        assert tuple(timings) == self.PHASES, (
+            'Проверьте, что Server-Timing содержит фазы '
+            f'{", ".join(self.PHASES)}.'
+        )
+        for phase in ('auth', 'db', 'serialize', 'render'):
+            assert timings[phase] > 0, (
+                f'Проверьте, что время фазы {phase} учитывается.'
+            )
+        assert timings['total'] >= timings['serialize'] + timings['render']
+
+    def test_02_disabled(self, client, settings):
+        settings.SERVER_TIMING = False
+        response = client.get('/api/v1/titles/')
+        assert 'Server-Timing' not in response, (
+            'Проверьте, что без SERVER_TIMING заголовок не добавляется.'
+        )
@@ -0,0 +1,85 @@
+from http import HTTPStatus
+
+import pytest
+from api.profiling import make_profile_token
+
+
+@pytest.mark.django_db(transaction=True)
+class Test19Profiler:
+
+    URL_TITLES = '/api/v1/titles/'
+    URL_PROFILES = '/admin/profiles/'
+
+    @pytest.fixture(autouse=True)
+    def profiler_dir(self, settings, tmp_path):
+        settings.PROFILER_DIR = tmp_path
+        settings.PROFILER_MAX_FILES = 2
+        return tmp_path
+
+    @pytest.fixture
+    def staff(self, django_user_model):
+        return django_user_model.objects.create_user(
+            username='staff', email='staff@yamdb.fake', password='1234567',
+            is_staff=True
+        )
+
+    def test_01_signed_token_required(self, client, staff, profiler_dir):
+        response = client.get(self.URL_TITLES, HTTP_X_PROFILE='forged')
+        assert 'X-Profile-Id' not in response, (
+            'Проверьте, что без подписанного токена запрос не профилируется.'
+        )
+        response = client.get(
+            self.URL_TITLES, HTTP_X_PROFILE=make_profile_token(staff))
+        assert response.status_code == HTTPStatus.OK
+        assert (profiler_dir / response['X-Profile-Id']).exists(), (
+            'Проверьте, что профиль запроса сохраняется на диск.'
+        )
+        assert response['X-Profile-Id'].endswith('-GET-titles-list.prof')
+
+    def test_02_sampler_and_ring_buffer(self, client, staff, profiler_dir):
+        token = make_profile_token(staff)
+        for _ in range(3):
+            response = client.get(
+                self.URL_TITLES, HTTP_X_PROFILE=token,
+                HTTP_X_PROFILE_MODE='sample'
+            )
+        assert response['X-Profile-Id'].endswith('.folded'), (
+            'Проверьте, что режим sample сохраняет свёрнутые стеки.'
+        )
+        assert len(list(profiler_dir.iterdir())) == 2, (
+            'Проверьте, что хранится не больше PROFILER_MAX_FILES профилей.'
+        )
+
+    def test_03_admin_pages(self, client, staff, profiler_dir):
+        (profiler_dir / 'notes.prof').write_text('')
+        assert client.get(self.URL_PROFILES).status_code == HTTPStatus.FOUND, (
+            'Проверьте, что список профилей доступен только сотрудникам.'
+        )
+        client.force_login(staff)
+        name = client.get(
+            self.URL_TITLES, {'_profile': '1'})['X-Profile-Id']
+        response = client.get(self.URL_PROFILES)
+        assert response.status_code == HTTPStatus.OK
+        assert name in response.content.decode()
+        response = client.get(f'{self.URL_PROFILES}{name}/')
+        assert response.status_code == HTTPStatus.OK
+        assert 'function calls' in response.content.decode(), (
+            'Проверьте, что профиль показывается в виде отчёта pstats.'
+        )
+        response = client.get(f'{self.URL_PROFILES}..%2Fsettings.py/')
+        assert response.status_code == HTTPStatus.NOT_FOUND
+
+    def test_04_token_revoked_with_staff(self, client, staff, admin):
+        token = make_profile_token(staff)
+        staff.is_staff = False
+        staff.save()
+        response = client.get(self.URL_TITLES, HTTP_X_PROFILE=token)
+        assert 'X-Profile-Id' not in response, (
+            'Проверьте, что токен перестаёт действовать, когда у владельца '
+            'отозваны права сотрудника.'
+        )
+        response = client.get(
+            self.URL_TITLES, HTTP_X_PROFILE=make_profile_token(admin))
+        assert 'X-Profile-Id' not in response, (
+            'Проверьте, что токен принимается только от сотрудников.'
+        )
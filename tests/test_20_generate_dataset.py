@@ -0,0 +1,56 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db.models import Count
+from reviews.models import Comment, Review, Title
+
+
+@pytest.mark.django_db(transaction=True)
+class Test20GenerateDataset:
+
+    SIZES = {
+        'users': 50, 'categories': 3, 'genres': 5, 'titles': 40,
+        'reviews': 400, 'comments': 300, 'batch_size': 64,
+    }
+
+    def generate(self, **options):
+        call_command(
+            'generate_dataset', stdout=StringIO(), **self.SIZES, **options)
+
+    def snapshot(self):
+        return list(
+            Review.objects.order_by('id')
+            .values_list('title_id', 'author_id', 'score', 'text')
+        )
+
+    def test_01_generates_consistent_data(self):
+        self.generate(seed=1)
+        assert Title.objects.count() == self.SIZES['titles']
+        assert Comment.objects.count() == self.SIZES['comments']
+        reviews = Review.objects.count()
+        assert 0 < reviews <= self.SIZES['reviews'], (
+            'Проверьте, что команда создаёт отзывы.'
+        )
+        title = Title.objects.order_by('id').first()
+        assert title.rating_count == title.reviews.count(), (
+            'Проверьте, что после генерации пересчитываются рейтинги.'
+        )
+        counts = list(
+            Title.objects.order_by('id').annotate(total=Count('reviews'))
+            .values_list('total', flat=True)
+        )
+        assert counts[0] > counts[-1], (
+            'Проверьте, что популярность произведений неравномерна.'
+        )
+
+    def test_02_reproducible(self):
+        self.generate(seed=7)
+        first = self.snapshot()
+        Review.objects.all().delete()
+        Title.objects.all().delete()
+        self.generate(seed=7)
+        second = self.snapshot()
+        assert [row[2:] for row in first] == [row[2:] for row in second], (
+            'Проверьте, что один и тот же seed даёт одинаковые данные.'
+        )
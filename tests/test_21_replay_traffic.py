@@ -0,0 +1,58 @@
+import json
+from io import StringIO
+
+import pytest
+from django.core.management import CommandError, call_command
+
+
+@pytest.mark.django_db(transaction=True)
+class Test21ReplayTraffic:
+
+    LOG = (
+        {'method': 'GET', 'path': '/api/v1/titles/'},
+        {'method': 'GET', 'path': '/api/v1/categories/'},
+        {'method': 'GET', 'path': '/api/v1/users/me/', 'user': 'TestUser'},
+    )
+
+    @pytest.fixture
+    def log(self, tmp_path, user):
+        path = tmp_path / 'traffic.jsonl'
+        path.write_text(
+            '\n'.join(json.dumps(entry) for entry in self.LOG),
+            encoding='utf-8'
+        )
+        return path
+
+    def replay(self, log, tmp_path, *args):
+        summary_path = tmp_path / 'summary.json'
+        call_command(
+            'replay_traffic', str(log), '--repeat', '3',
+            '--concurrency', '2', '--json', str(summary_path), *args,
+            stdout=StringIO(), stderr=StringIO()
+        )
+        return json.loads(summary_path.read_text(encoding='utf-8'))
+
+    def test_01_in_process(self, log, tmp_path):
+        summary = self.replay(log, tmp_path)
+        assert set(summary) == {'titles-list', 'categories-list', 'users-me'}, (
+            'Проверьте, что сводка строится по именам маршрутов.'
+        )
+        for route, row in summary.items():
+            assert row['requests'] == 3
+            assert row['errors'] == 0, (
+                f'Проверьте, что запросы к {route} выполняются без ошибок, '
+                'в том числе от имени пользователя из журнала.'
+            )
+            assert row['p50_ms'] <= row['p95_ms'] <= row['max_ms']
+
+    def test_02_http(self, log, tmp_path, live_server):
+        summary = self.replay(log, tmp_path, '--url', live_server.url)
+        assert summary['users-me']['errors'] == 0, (
+            'Проверьте, что журнал воспроизводится и на запущенном сервере.'
+        )
+
+    def test_03_invalid_log(self, tmp_path):
+        path = tmp_path / 'broken.jsonl'
+        path.write_text('{"method": "GET"}\n', encoding='utf-8')
+        with pytest.raises(CommandError):
+            call_command('replay_traffic', str(path), stdout=StringIO())
@@ -0,0 +1,134 @@
+import time
+
+import pytest
+from api.replicas import STICKY_COOKIE, ReplicaRouter
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.test.utils import CaptureQueriesContext
+from reviews.models import Category, Title
+
+REPLICA = 'replica'
+
+
+@pytest.fixture
+def replica(settings):
+    """Реплика-заглушка: второе соединение с той же тестовой базой."""
+    connections.settings[REPLICA] = dict(
+        connections.settings[DEFAULT_DB_ALIAS])
+    settings.DATABASE_REPLICAS = [REPLICA]
+    yield connections[REPLICA]
+    connections[REPLICA].close()
+    del connections[REPLICA]
+    del connections.settings[REPLICA]
+
+
+def capture(alias):
+    return CaptureQueriesContext(connections[alias])
+
+
+def reads(context, table):
+    """Запросы, читающие таблицу; справочники и пользователь не в счёт."""
+    return [
+        query for query in context.captured_queries
+        if f'FROM "{table}"' in query['sql']
+    ]
+
+
+@pytest.mark.django_db(transaction=True)
+class Test22ReadReplicas:
+
+    @pytest.fixture
+    def title(self):
+        category = Category.objects.create(name='Фильм', slug='film')
+        return Title.objects.create(name='Титаник', year=1997,
+                                    category=category)
+
+    def test_01_router_outside_requests(self, replica):
+        router = ReplicaRouter()
+        assert router.db_for_read(Title) is None, (
+            'Проверьте, что вне безопасных запросов API чтение идёт '
+            'в основную базу.'
+        )
+        assert router.db_for_write(Title) == DEFAULT_DB_ALIAS
+
+    def test_02_safe_requests_read_replica(self, client, replica, title):
+        with capture(DEFAULT_DB_ALIAS) as primary, capture(REPLICA) as read:
+            response = client.get(f'/api/v1/titles/{title.pk}/')
+        assert response.status_code == 200
+        assert reads(read, 'reviews_title') and not reads(
+            primary, 'reviews_title'), (
+            'Проверьте, что GET-запрос к произведению читает из реплики.'
+        )
+        with capture(DEFAULT_DB_ALIAS) as primary, capture(REPLICA) as read:
+            response = client.get(f'/api/v1/titles/{title.pk}/reviews/')
+        assert response.status_code == 200
+        assert reads(read, 'reviews_review') and not reads(
+            primary, 'reviews_review'), (
+            'Проверьте, что GET-запрос к отзывам читает из реплики.'
+        )
+
+    def test_03_writes_go_to_primary(self, user_client, replica, title):
+        with capture(DEFAULT_DB_ALIAS) as primary, capture(REPLICA) as read:
+            response = user_client.post(
+                f'/api/v1/titles/{title.pk}/reviews/',
+                {'text': 'Отзыв', 'score': 9}
+            )
+        assert response.status_code == 201
+        assert len(read) == 0 and any(
+            query['sql'].startswith('INSERT') for query in primary), (
+            'Проверьте, что запись и чтение в запросе на запись идут в '
+            'основную базу.'
+        )
+
+    def test_04_read_your_writes(self, user_client, admin_client, user,
+                                 replica, title):
+        url = f'/api/v1/titles/{title.pk}/reviews/'
+        user_client.post(url, {'text': 'Отзыв', 'score': 9})
+        assert STICKY_COOKIE in user_client.cookies, (
+            'Проверьте, что после записи время записи передаётся в '
+            'подписанной куке.'
+        )
+        with capture(DEFAULT_DB_ALIAS) as primary, capture(REPLICA) as read:
+            response = user_client.get(url)
+        assert response.json()['count'] == 1
+        assert reads(primary, 'reviews_review') and not reads(
+            read, 'reviews_review'), (
+            'Проверьте, что сразу после записи пользователь читает из '
+            'основной базы.'
+        )
+        admin_client.cookies[STICKY_COOKIE] = (
+            user_client.cookies[STICKY_COOKIE].value)
+        with capture(DEFAULT_DB_ALIAS) as primary, capture(REPLICA) as read:
+            admin_client.get(url)
+        assert reads(read, 'reviews_review') and not reads(
+            primary, 'reviews_review'), (
+            'Проверьте, что привязка к основной базе действует только для '
+            'писавшего пользователя.'
+        )
+        user_client.cookies[STICKY_COOKIE] = f'{user.pk}:forged:signature'
+        with capture(DEFAULT_DB_ALIAS) as primary, capture(REPLICA) as read:
+            user_client.get(url)
+        assert reads(read, 'reviews_review'), (
+            'Проверьте, что кука без верной подписи не привязывает к '
+            'основной базе.'
+        )
+
+    def test_05_sticky_window_expires(self, user_client, replica, title,
+                                      settings):
+        url = f'/api/v1/titles/{title.pk}/reviews/'
+        settings.REPLICA_STICKY_SECONDS = 0.01
+        user_client.post(url, {'text': 'Отзыв', 'score': 9})
+        time.sleep(0.05)
+        with capture(DEFAULT_DB_ALIAS) as primary, capture(REPLICA) as read:
+            user_client.get(url)
+        assert reads(read, 'reviews_review') and not reads(
+            primary, 'reviews_review'), (
+            'Проверьте, что привязка к основной базе истекает через '
+            'REPLICA_STICKY_SECONDS.'
+        )
+
+    def test_06_without_replicas(self, client, title):
+        with capture(DEFAULT_DB_ALIAS) as primary:
+            response = client.get('/api/v1/titles/')
+        assert response.status_code == 200 and len(primary) > 0, (
+            'Проверьте, что без реплик чтение идёт в основную базу.'
+        )
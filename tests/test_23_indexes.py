@@ -0,0 +1,97 @@
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import (create_single_comment, create_single_review,
+                         create_titles)
+
+User = get_user_model()
+
+
+def query_plan(sql, params=()):
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+        return ' | '.join(row[-1] for row in cursor.fetchall())
+
+
+def hot_query(client, url, table):
+    """План основного запроса к таблице при обработке GET-запроса."""
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(url)
+    assert response.status_code == 200
+    queries = [
+        query['sql'] for query in context.captured_queries
+        if query['sql'].startswith('SELECT')
+        and f'FROM "{table}"' in query['sql']
+        and 'COUNT(' not in query['sql']
+    ]
+    assert queries, f'Проверьте, что `{url}` читает таблицу `{table}`.'
+    return query_plan(queries[-1])
+
+
+def assert_uses_index(plan, index, url):
+    assert f'INDEX {index}' in plan, (
+        f'Проверьте, что запрос `{url}` использует индекс `{index}`. '
+        f'План: {plan}'
+    )
+    assert 'TEMP B-TREE' not in plan, (
+        f'Проверьте, что запрос `{url}` не сортирует строки отдельно. '
+        f'План: {plan}'
+    )
+
+
+@pytest.mark.django_db(transaction=True)
+class Test23Indexes:
+
+    @pytest.fixture
+    def review(self, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        review = create_single_review(
+            admin_client, titles[0]['id'], 'Отзыв', 7).json()
+        create_single_comment(
+            admin_client, titles[0]['id'], review['id'], 'Комментарий')
+        return titles[0]['id'], review['id']
+
+    def test_01_reviews_list(self, client, review):
+        title_id, _ = review
+        for query in ('', '?pagination=cursor'):
+            url = f'/api/v1/titles/{title_id}/reviews/{query}'
+            assert_uses_index(
+                hot_query(client, url, 'reviews_review'),
+                'review_title_pub_date_idx', url
+            )
+
+    def test_02_comments_list(self, client, review):
+        title_id, review_id = review
+        for query in ('', '?pagination=cursor'):
+            url = (
+                f'/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+                f'{query}'
+            )
+            assert_uses_index(
+                hot_query(client, url, 'reviews_comment'),
+                'comment_review_pub_date_idx', url
+            )
+
+    def test_03_titles_list(self, client, review):
+        url = '/api/v1/titles/'
+        assert_uses_index(
+            hot_query(client, url, 'reviews_title'), 'title_name_idx', url)
+
+    def test_04_titles_filtered_by_category_and_year(self, client, review):
+        url = '/api/v1/titles/?category=films&year=1984'
+        plan = hot_query(client, url, 'reviews_title')
+        assert 'INDEX title_category_year_idx' in plan, (
+            f'Проверьте, что фильтр по категории и году использует индекс '
+            f'`title_category_year_idx`. План: {plan}'
+        )
+
+    def test_05_users_by_role(self, admin):
+        sql, params = User.objects.filter(
+            role='moderator').query.sql_with_params()
+        plan = query_plan(sql, params)
+        assert 'INDEX user_role_idx' in plan, (
+            f'Проверьте, что выборка пользователей по роли использует индекс '
+            f'`user_role_idx`. План: {plan}'
+        )
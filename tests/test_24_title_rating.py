@@ -0,0 +1,95 @@
+from http import HTTPStatus
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from reviews.models import Title
+
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test24TitleRating:
+
+    TITLE_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+    REVIEW_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/{review_id}/'
+
+    @pytest.fixture
+    def reviews(self, admin_client, user_client, moderator_client):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        user_review = create_single_review(
+            user_client, title_id, 'Отзыв пользователя', 4).json()
+        moderator_review = create_single_review(
+            moderator_client, title_id, 'Отзыв модератора', 8).json()
+        return title_id, user_review['id'], moderator_review['id']
+
+    def get_rating(self, client, title_id):
+        response = client.get(self.TITLE_URL_TEMPLATE.format(
+            title_id=title_id))
+        assert response.status_code == HTTPStatus.OK
+        return response.json()['rating']
+
+    def test_01_rating_after_patch(self, client, user_client, reviews):
+        title_id, user_review_id, _ = reviews
+        assert self.get_rating(client, title_id) == 6
+        response = user_client.patch(
+            self.REVIEW_URL_TEMPLATE.format(
+                title_id=title_id, review_id=user_review_id),
+            data={'score': 10}
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert self.get_rating(client, title_id) == 9, (
+            'Проверьте, что изменение оценки в отзыве пересчитывает '
+            'рейтинг произведения.'
+        )
+        response = user_client.patch(
+            self.REVIEW_URL_TEMPLATE.format(
+                title_id=title_id, review_id=user_review_id),
+            data={'text': 'Новый текст'}
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert self.get_rating(client, title_id) == 9, (
+            'Проверьте, что изменение текста отзыва не меняет рейтинг '
+            'произведения.'
+        )
+
+    def test_02_rating_after_delete(self, client, moderator_client,
+                                    reviews):
+        title_id, _, moderator_review_id = reviews
+        response = moderator_client.delete(
+            self.REVIEW_URL_TEMPLATE.format(
+                title_id=title_id, review_id=moderator_review_id))
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        assert self.get_rating(client, title_id) == 4, (
+            'Проверьте, что удаление отзыва исключает его оценку из '
+            'рейтинга произведения.'
+        )
+        title = Title.objects.get(pk=title_id)
+        assert (title.rating_sum, title.rating_count) == (4, 1)
+
+    def test_03_rating_after_author_deleted(self, client, admin_client,
+                                            user, reviews):
+        title_id, _, _ = reviews
+        response = admin_client.delete(f'/api/v1/users/{user.username}/')
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        assert self.get_rating(client, title_id) == 8, (
+            'Проверьте, что при удалении автора его отзывы исключаются '
+            'из рейтинга произведения.'
+        )
+        title = Title.objects.get(pk=title_id)
+        assert (title.rating_sum, title.rating_count) == (8, 1)
+
+    def test_04_recompute_ratings_fixes_drift(self, client, reviews):
+        title_id, _, _ = reviews
+        Title.objects.update(rating_sum=1000, rating_count=3)
+        call_command('recompute_ratings', stdout=StringIO())
+        title = Title.objects.get(pk=title_id)
+        assert (title.rating_sum, title.rating_count) == (12, 2), (
+            'Проверьте, что recompute_ratings восстанавливает сумму и '
+            'количество оценок по отзывам.'
+        )
+        other = Title.objects.exclude(pk=title_id).get()
+        assert (other.rating_sum, other.rating_count) == (0, 0)
+        assert other.rating is None
+        assert self.get_rating(client, title_id) == 6
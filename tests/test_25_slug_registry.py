@@ -0,0 +1,111 @@
+import time
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from reviews.models import Category, Genre
+from reviews.registry import category_registry, genre_registry
+
+from tests.utils import create_titles
+
+
+def stale(registry, snapshot, loaded_ago=0.0):
+    """Подменяет снимок справочника, как в процессе, не видевшем правку."""
+    now = time.monotonic()
+    registry._snapshot = snapshot._replace(
+        checked_at=now - registry.check_interval,
+        loaded_at=now - loaded_ago
+    )
+
+
+@pytest.mark.django_db(transaction=True)
+class Test25SlugRegistry:
+
+    TITLES_URL = '/api/v1/titles/'
+    CATEGORIES_URL = '/api/v1/categories/'
+
+    def post_title(self, client, genres, category):
+        return client.post(self.TITLES_URL, data={
+            'name': 'Чужой',
+            'year': 1979,
+            'genre': genres,
+            'category': category,
+        })
+
+    def test_01_deleted_slug_rejected(self, admin_client):
+        _, categories, genres = create_titles(admin_client)
+        category_snapshot = category_registry.snapshot()
+        genre_snapshot = genre_registry.snapshot()
+        Category.objects.filter(slug=categories[0]['slug']).delete()
+        Genre.objects.filter(slug=genres[0]['slug']).delete()
+
+        category_registry._snapshot = category_snapshot
+        response = self.post_title(
+            admin_client, [genres[1]['slug']], categories[0]['slug'])
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что слаг категории, удалённой в другом процессе, '
+            'отклоняется с ответом 400.'
+        )
+        assert 'category' in response.json()
+
+        genre_registry._snapshot = genre_snapshot
+        response = self.post_title(
+            admin_client, [genres[1]['slug'], genres[0]['slug']],
+            categories[1]['slug']
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что слаг жанра, удалённого в другом процессе, '
+            'отклоняется с ответом 400.'
+        )
+        assert 'genre' in response.json()
+
+    def test_02_unknown_slug_does_not_reload(self, client, admin_client):
+        create_titles(admin_client)
+        client.get(f'{self.TITLES_URL}?category=unknown')
+        with CaptureQueriesContext(connection) as context:
+            for _ in range(3):
+                response = client.get(f'{self.TITLES_URL}?category=unknown')
+                assert response.status_code == HTTPStatus.OK
+        assert not [
+            query for query in context.captured_queries
+            if 'FROM "reviews_category"' in query['sql']
+        ], (
+            'Проверьте, что несуществующий слаг не перечитывает справочник '
+            'при каждом запросе.'
+        )
+
+    def test_03_shared_invalidation(self, client, admin_client):
+        _, categories, _ = create_titles(admin_client)
+        snapshot = category_registry.snapshot()
+        assert not any(
+            hasattr(obj, 'representation') for obj in snapshot.objects)
+        Category.objects.filter(slug=categories[0]['slug']).update(
+            name='Кинофильмы')
+        category_registry.invalidate()
+
+        stale(category_registry, snapshot)
+        response = client.get(self.CATEGORIES_URL)
+        assert {'name': 'Кинофильмы', 'slug': categories[0]['slug']} in (
+            response.json()['results']), (
+            'Проверьте, что сброс справочника в одном процессе виден '
+            'остальным через общий кэш.'
+        )
+
+    def test_04_snapshot_max_age(self, client, admin_client):
+        _, categories, _ = create_titles(admin_client)
+        snapshot = category_registry.snapshot()
+        Category.objects.filter(slug=categories[0]['slug']).update(
+            name='Кинофильмы')
+
+        stale(category_registry, snapshot)
+        response = client.get(self.CATEGORIES_URL)
+        assert {'name': 'Кинофильмы', 'slug': categories[0]['slug']} not in (
+            response.json()['results'])
+        stale(category_registry, snapshot, category_registry.max_age)
+        response = client.get(self.CATEGORIES_URL)
+        assert {'name': 'Кинофильмы', 'slug': categories[0]['slug']} in (
+            response.json()['results']), (
+            'Проверьте, что правки в обход сигналов попадают в справочник '
+            'не позже чем через max_age секунд.'
+        )
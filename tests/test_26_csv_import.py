@@ -0,0 +1,151 @@
+from io import StringIO
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.management import CommandError, call_command
+from reviews.csv_import import CSV_FILES, CsvFile, import_stages
+from reviews.models import Category, Comment, Genre, Review, Title
+
+User = get_user_model()
+
+CSV_DATA = {
+    'category.csv': (
+        'id,name,slug\n'
+        '1,Фильм,movie\n'
+        '2,Книга,book\n'
+    ),
+    'genre.csv': (
+        'id,name,slug\n'
+        '1,Драма,drama\n'
+        '2,Комедия,comedy\n'
+        '3,Сказка,tale\n'
+    ),
+    'users.csv': (
+        'id,username,email,role,bio,first_name,last_name\n'
+        '100,bingobongo,bingobongo@yamdb.fake,user,,,\n'
+        '101,capt_obvious,capt_obvious@yamdb.fake,admin,,,\n'
+    ),
+    'titles.csv': (
+        'id,name,year,category\n'
+        '1,Побег из Шоушенка,1994,1\n'
+        '2,Крестный отец,1972,1\n'
+        '3,Колобок,1873,2\n'
+    ),
+    'genre_title.csv': (
+        'id,title_id,genre_id\n'
+        '1,1,1\n'
+        '2,2,1\n'
+        '3,3,2\n'
+        '4,3,3\n'
+        '5,2,2\n'
+    ),
+    'review.csv': (
+        'id,title_id,text,author,score,pub_date\n'
+        '1,1,Ставлю десять звёзд!,100,10,2019-09-24T21:08:21.567Z\n'
+        '2,1,Неплохо,101,6,2019-09-24T21:08:21.567Z\n'
+        '3,3,Для детей,100,7,2019-09-24T21:08:21.567Z\n'
+    ),
+    'comments.csv': (
+        'id,review_id,text,author,pub_date\n'
+        '1,1,Согласен,101,2020-01-13T23:20:02.422Z\n'
+        '2,3,Не только,100,2020-01-13T23:20:02.422Z\n'
+    ),
+}
+
+
+@pytest.mark.django_db(transaction=True)
+class Test26CsvImport:
+
+    @pytest.fixture
+    def data_path(self, tmp_path):
+        for filename, content in CSV_DATA.items():
+            (tmp_path / filename).write_text(content, encoding='utf-8')
+        return tmp_path
+
+    def load(self, data_path, **options):
+        options.setdefault('batch_size', 2)
+        options.setdefault('workers', 2)
+        call_command(
+            'load_csv_data', data_path=str(data_path), stdout=StringIO(),
+            **options
+        )
+
+    def test_01_batched_import(self, data_path):
+        self.load(data_path)
+        assert (
+            Category.objects.count(), Genre.objects.count(),
+            User.objects.count(), Title.objects.count(),
+            Review.objects.count(), Comment.objects.count()
+        ) == (2, 3, 2, 3, 3, 2), (
+            'Проверьте, что команда `load_csv_data` загружает все файлы '
+            'пачками меньше размера файла.'
+        )
+        assert Title.genre.through.objects.count() == 5, (
+            'Проверьте, что связи произведений и жанров загружаются из '
+            '`genre_title.csv`.'
+        )
+        assert set(Title.objects.get(pk=3).genre.values_list(
+            'slug', flat=True)) == {'comedy', 'tale'}
+        assert Title.objects.get(pk=1).rating == 8, (
+            'Проверьте, что после загрузки пересчитываются рейтинги.'
+        )
+
+    def test_02_upsert_rerun(self, data_path):
+        self.load(data_path)
+        (data_path / 'category.csv').write_text(
+            'id,name,slug\n1,Кино,movie\n2,Книга,book\n3,Музыка,music\n',
+            encoding='utf-8'
+        )
+        self.load(data_path, upsert=True)
+        assert Category.objects.get(pk=1).name == 'Кино', (
+            'Проверьте, что режим `--upsert` обновляет существующие строки.'
+        )
+        assert Category.objects.count() == 3, (
+            'Проверьте, что режим `--upsert` добавляет новые строки.'
+        )
+        assert (
+            Title.objects.count(), Title.genre.through.objects.count(),
+            Review.objects.count(), Comment.objects.count()
+        ) == (3, 5, 3, 2), (
+            'Проверьте, что повторная загрузка с `--upsert` не создаёт '
+            'дубликатов.'
+        )
+        assert Title.objects.get(pk=1).rating == 8
+
+    def test_03_import_stages(self):
+        stages = [
+            {csv_file.filename for csv_file in stage}
+            for stage in import_stages(CSV_FILES)
+        ]
+        assert stages == [
+            {'category.csv', 'genre.csv', 'users.csv'},
+            {'titles.csv'},
+            {'genre_title.csv', 'review.csv'},
+            {'comments.csv'},
+        ], 'Проверьте, что файлы загружаются по этапам графа зависимостей.'
+
+        first = CsvFile('a.csv', Category, None, (), ('b.csv',))
+        second = CsvFile('b.csv', Genre, None, (), ('a.csv',))
+        with pytest.raises(ValueError):
+            import_stages((first, second))
+        with pytest.raises(ValueError):
+            import_stages((first,))
+
+    def test_04_reader_error_fails_command(self, data_path):
+        (data_path / 'titles.csv').write_text(
+            'id,name,category\n1,Побег из Шоушенка,1\n', encoding='utf-8')
+        with pytest.raises(CommandError, match='titles.csv'):
+            self.load(data_path)
+        assert Category.objects.count() == 2
+        assert not Title.objects.exists(), (
+            'Проверьте, что файл с ошибкой не загружается частично.'
+        )
+
+    def test_05_rerun_without_upsert_fails_command(self, data_path):
+        self.load(data_path)
+        with pytest.raises(CommandError, match='--upsert'):
+            self.load(data_path)
+        assert Category.objects.count() == 2, (
+            'Проверьте, что повторная загрузка без `--upsert` завершается '
+            'ошибкой команды и не меняет данные.'
+        )
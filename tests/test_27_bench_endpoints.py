@@ -0,0 +1,32 @@
+from io import StringIO
+
+import pytest
+from benchmarks.bench_endpoints import build_scenarios, run_scenario
+from django.core.management import call_command
+from django.test import Client
+
+
+@pytest.mark.django_db(transaction=True)
+class Test27BenchEndpoints:
+
+    SIZES = {
+        'users': 30, 'categories': 2, 'genres': 3, 'titles': 3,
+        'reviews': 80, 'comments': 20,
+    }
+
+    def test_01_scenarios_run(self, settings):
+        settings.REST_FRAMEWORK = {
+            **settings.REST_FRAMEWORK, 'DEFAULT_THROTTLE_RATES': {}}
+        call_command(
+            'generate_dataset', seed=0, stdout=StringIO(), **self.SIZES)
+        client = Client()
+        scenarios = build_scenarios()
+        assert scenarios, 'Проверьте, что бенчмарк собирает сценарии.'
+        for scenario in scenarios:
+            result = run_scenario(
+                client, scenario, requests=2, warmup=1, allocations=1)
+            assert set(result) == {
+                'p50_ms', 'p95_ms', 'queries', 'alloc_kb'}, (
+                f'Проверьте, что сценарий `{scenario.name}` бенчмарка '
+                'эндпоинтов выполняется на сгенерированной базе.'
+            )